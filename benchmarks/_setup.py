@@ -0,0 +1,55 @@
+"""
+Shared bootstrap for the standalone benchmark scripts.
+
+Each script is run directly (``python benchmarks/bench_<name>.py``) and works
+against a throwaway test database, so it never touches ``db.sqlite3`` or the
+configured ``DATABASE_URL`` data.
+"""
+import contextlib
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ledger_ai_project.settings')
+os.environ.setdefault('DEBUG', '1')
+
+
+def setup_django():
+    import django
+    django.setup()
+
+
+@contextlib.contextmanager
+def scratch_database():
+    """Create a fresh test database for the duration of the block."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def time_call(fn, repeat=5):
+    """Run *fn* ``repeat`` times and return the median wall time in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def parse_sizes(raw):
+    return [int(part.replace('_', '')) for part in raw.split(',') if part.strip()]
@@ -0,0 +1,78 @@
+"""
+Transaction write latency for a user with many budgets.
+
+Each POST /api/transactions/ re-evaluates every current-month budget. SMTP is
+simulated with a fixed delay so the numbers show whether the write waits on
+email delivery (it shouldn't: alerts go out on the deferred worker).
+
+    python benchmarks/bench_budget_alerts.py --budgets 50 --smtp-delay-ms 500
+"""
+import argparse
+import time
+from datetime import date
+from unittest.mock import patch
+
+from _setup import scratch_database, setup_django, time_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budgets', type=int, default=50)
+    parser.add_argument('--history', type=int, default=5000, help='Transactions already in the current month.')
+    parser.add_argument('--smtp-delay-ms', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from core.background import drain
+    from core.models import Budget, Transaction
+
+    def slow_send_mail(*_args, **_kwargs):
+        time.sleep(args.smtp_delay_ms / 1000)
+        return 1
+
+    with scratch_database(), patch('core.email_service.send_mail', slow_send_mail):
+        user = User.objects.create_user(username='bench', email='bench@example.com', password='x')
+        month = date.today().replace(day=1)
+        categories = [f'Category {i}' for i in range(args.budgets)]
+        Budget.objects.bulk_create([
+            Budget(owner=user, category=c, limit_amount='100.00', month=month) for c in categories
+        ])
+        Transaction.objects.bulk_create([
+            Transaction(owner=user, title='seed', amount='0.01', date=month, category=categories[i % len(categories)])
+            for i in range(args.history)
+        ], batch_size=5000)
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        counter = {'i': 0}
+
+        def write():
+            # Every write pushes one category over its limit, so an alert is queued each time.
+            category = categories[counter['i'] % len(categories)]
+            counter['i'] += 1
+            client.post('/api/transactions/', {
+                'title': 'Bench', 'amount': '150.00', 'date': month.isoformat(), 'category': category,
+            }, format='json')
+
+        # request_started resets connection.queries, so count with a wrapper instead
+        executed = []
+        with connection.execute_wrapper(lambda execute, sql, *a: executed.append(sql) or execute(sql, *a)):
+            write()
+        median_ms = time_call(write, args.repeat)
+
+        print(f'budgets:            {args.budgets}')
+        print(f'queries per write:  {len(executed)}')
+        print(f'write latency (ms): {median_ms:.2f} (median of {args.repeat})')
+        print(f'simulated SMTP:     {args.smtp_delay_ms} ms per email')
+
+        start = time.perf_counter()
+        drain()
+        print(f'alert backlog drained in {time.perf_counter() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Bulk re-categorization time: per-row save() vs batched bulk_update.
+
+Creates N uncategorized transactions for one user and runs
+core.categorizer.recategorize() over them.  For sizes up to --legacy-max it
+also times the previous approach (categorize, then save() each matching row,
+which adjusts rollups one row at a time) on a fresh copy of the data.
+
+    python benchmarks/bench_bulk_categorize.py --sizes 10000,100000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from _setup import parse_sizes, scratch_database, setup_django
+
+TITLES = ['Uber trip', 'Starbucks', 'Pharmacy', 'Netflix', 'POS 4471', 'Rent', 'City Market', 'ZX-11 transfer']
+
+
+def seed(user, n):
+    from core.models import Transaction
+    from core.rollups import rebuild
+
+    rng = random.Random(0)
+    start = date(2024, 1, 1)
+    Transaction.objects.bulk_create(
+        (
+            Transaction(owner=user, title=rng.choice(TITLES), amount=f'{rng.randint(100, 9999) / 100:.2f}',
+                        date=start + timedelta(days=i % 700), category='Other')
+            for i in range(n)
+        ),
+        batch_size=2000,
+    )
+    rebuild([user.id])
+
+
+def legacy(queryset, categorizer):
+    updated = 0
+    for txn in queryset:
+        category = categorizer.categorize(f"{txn.title} {txn.notes or ''}")
+        if category:
+            txn.category = category
+            txn.save()
+            updated += 1
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='10000,100000')
+    parser.add_argument('--legacy-max', type=int, default=10000,
+                        help='Largest size to also time with per-row save() (slow).')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from core.categorizer import get_categorizer, recategorize
+    from core.models import Transaction
+
+    with scratch_database():
+        print(f"{'rows':>8} {'updated':>8} {'bulk s':>8} {'save() s':>9}")
+        for i, n in enumerate(parse_sizes(args.sizes)):
+            user = User.objects.create_user(username=f'bench{i}', password='x')
+            seed(user, n)
+            started = time.perf_counter()
+            report = recategorize(Transaction.objects.filter(owner=user))
+            bulk_s = time.perf_counter() - started
+
+            legacy_s = '-'
+            if n <= args.legacy_max:
+                Transaction.objects.filter(owner=user).update(category='Other')
+                from core.rollups import rebuild
+                rebuild([user.id])
+                started = time.perf_counter()
+                legacy(Transaction.objects.filter(owner=user), get_categorizer())
+                legacy_s = f'{time.perf_counter() - started:.1f}'
+            print(f"{n:>8} {report['updated_count']:>8} {bulk_s:>8.1f} {legacy_s:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Keyword categorization throughput: nested keyword loop vs Aho-Corasick automaton.
+
+Generates N transaction titles (about a third contain no keyword, the
+worst case for the loop) and categorizes each with the previous
+``keyword in text`` loop over CATEGORY_KEYWORDS and with core.categorizer.
+Both must agree on every title.
+
+    python benchmarks/bench_categorizer.py --titles 1000000
+"""
+import argparse
+import random
+import time
+
+from _setup import setup_django
+
+FILLER = ['POS', 'PURCHASE', '#4471', 'KTM', 'ONLINE', 'REF', 'LLC', 'CO', 'NEPAL', 'INTL', 'AUTH', '03/14']
+
+
+def loop_categorize(text, keywords_by_category):
+    text_lower = text.lower()
+    for category, keywords in keywords_by_category.items():
+        for keyword in keywords:
+            if keyword in text_lower:
+                return category
+    return None
+
+
+def make_titles(n, keywords, seed=0):
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(n):
+        words = rng.sample(FILLER, rng.randint(1, 4))
+        if rng.random() < 0.66:
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords).upper())
+        titles.append(' '.join(words))
+    return titles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--titles', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from core.categorizer import KeywordCategorizer
+    from core.constants import CATEGORY_KEYWORDS
+
+    started = time.perf_counter()
+    categorizer = KeywordCategorizer(CATEGORY_KEYWORDS)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    titles = make_titles(args.titles, [k for ks in CATEGORY_KEYWORDS.values() for k in ks])
+
+    started = time.perf_counter()
+    expected = [loop_categorize(t, CATEGORY_KEYWORDS) for t in titles]
+    loop_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [categorizer.categorize(t) for t in titles]
+    automaton_s = time.perf_counter() - started
+
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    print(f'titles:            {len(titles):,}')
+    print(f'automaton build:   {build_ms:.1f} ms ({len(categorizer._delta)} states)')
+    print(f'keyword loop:      {loop_s:.2f} s  ({len(titles) / loop_s:,.0f} titles/s)')
+    print(f'automaton:         {automaton_s:.2f} s  ({len(titles) / automaton_s:,.0f} titles/s)')
+    print(f'mismatches:        {mismatches}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+CSV export time-to-first-byte, total time and peak memory vs. rows per user.
+
+Consumes the streaming response chunk by chunk, the way a client download
+would, and tracks Python heap with tracemalloc. TTFB and peak memory should
+stay flat as N grows; only the total time scales with N.
+
+    python benchmarks/bench_csv_export.py --sizes 10000,100000,1000000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from _setup import parse_sizes, scratch_database, setup_django
+
+
+def seed(user, n, batch=10_000):
+    from core.models import Transaction
+
+    start = date(2000, 1, 1)
+    rows = []
+    for i in range(n):
+        rows.append(Transaction(
+            owner=user, title=f'Txn {i}', amount='12.34',
+            date=start + timedelta(days=i // 20), category='Food & Dining', notes='bench',
+        ))
+        if len(rows) >= batch:
+            Transaction.objects.bulk_create(rows)
+            rows = []
+    if rows:
+        Transaction.objects.bulk_create(rows)
+
+
+def export(client, params):
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get('/api/transactions/export/', params)
+    chunks = iter(response.streaming_content)
+    size = len(next(chunks))
+    ttfb = (time.perf_counter() - start) * 1000
+    for chunk in chunks:
+        size += len(chunk)
+    total = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    response.close()
+    return ttfb, total, peak / 2**20, size / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+
+    with scratch_database():
+        warmup = APIClient()
+        warmup.force_authenticate(user=User.objects.create_user(username='warmup', password='x'))
+        export(warmup, {})  # import/URL-resolver cost shouldn't land on the first row
+
+        print(f"{'rows':>10} {'mode':>6} {'ttfb ms':>9} {'total ms':>10} {'peak MiB':>9} {'body MiB':>9}")
+        for i, n in enumerate(parse_sizes(args.sizes)):
+            user = User.objects.create_user(username=f'bench{i}', password='x')
+            seed(user, n)
+            client = APIClient()
+            client.force_authenticate(user=user)
+            for mode, params in (('csv', {}), ('gzip', {'gzip': '1'})):
+                ttfb, total, peak, size = export(client, params)
+                print(f'{n:>10} {mode:>6} {ttfb:>9.2f} {total:>10.1f} {peak:>9.2f} {size:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
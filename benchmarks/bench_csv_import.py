@@ -0,0 +1,65 @@
+"""
+CSV import throughput and peak memory vs. file size.
+
+Writes an N-row CSV to a temp file (1% of rows invalid), imports it through
+core.csv_import and reports rows per second; with --trace-memory also peak Python heap,
+which should track the batch size, not N.
+
+    python benchmarks/bench_csv_import.py --sizes 10000,100000,500000 [--trace-memory]
+"""
+import argparse
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+
+from _setup import parse_sizes, scratch_database, setup_django
+
+
+def write_csv(fh, n):
+    start = date(2020, 1, 1)
+    fh.write(b'Title,Amount,Date,Category,Notes\n')
+    for i in range(n):
+        amount = 'oops' if i % 100 == 99 else f'{(i % 500) + 0.99:.2f}'
+        day = start + timedelta(days=i % 1500)
+        # Mix ISO and US formats so the date normalizer is exercised
+        shown = day.isoformat() if i % 2 else day.strftime('%m/%d/%Y')
+        fh.write(f'Txn {i},{amount},{shown},Category {i % 12},note\n'.encode())
+    fh.flush()
+    fh.seek(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='10000,100000,500000')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Report peak heap via tracemalloc (slows the import noticeably).')
+    args = parser.parse_args()
+
+    setup_django()
+    import logging
+    from django.contrib.auth.models import User
+    from core.csv_import import import_transactions
+
+    logging.getLogger('core.ai_service').setLevel(logging.WARNING)
+
+    with scratch_database():
+        print(f"{'rows':>10} {'imported':>9} {'rows/s':>9} {'seconds':>8} {'peak MiB':>9}")
+        for i, n in enumerate(parse_sizes(args.sizes)):
+            user = User.objects.create_user(username=f'bench{i}', password='x')
+            with tempfile.TemporaryFile() as fh:
+                write_csv(fh, n)
+                if args.trace_memory:
+                    tracemalloc.start()
+                report = import_transactions(user, fh, batch_size=args.batch_size)
+                if args.trace_memory:
+                    peak = f'{tracemalloc.get_traced_memory()[1] / 2**20:.2f}'
+                    tracemalloc.stop()
+                else:
+                    peak = '-'
+            print(f"{n:>10} {report['imported']:>9} {report['rows_per_second']:>9} "
+                  f"{report['elapsed_ms'] / 1000:>8.1f} {peak:>9}")
+
+
+if __name__ == '__main__':
+    main()
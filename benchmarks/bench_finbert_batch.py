@@ -0,0 +1,61 @@
+"""
+FinBERT categorization throughput by pipeline batch size.
+
+Generates N transaction descriptions that no category keyword matches (so
+every one reaches the model) and times ``ai_service.categorize_many`` at
+each batch size, plus the old one-call-per-text path as a baseline.
+Needs transformers and torch; the model is downloaded on first use.
+
+    python benchmarks/bench_finbert_batch.py --texts 2000 --batch-sizes 1 8 32 128
+"""
+import argparse
+import random
+import time
+
+from _setup import setup_django
+
+WORDS = ['payment', 'transfer', 'ref', 'account', 'settled', 'pending', 'quarterly', 'statement',
+         'received', 'adjustment', 'from', 'client', 'refund', 'charge', 'late', 'fee', 'interest']
+
+
+def make_texts(n, seed=0):
+    rng = random.Random(seed)
+    # Mixed lengths, as real titles+notes are: padding cost depends on the spread
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.choice((3, 6, 12, 40)))) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--texts', type=int, default=2000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32, 128])
+    args = parser.parse_args()
+
+    setup_django()
+    from core import ai_service
+
+    classifier = ai_service.get_finbert_classifier()
+    if classifier is None:
+        print('FinBERT unavailable (install transformers and torch); nothing to measure')
+        return
+
+    texts = make_texts(args.texts)
+    classifier(texts[:8], batch_size=8, truncation=True, max_length=ai_service.FINBERT_MAX_TOKENS)  # warm-up
+
+    started = time.perf_counter()
+    baseline = [classifier(t[:512])[0][0]['label'].lower() for t in texts]
+    single_s = time.perf_counter() - started
+    print(f'texts:             {len(texts):,}')
+    print(f'per-text calls:    {single_s:.2f} s  ({len(texts) / single_s:,.1f} texts/s)')
+
+    expected = [ai_service._SENTIMENT_TO_CATEGORY.get(label, 'Other') for label in baseline]
+    for batch_size in args.batch_sizes:
+        started = time.perf_counter()
+        actual = ai_service.categorize_many(texts, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+        print(f'batch_size={batch_size:<4}    {elapsed:.2f} s  ({len(texts) / elapsed:,.1f} texts/s, '
+              f'{mismatches} differ from per-text)')
+
+
+if __name__ == '__main__':
+    main()
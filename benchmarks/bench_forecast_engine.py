@@ -0,0 +1,69 @@
+"""
+Forecast engine latency: pure-Python Monte Carlo vs the NumPy engine.
+
+The reference loop is the pre-NumPy implementation (one random.gauss call per
+path step), kept here only for comparison. No database is needed.
+
+    python benchmarks/bench_forecast_engine.py --months 24 --simulations 2000,100000
+"""
+import argparse
+import random
+from datetime import date
+
+from _setup import parse_sizes, setup_django, time_call
+
+
+def reference_monte_carlo(y_vals, n_months=6, n_simulations=2000):
+    pct_changes = [
+        (y_vals[i] - y_vals[i - 1]) / y_vals[i - 1] if y_vals[i - 1] > 0 else 0.0
+        for i in range(1, len(y_vals))
+    ]
+    mean_change = sum(pct_changes) / len(pct_changes)
+    std_change = (sum((c - mean_change) ** 2 for c in pct_changes) / (len(pct_changes) - 1)) ** 0.5
+
+    random.seed(42)
+    paths = []
+    for _ in range(n_simulations):
+        path, val = [], y_vals[-1]
+        for _ in range(n_months):
+            val = max(0, val * (1 + random.gauss(mean_change, std_change)))
+            path.append(val)
+        paths.append(path)
+
+    p10, p50, p90 = [], [], []
+    for month_idx in range(n_months):
+        month_vals = sorted(p[month_idx] for p in paths)
+        p10.append(round(month_vals[int(n_simulations * 0.10)], 2))
+        p50.append(round(month_vals[int(n_simulations * 0.50)], 2))
+        p90.append(round(month_vals[int(n_simulations * 0.90)], 2))
+    return p50, p10, p90
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--months', type=int, default=24, help='Months of spending history.')
+    parser.add_argument('--simulations', default='2000,100000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from core.forecasting import build_forecast, monte_carlo_forecast
+
+    rng = random.Random(0)
+    history = [1000 + 15 * i + rng.uniform(-120, 120) for i in range(args.months)]
+    monthly = {
+        f'{2020 + i // 12}-{i % 12 + 1:02d}': {'total': total, 'categories': {'Food': total * 0.5, 'Rent': total * 0.5}}
+        for i, total in enumerate(history)
+    }
+
+    print(f'{"simulations":>12} {"python MC ms":>13} {"numpy MC ms":>12} {"full forecast ms":>17}')
+    for n in parse_sizes(args.simulations):
+        ref_ms = time_call(lambda: reference_monte_carlo(history, n_simulations=n), args.repeat) if n <= 20_000 else None
+        np_ms = time_call(lambda: monte_carlo_forecast(history, n_simulations=n), args.repeat)
+        full_ms = time_call(lambda: build_forecast(monthly, 4000.0, today=date(2022, 1, 15), n_simulations=n), args.repeat)
+        ref = f'{ref_ms:13.2f}' if ref_ms is not None else f'{"(skipped)":>13}'
+        print(f'{n:>12,} {ref} {np_ms:12.2f} {full_ms:17.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Per-worker memory of gunicorn with the models loaded per worker vs preloaded.
+
+Starts gunicorn twice with N workers, first as deployed (each worker loads
+FinBERT/spaCy itself) and then with LEDGER_AI_PRELOAD_MODELS=true (loaded in
+the master, shared copy-on-write).  After /api/health/ready/ reports every
+model settled, reads /proc/<pid>/smaps_rollup for each worker.
+
+RSS counts shared pages in every process that maps them, so it barely moves
+with preloading.  PSS splits shared pages between their users and USS counts
+only private ones; their sums are the real memory cost.  Linux only; needs
+gunicorn, and transformers/torch/spaCy for the numbers to mean much.
+
+    python benchmarks/bench_model_memory.py --workers 4
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from _setup import ROOT
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def smaps(pid):
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) // 1024
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as fh:
+        return [int(pid) for pid in fh.read().split()]
+
+
+def wait_ready(port, workers, timeout):
+    # Each request lands on some worker; keep polling until enough consecutive
+    # answers say ready that every worker has most likely settled
+    deadline = time.monotonic() + timeout
+    streak = 0
+    report = None
+    while time.monotonic() < deadline and streak < workers * 3:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health/ready/', timeout=5) as response:
+                report = json.load(response)
+                streak += 1
+        except (urllib.error.URLError, ConnectionError):
+            streak = 0
+            time.sleep(0.5)
+    return report
+
+
+def measure(workers, preload, timeout):
+    port = free_port()
+    env = dict(os.environ, LEDGER_AI_PRELOAD_MODELS='true' if preload else 'false', DEBUG='1')
+    master = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'ledger_ai_project.wsgi:application',
+         '--bind', f'127.0.0.1:{port}', '--workers', str(workers)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        report = wait_ready(port, workers, timeout)
+        if report is None:
+            raise SystemExit(f'gunicorn did not become ready within {timeout}s')
+        return smaps(master.pid), [smaps(pid) for pid in worker_pids(master.pid)], report['models']
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--timeout', type=float, default=600)
+    args = parser.parse_args()
+
+    for label, preload in (('per-worker load', False), ('preloaded', True)):
+        master, workers, models = measure(args.workers, preload, args.timeout)
+        states = ', '.join(f"{name}={entry['state']}" for name, entry in models.items())
+        print(f'{label}  ({states})')
+        print(f"  master     RSS {master['rss']:>6} MB  PSS {master['pss']:>6} MB  USS {master['uss']:>6} MB")
+        for i, worker in enumerate(workers):
+            print(f"  worker {i}   RSS {worker['rss']:>6} MB  PSS {worker['pss']:>6} MB  USS {worker['uss']:>6} MB")
+        total_pss = master['pss'] + sum(w['pss'] for w in workers)
+        print(f'  total PSS  {total_pss} MB')
+
+
+if __name__ == '__main__':
+    main()
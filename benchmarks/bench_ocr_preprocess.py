@@ -0,0 +1,127 @@
+"""
+Receipt preprocessing time and OCR accuracy, previous pipeline vs core.ocr.
+
+Renders a corpus of synthetic receipts (small scans up to 12 MP phone-sized
+JPEGs) or reads ``--corpus DIR`` (images with same-named .txt ground truth),
+then times decode + preprocessing per image for both pipelines.  When the
+tesseract binary is installed it also OCRs each result and reports character
+accuracy against the ground truth.
+
+    python benchmarks/bench_ocr_preprocess.py [--corpus DIR] [--repeat 3]
+"""
+import argparse
+import difflib
+import io
+import random
+import shutil
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
+
+from _setup import setup_django, time_call
+
+# (width, height) of the rendered page; the receipt text scales with it.
+# The last two are long till rolls photographed end to end.
+SYNTHETIC_SIZES = [(600, 900), (1200, 1800), (3024, 4032), (4032, 3024), (1000, 6000), (800, 8000)]
+
+
+def legacy_preprocess(image):
+    """The pipeline before draft decoding and the working-size cap."""
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    width, height = image.size
+    if width < 800 or height < 800:
+        scale = max(800 / width, 800 / height)
+        image = image.resize((int(width * scale), int(height * scale)), Image.Resampling.LANCZOS)
+    image = image.convert('L')
+    image = ImageEnhance.Contrast(image).enhance(2.0)
+    return image.filter(ImageFilter.SHARPEN)
+
+
+def _receipt_lines(rng):
+    lines = ['CORNER MARKET', f'Date: 0{rng.randint(1, 9)}/1{rng.randint(0, 9)}/2026']
+    total = 0
+    for item in rng.sample(['MILK', 'BREAD', 'EGGS', 'COFFEE', 'APPLES', 'RICE', 'SOAP'], 4):
+        price = rng.randint(100, 1500) / 100
+        total += price
+        lines.append(f'{item:<10} {price:>7.2f}')
+    lines.append(f'TOTAL      {total:>7.2f}')
+    return lines
+
+
+def synthetic_corpus(seed=7):
+    rng = random.Random(seed)
+    corpus = []
+    for width, height in SYNTHETIC_SIZES:
+        lines = _receipt_lines(rng)
+        page = Image.new('RGB', (width, height), (236, 232, 222))
+        draw = ImageDraw.Draw(page)
+        font_size = max(14, min(width, height) // 28)
+        try:
+            font = ImageFont.load_default(size=font_size)
+        except TypeError:  # Pillow < 10.1
+            font = ImageFont.load_default()
+        y = height // 10
+        for line in lines:
+            draw.text((width // 10, y), line, fill=(30, 30, 30), font=font)
+            y += int(font_size * 1.6)
+        buf = io.BytesIO()
+        page.save(buf, format='JPEG', quality=90)
+        corpus.append((f'synthetic-{width}x{height}.jpg', buf.getvalue(), '\n'.join(lines)))
+    return corpus
+
+
+def load_corpus(directory):
+    corpus = []
+    for path in sorted(Path(directory).iterdir()):
+        truth = path.with_suffix('.txt')
+        if path.suffix.lower() in ('.jpg', '.jpeg', '.png', '.webp') and truth.exists():
+            corpus.append((path.name, path.read_bytes(), truth.read_text(encoding='utf-8')))
+    return corpus
+
+
+def accuracy(text, truth):
+    def norm(s):
+        return ' '.join(s.split()).upper()
+    return difflib.SequenceMatcher(None, norm(text), norm(truth)).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--corpus', help='Directory of receipt images with .txt ground truth')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    import pytesseract
+    from core import ocr
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    have_tesseract = shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+    pipelines = [('legacy', legacy_preprocess), ('current', ocr.preprocess_image)]
+
+    print(f"{'image':<28} {'pipeline':<8} {'ms':>8} {'output':>11} {'accuracy':>9}")
+    totals = {name: [0.0, 0.0] for name, _ in pipelines}
+    for name, data, truth in corpus:
+        for label, preprocess in pipelines:
+            def run():
+                return preprocess(Image.open(io.BytesIO(data)))
+            ms = time_call(run, repeat=args.repeat)
+            out = run()
+            if have_tesseract:
+                score = accuracy(pytesseract.image_to_string(out, config=ocr.TESSERACT_CONFIG), truth)
+                totals[label][1] += score
+                shown = f'{score:.1%}'
+            else:
+                shown = 'n/a'
+            totals[label][0] += ms
+            print(f'{name:<28} {label:<8} {ms:>8.1f} {out.size[0]:>5}x{out.size[1]:<5} {shown:>9}')
+
+    print()
+    for label, (ms, score) in totals.items():
+        mean_acc = f'{score / len(corpus):.1%}' if have_tesseract else 'n/a (tesseract not installed)'
+        print(f'{label:<8} mean {ms / len(corpus):.1f} ms/image, accuracy {mean_acc}')
+
+
+if __name__ == '__main__':
+    main()
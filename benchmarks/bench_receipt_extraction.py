@@ -0,0 +1,86 @@
+"""
+Receipt field extraction throughput over a corpus of OCR-style receipt texts.
+
+Each extraction is the regex path parse_receipt_text() falls back to without
+spaCy: amount, transaction date and keyword category.  The corpus mixes
+labelled dates, bare dates, date + time stamps and unlabelled receipts so
+every priority tier is exercised.  Pass ``--corpus DIR`` to use real OCR
+output (*.txt) instead.
+
+    python benchmarks/bench_receipt_extraction.py [--receipts 2000] [--corpus DIR]
+"""
+import argparse
+import logging
+import random
+import time
+from pathlib import Path
+
+from _setup import setup_django
+
+MERCHANTS = ['CORNER CAFE', 'CITY MARKET', 'WALGREENS #1142', 'BHAT-BHATENI SUPERSTORE', 'SHELL 0457', 'KATHMANDU GRILL']
+ITEMS = ['MILK 2%', 'SOURDOUGH', 'EGGS DZ', 'LATTE', 'BANANAS', 'DIESEL', 'IBUPROFEN', 'MOMO PLATE', 'SOAP']
+DATE_LINES = [
+    'Receipt Date: {m:02d}/{d:02d}/2026',
+    'Invoice Date {y}-{m:02d}-{d:02d}',
+    'Date: {d} Mar 2026',
+    '{m:02d}/{d:02d}/2026 14:{d:02d}',
+    'Printed {d:02d}.{m:02d}.2026',
+    'Exp {m:02d}/{d:02d}/27',
+    '',
+]
+
+
+def synthetic_receipt(rng):
+    m, d = rng.randint(1, 12), rng.randint(1, 28)
+    lines = [rng.choice(MERCHANTS), f'{rng.randint(1, 999)} MAIN ST', 'TEL 555-{0:04d}'.format(rng.randint(0, 9999))]
+    lines.append(rng.choice(DATE_LINES).format(m=m, d=d, y=2026))
+    total = 0
+    for _ in range(rng.randint(3, 25)):
+        price = rng.randint(50, 4000) / 100
+        total += price
+        lines.append(f'{rng.choice(ITEMS):<16}{price:>8.2f}')
+    lines += [f'SUBTOTAL {total:>10.2f}', f'TAX {total * 0.08:>14.2f}']
+    if rng.random() < 0.8:
+        lines.append(f'TOTAL {total * 1.08:>12.2f}')
+    lines += ['CARD **** 4417', 'THANK YOU FOR SHOPPING']
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--receipts', type=int, default=2000)
+    parser.add_argument('--corpus', help='Directory of OCR text files (*.txt)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from core.ai_service import _extract_amount_regex, _extract_date_regex, _refine_category_with_keywords
+
+    logging.disable(logging.CRITICAL)
+    if args.corpus:
+        corpus = [p.read_text(encoding='utf-8') for p in sorted(Path(args.corpus).glob('*.txt'))]
+    else:
+        rng = random.Random(0)
+        corpus = [synthetic_receipt(rng) for _ in range(args.receipts)]
+
+    def extract(text):
+        return _extract_amount_regex(text), _extract_date_regex(text), _refine_category_with_keywords(text)
+
+    best = None
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            extract(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    found = [extract(text) for text in corpus]
+    print(f'receipts:              {len(corpus)}')
+    print(f'extractions/second:    {len(corpus) / best:,.0f}')
+    print(f'mean per receipt:      {best / len(corpus) * 1e6:,.1f} us')
+    print(f'amount found:          {sum(1 for a, _, _ in found if a) / len(corpus):.0%}')
+    print(f'date found:            {sum(1 for _, d, _ in found if d) / len(corpus):.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+spaCy entity extraction: full pipeline per text vs trimmed pipeline with nlp.pipe.
+
+Runs the receipt corpus from bench_receipt_extraction through the previous
+path (full en_core_web_sm, one ``nlp(text)`` per receipt) and through
+ai_service's trimmed pipeline, one text at a time and batched with
+``extract_entities_many``.  Reports docs/s and single-call latency, and
+checks that both pipelines find the same entities.  Needs spaCy and
+en_core_web_sm.
+
+    python benchmarks/bench_spacy_entities.py [--receipts 2000] [--n-process 1]
+"""
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from _setup import setup_django
+from bench_receipt_extraction import synthetic_receipt
+
+
+def ents(doc):
+    return [(ent.start_char, ent.end_char, ent.label_) for ent in doc.ents]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--receipts', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--n-process', type=int, default=1)
+    args = parser.parse_args()
+
+    setup_django()
+    from core import ai_service
+
+    logging.disable(logging.CRITICAL)
+    trimmed = ai_service.get_spacy_nlp(wait=True)
+    if trimmed is None:
+        print('spaCy or en_core_web_sm unavailable; nothing to measure')
+        return
+    import spacy
+    full = spacy.load('en_core_web_sm')
+
+    rng = random.Random(0)
+    texts = [synthetic_receipt(rng) for _ in range(args.receipts)]
+    print(f'receipts:          {len(texts):,}')
+    print(f'full pipeline:     {full.pipe_names}')
+    print(f'trimmed pipeline:  {trimmed.pipe_names}')
+
+    for label, nlp in (('full, nlp(text)', full), ('trimmed, nlp(text)', trimmed)):
+        latencies = []
+        started = time.perf_counter()
+        for text in texts:
+            t0 = time.perf_counter()
+            nlp(text)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        elapsed = time.perf_counter() - started
+        print(f'{label:<22} {len(texts) / elapsed:>8,.0f} docs/s  median {statistics.median(latencies):.2f} ms/doc')
+
+    started = time.perf_counter()
+    ai_service.extract_entities_many(texts, batch_size=args.batch_size, n_process=args.n_process)
+    elapsed = time.perf_counter() - started
+    print(f'extract_entities_many  {len(texts) / elapsed:>8,.0f} docs/s  (batch_size={args.batch_size}, n_process={args.n_process}, incl. regex fallback)')
+
+    mismatches = sum(1 for a, b in zip(full.pipe(texts), trimmed.pipe(texts)) if ents(a) != ents(b))
+    print(f'entity mismatches: {mismatches}')
+
+
+if __name__ == '__main__':
+    main()
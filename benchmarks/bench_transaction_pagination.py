@@ -0,0 +1,74 @@
+"""
+Transactions list latency vs. rows per user.
+
+Seeds one user with N transactions and times the first keyset page and a
+page from the middle of the history. With the (owner, -date, -id) index
+both should stay flat as N grows from 1k to 1M.
+
+    python benchmarks/bench_transaction_pagination.py --sizes 1000,10000,100000,1000000
+"""
+import argparse
+from datetime import date, timedelta
+
+from _setup import parse_sizes, scratch_database, setup_django, time_call
+
+
+def seed(user, n, batch=10_000):
+    from core.models import Transaction
+
+    start = date(2000, 1, 1)
+    rows = []
+    for i in range(n):
+        rows.append(Transaction(
+            owner=user,
+            title=f'Txn {i}',
+            amount='12.34',
+            # ~20 rows per day, so tie-breaking on id is exercised too
+            date=start + timedelta(days=i // 20),
+            category='Food & Dining',
+        ))
+        if len(rows) >= batch:
+            Transaction.objects.bulk_create(rows)
+            rows = []
+    if rows:
+        Transaction.objects.bulk_create(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+    from core.models import Transaction
+    from core.pagination import TransactionKeysetPagination
+
+    with scratch_database():
+        print(f"{'rows':>10} {'first page ms':>14} {'mid page ms':>12}")
+        for i, n in enumerate(parse_sizes(args.sizes)):
+            user = User.objects.create_user(username=f'bench{i}', password='x')
+            seed(user, n)
+
+            client = APIClient()
+            client.force_authenticate(user=user)
+
+            middle = Transaction.objects.filter(owner=user).order_by('-date', '-id')[n // 2]
+            cursor = TransactionKeysetPagination().encode_cursor(middle)
+
+            first = time_call(
+                lambda: client.get('/api/transactions/', {'page_size': args.page_size}),
+                args.repeat,
+            )
+            mid = time_call(
+                lambda: client.get('/api/transactions/', {'page_size': args.page_size, 'cursor': cursor}),
+                args.repeat,
+            )
+            print(f'{n:>10} {first:>14.2f} {mid:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
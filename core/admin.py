@@ -7,3 +7,8 @@ class TransactionAdmin(admin.ModelAdmin):
     list_filter = ['date', 'category']
     search_fields = ['title', 'notes', 'category']
     readonly_fields = ['date']
+
+    def delete_queryset(self, request, queryset):
+        # Per-row delete keeps MonthlyCategoryRollup in step (QuerySet.delete skips Transaction.delete)
+        for obj in queryset:
+            obj.delete()
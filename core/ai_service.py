@@ -3,15 +3,17 @@ AI Service Module - FinBERT + spaCy for transaction analysis
 Replaces Gemini API with local open-source models
 """
 
+import contextlib
 import re
+import threading
 import json
 import os
-import urllib.request
-import urllib.error
 from datetime import datetime
 from typing import Dict, Optional, List
 import logging
 
+from .receipt_extractor import EXTRACTOR
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,66 +24,23 @@ def _env_flag(name: str, default: bool = False) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
-def _ollama_chat_json(messages: List[Dict[str, str]]) -> Optional[Dict]:
+def _ollama_chat_json(messages: List[Dict[str, str]], cache: bool = True) -> Optional[Dict]:
     """Call a local Ollama server and return parsed JSON content.
 
     Expected: Ollama running locally (default http://localhost:11434).
-    Uses Ollama chat endpoint with format=json.
+    Uses Ollama chat endpoint with format=json, through the shared pooled
+    client (core.ollama_client); None when Ollama is down, slow or busy.
+    Identical prompts are answered from the response cache unless ``cache``
+    is False.
     """
-    base_url = os.getenv("LEDGER_AI_OLLAMA_URL", "http://localhost:11434").rstrip("/")
-    model = os.getenv("LEDGER_AI_OLLAMA_MODEL", "llama3.1:8b")
-    timeout_s = float(os.getenv("LEDGER_AI_OLLAMA_TIMEOUT", "20"))
-
-    payload = {
-        "model": model,
-        "messages": messages,
-        "stream": False,
-        "format": "json",
-        "options": {
-            "temperature": 0.1,
-        },
-    }
-
-    req = urllib.request.Request(
-        url=f"{base_url}/api/chat",
-        data=json.dumps(payload).encode("utf-8"),
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-
-    try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:
-            body = resp.read().decode("utf-8", errors="replace")
-    except (urllib.error.URLError, TimeoutError) as e:
-        logger.warning(f"[ollama] Request failed: {e}")
-        return None
+    from .ollama_client import get_client
+    return get_client().chat_json(messages, cache=cache)
 
-    try:
-        data = json.loads(body)
-    except json.JSONDecodeError:
-        logger.warning("[ollama] Non-JSON response from server")
-        return None
 
-    content = (
-        data.get("message", {})
-        .get("content", "")
-        .strip()
-    )
-    if not content:
-        return None
-
-    # With format=json, content should be valid JSON, but keep a fallback.
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        start = content.find("{")
-        end = content.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            try:
-                return json.loads(content[start : end + 1])
-            except json.JSONDecodeError:
-                return None
-        return None
+async def _aollama_chat_json(messages: List[Dict[str, str]], cache: bool = True) -> Optional[Dict]:
+    """_ollama_chat_json() for async views: waits on Ollama without holding a thread."""
+    from .ollama_async import get_async_client
+    return await get_async_client().chat_json(messages, cache=cache)
 
 
 def _maybe_enrich_receipt_with_ollama(ocr_text: str, extracted: Dict[str, Optional[str]], current: Dict[str, any]) -> Dict[str, any]:
@@ -177,6 +136,22 @@ def _maybe_enrich_voice_with_ollama(transcript_text: str, current: Dict[str, any
     Safe-by-default: only runs when LEDGER_AI_USE_OLLAMA=true.
     By default, runs only when date wasn't detected or amount is missing.
     """
+    updated, messages = _voice_enrichment_request(transcript_text, current)
+    if messages is None:
+        return updated
+    return _apply_voice_enrichment(updated, _ollama_chat_json(messages))
+
+
+async def _amaybe_enrich_voice_with_ollama(transcript_text: str, current: Dict[str, any]) -> Dict[str, any]:
+    """_maybe_enrich_voice_with_ollama() for async views."""
+    updated, messages = _voice_enrichment_request(transcript_text, current)
+    if messages is None:
+        return updated
+    return _apply_voice_enrichment(updated, await _aollama_chat_json(messages))
+
+
+def _voice_enrichment_request(transcript_text: str, current: Dict[str, any]):
+    """Return ``(updated, messages)``; messages is None when Ollama shouldn't be asked."""
     debug = _env_flag("LEDGER_AI_OLLAMA_DEBUG", default=False)
     updated = dict(current)
 
@@ -187,12 +162,12 @@ def _maybe_enrich_voice_with_ollama(transcript_text: str, current: Dict[str, any
         updated.setdefault("ollama_date_reason", None)
 
     if not _env_flag("LEDGER_AI_USE_OLLAMA", default=False):
-        return updated
+        return updated, None
 
     always = _env_flag("LEDGER_AI_OLLAMA_ENRICH_ALWAYS", default=False)
     needs_help = (not updated.get("date_detected", False)) or (updated.get("amount") in (None, 0, ""))
     if not (always or needs_help):
-        return updated
+        return updated, None
 
     # Avoid biasing the model with a pre-filled "today" date when we haven't detected any date.
     current_date = updated.get("date") if updated.get("date_detected", False) else None
@@ -225,16 +200,17 @@ def _maybe_enrich_voice_with_ollama(transcript_text: str, current: Dict[str, any
         },
     }
 
-    response = _ollama_chat_json(
-        [
-            {"role": "system", "content": system},
-            {"role": "user", "content": json.dumps(user, ensure_ascii=False)},
-        ]
-    )
+    return updated, [
+        {"role": "system", "content": system},
+        {"role": "user", "content": json.dumps(user, ensure_ascii=False)},
+    ]
+
 
+def _apply_voice_enrichment(updated: Dict[str, any], response: Optional[Dict]) -> Dict[str, any]:
     if not isinstance(response, dict):
         return updated
 
+    debug = _env_flag("LEDGER_AI_OLLAMA_DEBUG", default=False)
     updated["ollama_used"] = True
 
     # Only accept a valid YYYY-MM-DD; allow null meaning "no date stated".
@@ -274,55 +250,72 @@ def _extract_relative_date_from_text(text: str) -> Optional[str]:
 
     Returns normalized YYYY-MM-DD string or None.
     """
-    text_lower = (text or "").lower()
-
-    # English
-    if re.search(r"\byesterday\b", text_lower):
-        return (datetime.now().date()).fromordinal(datetime.now().date().toordinal() - 1).strftime("%Y-%m-%d")
-    if re.search(r"\btoday\b", text_lower):
-        return datetime.now().strftime("%Y-%m-%d")
-
-    # Nepali (common words in transcripts)
-    # आज = today, हिजो/हिज = yesterday
-    if "हिजो" in text or "हिज" in text:
-        return (datetime.now().date()).fromordinal(datetime.now().date().toordinal() - 1).strftime("%Y-%m-%d")
-    if "आज" in text:
-        return datetime.now().strftime("%Y-%m-%d")
-
-    return None
+    return EXTRACTOR.relative_date(text)
 
 # Global variables to cache loaded models
 _finbert_classifier = None
 _spacy_nlp = None
+# Held while a model loads; see get_finbert_classifier()
+_finbert_lock = threading.Lock()
+_spacy_lock = threading.Lock()
+
+def get_finbert_classifier(wait=False):
+    """
+    Lazy load FinBERT model for categorization.
 
-def get_finbert_classifier():
-    """Lazy load FinBERT model for categorization"""
+    If another thread is already loading it (normally the warm-up thread,
+    core.model_warmup), returns None at once so the caller falls back to
+    keyword matching, unless ``wait`` is set.
+    """
     global _finbert_classifier
     if _finbert_classifier is None:
+        if not _finbert_lock.acquire(blocking=wait):
+            return None
         try:
-            from transformers import pipeline
-            logger.info("Loading FinBERT model...")
-            _finbert_classifier = pipeline(
-                "text-classification",
-                model="yiyanghkust/finbert-tone",
-                top_k=1
-            )
-            logger.info("FinBERT model loaded successfully")
+            if _finbert_classifier is None:
+                from transformers import pipeline
+                logger.info("Loading FinBERT model...")
+                _finbert_classifier = pipeline(
+                    "text-classification",
+                    model="yiyanghkust/finbert-tone",
+                    top_k=1,
+                    device=-1,  # CPU
+                )
+                logger.info("FinBERT model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load FinBERT: {e}")
             _finbert_classifier = None
+        finally:
+            _finbert_lock.release()
     return _finbert_classifier
 
 
-def get_spacy_nlp():
-    """Lazy load spaCy model for entity extraction"""
+# Only doc.ents is used: skip tagging, parsing and lemmatization when loading spaCy
+SPACY_EXCLUDE = ['tagger', 'parser', 'senter', 'attribute_ruler', 'lemmatizer']
+SPACY_MAX_CHARS = 1000000  # nlp.max_length
+SPACY_BATCH_SIZE = 64
+
+
+def _trim_spacy_pipeline(nlp):
+    # en_core_web_sm's NER has its own embedding layer, so with the tagger and
+    # parser gone the shared tok2vec feeds nothing; larger models' NER listens to it
+    if 'tok2vec' in nlp.pipe_names and not nlp.get_pipe('tok2vec').listening_components:
+        nlp.remove_pipe('tok2vec')
+    return nlp
+
+
+def get_spacy_nlp(wait=False):
+    """Lazy load spaCy model for entity extraction (same locking as get_finbert_classifier)"""
     global _spacy_nlp
     if _spacy_nlp is None:
+        if not _spacy_lock.acquire(blocking=wait):
+            return None
         try:
-            import spacy
-            logger.info("Loading spaCy model...")
-            _spacy_nlp = spacy.load("en_core_web_sm")
-            logger.info("spaCy model loaded successfully")
+            if _spacy_nlp is None:
+                import spacy
+                logger.info("Loading spaCy model...")
+                _spacy_nlp = _trim_spacy_pipeline(spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE))
+                logger.info(f"spaCy model loaded successfully (pipeline: {_spacy_nlp.pipe_names})")
         except OSError:
             # Model not downloaded, try to download it
             logger.warning("spaCy model not found, attempting to use fallback...")
@@ -330,9 +323,21 @@ def get_spacy_nlp():
         except Exception as e:
             logger.error(f"Failed to load spaCy: {e}")
             _spacy_nlp = None
+        finally:
+            _spacy_lock.release()
     return _spacy_nlp
 
 
+# Map FinBERT sentiment to transaction categories
+_SENTIMENT_TO_CATEGORY = {
+    'positive': 'Income',
+    'negative': 'Bills & Utilities',
+    'neutral': 'Other'
+}
+FINBERT_BATCH_SIZE = 32
+FINBERT_MAX_TOKENS = 512
+
+
 def categorize_transaction_ai(text: str) -> str:
     """
     Categorize transaction using FinBERT or fallback to keyword matching
@@ -343,64 +348,80 @@ def categorize_transaction_ai(text: str) -> str:
     Returns:
         Category name
     """
-    if not text or not text.strip():
-        return 'Other'
-    
-    # Try FinBERT first
-    classifier = get_finbert_classifier()
-    if classifier:
-        try:
-            result = classifier(text[:512])[0]  # FinBERT has 512 token limit
-            sentiment = result[0]['label'].lower()
-            
-            # Map FinBERT sentiment to transaction categories
-            sentiment_to_category = {
-                'positive': 'Income',
-                'negative': 'Bills & Utilities',
-                'neutral': 'Other'
-            }
-            
-            # Additional keyword-based refinement
-            category = _refine_category_with_keywords(text)
-            if category != 'Other':
-                return category
-                
-            return sentiment_to_category.get(sentiment, 'Other')
-        except Exception as e:
-            logger.error(f"FinBERT categorization error: {e}")
-    
-    # Fallback to keyword matching
-    return _refine_category_with_keywords(text)
+    return categorize_many([text])[0]
+
+
+def categorize_many(texts: List[str], batch_size: int = FINBERT_BATCH_SIZE) -> List[str]:
+    """
+    Categorize many texts at once; same result per text as categorize_transaction_ai().
+
+    Keyword matches win outright, so FinBERT only sees the texts keywords
+    can't place.  Those go through the pipeline in ``batch_size`` batches,
+    longest first so each batch pads to similar lengths, truncated at
+    FINBERT_MAX_TOKENS tokens.
+    """
+    results = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            results[i] = 'Other'
+            continue
+        category = _refine_category_with_keywords(text)
+        if category != 'Other':
+            results[i] = category
+        else:
+            pending.append(i)
+
+    if pending:
+        classifier = get_finbert_classifier()
+        labels = _finbert_labels(classifier, [texts[i] for i in pending], batch_size) if classifier else None
+        for n, i in enumerate(pending):
+            results[i] = _SENTIMENT_TO_CATEGORY.get(labels[n], 'Other') if labels else 'Other'
+    return results
+
+
+def _finbert_labels(classifier, texts: List[str], batch_size: int) -> Optional[List[str]]:
+    """Lowercased FinBERT label per text, in input order; None if inference fails."""
+    try:
+        import torch
+        no_grad = torch.inference_mode()
+    except ImportError:
+        no_grad = contextlib.nullcontext()
+
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    try:
+        with no_grad:
+            outputs = classifier(
+                [texts[i] for i in order],
+                batch_size=batch_size,
+                truncation=True,
+                max_length=FINBERT_MAX_TOKENS,
+            )
+    except Exception as e:
+        logger.error(f"FinBERT categorization error: {e}")
+        return None
+
+    labels = [None] * len(texts)
+    for i, output in zip(order, outputs):
+        # top_k=1 gives a one-element list per input
+        best = output[0] if isinstance(output, list) else output
+        labels[i] = best['label'].lower()
+    return labels
 
 
 def _refine_category_with_keywords(text: str) -> str:
     """Enhanced keyword matching for categorization"""
-    from .constants import CATEGORY_KEYWORDS
-    
+    from .categorizer import get_categorizer
+
     text_lower = text.lower()
-    
-    # Check each category's keywords
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                return category
+
+    # Check each category's keywords (one automaton pass over the text)
+    category = get_categorizer().categorize(text)
+    if category:
+        return category
     
     # Advanced pattern matching
-    patterns = {
-        'Food & Dining': r'\b(restaurant|cafe|coffee|pizza|burger|food|lunch|dinner|breakfast)\b',
-        'Transportation': r'\b(uber|lyft|taxi|gas|fuel|parking|metro|bus|train)\b',
-        'Shopping': r'\b(amazon|walmart|target|store|shop|mall|purchase)\b',
-        'Bills & Utilities': r'\b(electric|water|internet|phone|bill|utility)\b',
-        'Healthcare': r'\b(doctor|hospital|pharmacy|medicine|health|clinic)\b',
-        'Entertainment': r'\b(movie|cinema|concert|spotify|netflix|game)\b',
-        'Income': r'\b(salary|wage|payment received|income|bonus|refund)\b',
-    }
-    
-    for category, pattern in patterns.items():
-        if re.search(pattern, text_lower):
-            return category
-    
-    return 'Other'
+    return EXTRACTOR.pattern_category(text_lower) or 'Other'
 
 
 def extract_entities_from_text(text: str) -> Dict[str, Optional[str]]:
@@ -413,9 +434,38 @@ def extract_entities_from_text(text: str) -> Dict[str, Optional[str]]:
     Returns:
         Dict with extracted entities
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
+    nlp = get_spacy_nlp()
+    doc = None
+
+    # Extract using spaCy if available
+    if nlp:
+        try:
+            doc = nlp(text[:SPACY_MAX_CHARS])
+        except Exception as e:
+            logger.error(f"spaCy extraction error: {e}")
+    return _entities_from_doc(text, doc)
+
+
+def extract_entities_many(texts: List[str], batch_size: int = SPACY_BATCH_SIZE, n_process: int = 1) -> List[Dict[str, Optional[str]]]:
+    """
+    extract_entities_from_text() for many texts, run through ``nlp.pipe``.
+
+    ``n_process`` > 1 starts that many spaCy worker processes; keep it at 1
+    inside web workers and use it from management commands and scripts.
+    """
+    nlp = get_spacy_nlp()
+    docs = [None] * len(texts)
+    if nlp and texts:
+        try:
+            docs = list(nlp.pipe((text[:SPACY_MAX_CHARS] for text in texts), batch_size=batch_size, n_process=n_process))
+        except Exception as e:
+            logger.error(f"spaCy extraction error: {e}")
+            docs = [None] * len(texts)
+    return [_entities_from_doc(text, doc) for text, doc in zip(texts, docs)]
+
+
+def _entities_from_doc(text: str, doc) -> Dict[str, Optional[str]]:
+    """Entities from a spaCy doc of ``text`` (or None), then regex for whatever is missing"""
     result = {
         'merchant': None,
         'amount': None,
@@ -423,13 +473,8 @@ def extract_entities_from_text(text: str) -> Dict[str, Optional[str]]:
         'items': []
     }
     
-    nlp = get_spacy_nlp()
-    
-    # Extract using spaCy if available
-    if nlp:
+    if doc is not None:
         try:
-            doc = nlp(text[:1000000])  # Limit text length
-            
             # Extract entities
             for ent in doc.ents:
                 if ent.label_ == 'ORG' and not result['merchant']:
@@ -492,441 +537,27 @@ def _extract_merchant_regex(text: str) -> Optional[str]:
 
 def _extract_amount_regex(text: str) -> Optional[float]:
     """Extract monetary amount using regex with improved patterns"""
-    text_lower = text.lower()
-    
-    # PRIORITY 1: Look for "total" amounts (most reliable)
-    total_patterns = [
-        r'total[\s:]*\$?\s*(\d{1,10}(?:,\d{3})*(?:\.\d{2})?)',  # Total $XX.XX or Total: $XX.XX (allow multiple spaces)
-        r'amount[\s:]*\$?\s*(\d{1,10}(?:,\d{3})*(?:\.\d{2})?)',  # Amount XX.XX
-        r'grand\s*total[\s:]*\$?\s*(\d{1,10}(?:,\d{3})*(?:\.\d{2})?)',  # Grand Total
-    ]
-    
-    for pattern in total_patterns:
-        matches = re.findall(pattern, text_lower, re.IGNORECASE)
-        for match in matches:
-            try:
-                val = float(match.replace(',', '').strip())
-                if 0.01 <= val <= 1000000:  # Reasonable range
-                    return val  # Return immediately if found in "total" patterns
-            except ValueError:
-                continue
-    
-    # PRIORITY 2: Look for currency symbols with amounts
-    amounts = []
-    currency_patterns = [
-        r'[\$\£\€]\s?(\d{1,10}(?:,\d{3})*\.\d{2})',             # $XX.XX (with decimal)
-        r'\b(\d{1,3}(?:,\d{3})*\.\d{2})\b',                     # XX.XX (standalone with decimal)
-        r'(\d{2,}\.\d{2})',                                      # Any number with 2 decimals
-    ]
-    
-    for pattern in currency_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            try:
-                val = float(match.replace(',', '').strip())
-                if 0.01 <= val <= 1000000:  # Filter unreasonable values
-                    amounts.append(val)
-            except ValueError:
-                continue
-    
-    # Return largest amount (usually the total)
-    return max(amounts) if amounts else None
+    return EXTRACTOR.amount(text)
 
 
 def _extract_date_regex(text: str) -> Optional[str]:
     """Extract transaction/bill date using multiple patterns with priority for labeled dates"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Log first 600 chars of OCR text for debugging
-    logger.info(f"[_extract_date_regex] OCR text (first 600 chars): {text[:600]}")
-    
-    # Clean text - remove extra whitespace but preserve line structure
-    text = re.sub(r' +', ' ', text)
-    
-    # Priority 1: Look for transaction/bill date with explicit labels (highest priority)
-    transaction_date_patterns = [
-        # RECEIPT DATE (very common) - more flexible spacing
-        r'receipt\s*#?\s*date[\s:]*(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',
-        r'receipt\s*#?\s*date[\s:]*(\d{4}[/\-]\d{1,2}[/\-]\d{1,2})',
-        r'receipt\s*#?\s*date[\s:]*(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})',
-        # Transaction/Invoice/Bill date
-        r'(?:transaction|trans|txn|bill|invoice|purchase)\s*(?:date|dt)?[\s:]*(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',
-        r'(?:transaction|trans|txn|bill|invoice|purchase)\s*(?:date|dt)?[\s:]*(\d{4}[/\-]\d{1,2}[/\-]\d{1,2})',
-        r'(?:transaction|trans|txn|bill|invoice|purchase)\s*(?:date|dt)?[\s:]*(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})',
-    ]
-    
-    for pattern in transaction_date_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            date_str = match.group(1)
-            normalized = _normalize_date(date_str)
-            if normalized and _is_valid_date(normalized):
-                logger.info(f"[_extract_date_regex] Found transaction date with label: {normalized}")
-                return normalized
-    
-    # Priority 2: Generic "Date:" label (more flexible)
-    date_label_patterns = [
-        r'\bdate\s*:?\s*(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',
-        r'\bdate\s*:?\s*(\d{4}[/\-]\d{1,2}[/\-]\d{1,2})',
-        r'\bdate\s*:?\s*(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})',
-    ]
-    
-    for pattern in date_label_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            date_str = match.group(1)
-            normalized = _normalize_date(date_str)
-            if normalized and _is_valid_date(normalized):
-                logger.info(f"[_extract_date_regex] Found date with 'Date:' label: {normalized}")
-                return normalized
-    
-    # Priority 3: Date with time (likely transaction timestamp)
-    datetime_patterns = [
-        r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{4})\s+\d{1,2}:\d{2}',
-        r'\b(\d{4}[/-]\d{1,2}[/-]\d{1,2})\s+\d{1,2}:\d{2}',
-    ]
-    
-    for pattern in datetime_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            date_str = match.group(1)
-            normalized = _normalize_date(date_str)
-            if normalized and _is_valid_date(normalized):
-                logger.info(f"[_extract_date_regex] Found date with timestamp: {normalized}")
-                return normalized
-    
-    # Priority 4: First date in document (likely to be transaction date in receipts)
-    # Look for dates in the first 600 characters (header area)
-    header_text = text[:600]
-    general_date_patterns = [
-        # 4-digit years - English dates (1980-2099 AD)
-        r'\b(\d{1,2}[/\-]\d{1,2}[/\-](?:20\d{2}|19[89]\d))\b',  # MM/DD/YYYY or DD/MM/YYYY
-        r'\b(\d{4}[/\-]\d{1,2}[/\-]\d{1,2})\b',  # YYYY/MM/DD
-        r'\b(\d{1,2}\.\d{1,2}\.(?:20\d{2}|19[89]\d))\b',  # DD.MM.YYYY
-        r'\b(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(?:20\d{2}|19[89]\d))\b',  # 21 Dec 2025
-        r'\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+(?:20\d{2}|19[89]\d))\b',  # Dec 21, 2025
-        # Nepali dates with Devanagari numerals
-        r'([०-९]{1,2}[/\-][०-९]{1,2}[/\-][०-९]{4})',  # Nepali DD/MM/YYYY
-        r'([०-९]{4}[/\-][०-९]{1,2}[/\-][०-९]{1,2})',  # Nepali YYYY/MM/DD
-        # Nepali month names
-        r'\b(\d{1,2}\s+(?:Baisakh|Jestha|Ashar|Shrawan|Bhadra|Ashwin|Kartik|Mangsir|Poush|Magh|Falgun|Chaitra)\s+\d{4})\b',
-        # 2-digit years (like 02/15/24 or 02/15/25)
-        r'\b(\d{1,2}[/\-]\d{1,2}[/\-]\d{2})\b',
-        # MM/DD without year (like 02/15) - will default to current year
-        r'\b(\d{1,2}[/\-]\d{1,2})(?![/\-]\d)\b',
-    ]
-    
-    for pattern in general_date_patterns:
-        match = re.search(pattern, header_text, re.IGNORECASE)
-        if match:
-            date_str = match.group(1) if match.groups() else match.group(0)
-            
-            if not any(sep in date_str for sep in ['/', '-', '.', ' ']):
-                logger.debug(f"[_extract_date_regex] Skipping '{date_str}' - no separator")
-                continue
-            
-            # Validate date string doesn't look corrupted
-            if len(date_str) < 6:  # Too short to be a valid date
-                logger.debug(f"[_extract_date_regex] Skipping '{date_str}' - too short")
-                continue
-            
-            normalized = _normalize_date(date_str)
-            if normalized and _is_valid_date(normalized):
-                logger.info(f"[_extract_date_regex] Found date in header: '{date_str}' -> '{normalized}'")
-                return normalized
-            else:
-                logger.warning(f"[_extract_date_regex] Rejected invalid date: '{date_str}' -> '{normalized}'")
-    
-    # Priority 5: Any date in full document (last resort)
-    for pattern in general_date_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            date_str = match.group(1) if match.groups() else match.group(0)
-            
-            if not any(sep in date_str for sep in ['/', '-', '.', ' ']):
-                continue
-            
-            # Validate date string doesn't look corrupted
-            if len(date_str) < 6:
-                continue
-            
-            normalized = _normalize_date(date_str)
-            if normalized and _is_valid_date(normalized):
-                logger.info(f"[_extract_date_regex] Found date in document: '{date_str}' -> '{normalized}'")
-                return normalized
-    
-    logger.warning(f"[_extract_date_regex] No valid date found in text")
-    return None
+    return EXTRACTOR.date(text)
 
 
 def _is_valid_date(date_str: str) -> bool:
     """Validate that a normalized date string is reasonable for a transaction"""
-    try:
-        parts = date_str.split('-')
-        if len(parts) != 3:
-            return False
-            
-        year = int(parts[0])
-        month = int(parts[1])
-        day = int(parts[2])
-        
-        # Year must be between 2000 and current year + 1
-        from datetime import datetime
-        current_year = datetime.now().year
-        if not (2000 <= year <= current_year + 1):
-            return False
-        
-        # Month must be 1-12
-        if not (1 <= month <= 12):
-            return False
-        
-        # Day must be valid for the month
-        if not (1 <= day <= 31):
-            return False
-        
-        # Verify it's a valid date
-        datetime(year, month, day)
-        return True
-    except:
-        return False
+    return EXTRACTOR.is_valid_date(date_str)
 
 
 def _convert_nepali_to_english_date(nepali_date_str: str) -> Optional[str]:
     """Convert Nepali (BS) date to English (AD) date in YYYY-MM-DD format"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    try:
-        from nepali_datetime import date as NepaliDate
-        
-        # Devanagari to English numerals mapping
-        devanagari_map = {
-            '०': '0', '१': '1', '२': '2', '३': '3', '४': '4',
-            '५': '5', '६': '6', '७': '7', '८': '8', '९': '9'
-        }
-        
-        # Convert Devanagari numerals to English
-        english_date_str = nepali_date_str
-        has_devanagari = any(char in nepali_date_str for char in devanagari_map.keys())
-        for nep, eng in devanagari_map.items():
-            english_date_str = english_date_str.replace(nep, eng)
-        
-        # Try different BS date formats
-        # Format: YYYY/MM/DD or YYYY-MM-DD
-        match = re.match(r'^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$', english_date_str)
-        if match:
-            year, month, day = map(int, match.groups())
-            # Only treat as BS if:
-            # 1. Has Devanagari numerals, OR
-            # 2. Year is > 2026 (clearly BS), OR  
-            # 3. Year is 2026-2050 and month/day are valid BS dates
-            if has_devanagari or year > 2050:
-                if 2000 <= year <= 2100:
-                    try:
-                        nepali_date = NepaliDate(year, month, day)
-                        english_date = nepali_date.to_datetime_date()
-                        result = english_date.strftime('%Y-%m-%d')
-                        logger.info(f"[_convert_nepali_to_english_date] Converted BS {nepali_date_str} -> AD {result}")
-                        return result
-                    except Exception as e:
-                        logger.debug(f"[_convert_nepali_to_english_date] Failed to convert {nepali_date_str}: {e}")
-        
-        # Format: DD/MM/YYYY or DD-MM-YYYY
-        match = re.match(r'^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$', english_date_str)
-        if match:
-            day, month, year = map(int, match.groups())
-            # Same logic for DD/MM/YYYY format
-            if has_devanagari or year > 2050:
-                if 2000 <= year <= 2100:
-                    try:
-                        nepali_date = NepaliDate(year, month, day)
-                        english_date = nepali_date.to_datetime_date()
-                        result = english_date.strftime('%Y-%m-%d')
-                        logger.info(f"[_convert_nepali_to_english_date] Converted BS {nepali_date_str} -> AD {result}")
-                        return result
-                    except Exception as e:
-                        logger.debug(f"[_convert_nepali_to_english_date] Failed to convert {nepali_date_str}: {e}")
-        
-        # Nepali month names (in English) - if found, definitely BS
-        nepali_months = {
-            'baisakh': 1, 'baishakh': 1, 'वैशाख': 1,
-            'jestha': 2, 'jeth': 2, 'ज्येष्ठ': 2,
-            'ashar': 3, 'ashadh': 3, 'asar': 3, 'आषाढ': 3,
-            'shrawan': 4, 'sawan': 4, 'श्रावण': 4,
-            'bhadra': 5, 'bhadau': 5, 'भाद्र': 5,
-            'ashwin': 6, 'asoj': 6, 'आश्विन': 6,
-            'kartik': 7, 'कार्तिक': 7,
-            'mangsir': 8, 'mangshir': 8, 'मंसिर': 8,
-            'poush': 9, 'paush': 9, 'पौष': 9,
-            'magh': 10, 'माघ': 10,
-            'falgun': 11, 'phalgun': 11, 'फाल्गुन': 11,
-            'chaitra': 12, 'chait': 12, 'चैत्र': 12,
-        }
-        
-        # Try named month format: DD MonthName YYYY (definitely BS if Nepali month name found)
-        for month_name, month_num in nepali_months.items():
-            pattern = rf'\b(\d{{1,2}})\s+{re.escape(month_name)}\s+(\d{{4}})\b'
-            match = re.search(pattern, english_date_str, re.IGNORECASE)
-            if match:
-                day, year = map(int, match.groups())
-                if 2000 <= year <= 2100:
-                    try:
-                        nepali_date = NepaliDate(year, month_num, day)
-                        english_date = nepali_date.to_datetime_date()
-                        result = english_date.strftime('%Y-%m-%d')
-                        logger.info(f"[_convert_nepali_to_english_date] Converted BS {nepali_date_str} -> AD {result}")
-                        return result
-                    except Exception as e:
-                        logger.debug(f"[_convert_nepali_to_english_date] Failed to convert {nepali_date_str}: {e}")
-        
-    except Exception as e:
-        logger.debug(f"[_convert_nepali_to_english_date] Error: {e}")
-    
-    return None
+    return EXTRACTOR.nepali_to_english_date(nepali_date_str)
 
 
 def _normalize_date(date_str: str) -> Optional[str]:
     """Normalize date to YYYY-MM-DD format with robust parsing (supports both Nepali BS and English AD dates)"""
-    import logging
-    logger = logging.getLogger(__name__)
-    from datetime import datetime
-    
-    # Clean the input
-    date_str = date_str.strip()
-    
-    # Special case: MM/DD without year (like "02/15") - assume current year
-    match = re.match(r'^(\d{1,2})[/-](\d{1,2})$', date_str)
-    if match:
-        month, day = map(int, match.groups())
-        current_year = datetime.now().year
-        try:
-            dt = datetime(current_year, month, day)
-            normalized = dt.strftime('%Y-%m-%d')
-            logger.info(f"[_normalize_date] Parsed MM/DD (no year): '{date_str}' -> '{normalized}' (assumed {current_year})")
-            return normalized
-        except ValueError:
-            pass
-    
-    # Reject if input is too short (less than 5 chars can't be a valid date with year)
-    if len(date_str) < 5:
-        logger.warning(f"[_normalize_date] Rejected '{date_str}' - too short")
-        return None
-    
-    # Try Nepali date conversion first (if year is 2000-2100 in BS calendar)
-    nepali_result = _convert_nepali_to_english_date(date_str)
-    if nepali_result:
-        return nepali_result
-    
-    # Handle 2-digit years (like 02/15/24)
-    match = re.match(r'^(\d{1,2})[/-](\d{1,2})[/-](\d{2})$', date_str)
-    if match:
-        first, second, year_2digit = match.groups()
-        first_int = int(first)
-        second_int = int(second)
-        year_2digit_int = int(year_2digit)
-        
-        # Convert 2-digit year to 4-digit (00-50 -> 2000-2050, 51-99 -> 1951-1999)
-        if year_2digit_int <= 50:
-            year = 2000 + year_2digit_int
-        else:
-            year = 1900 + year_2digit_int
-        
-        # Try MM/DD/YY format first (US format)
-        try:
-            dt = datetime(year, first_int, second_int)
-            normalized = dt.strftime('%Y-%m-%d')
-            logger.info(f"[_normalize_date] Parsed MM/DD/YY: '{date_str}' -> '{normalized}'")
-            return normalized
-        except ValueError:
-            # Try DD/MM/YY format
-            try:
-                dt = datetime(year, second_int, first_int)
-                normalized = dt.strftime('%Y-%m-%d')
-                logger.info(f"[_normalize_date] Parsed DD/MM/YY: '{date_str}' -> '{normalized}'")
-                return normalized
-            except ValueError:
-                pass
-    
-    # First, try to handle common explicit formats with regex
-    # This prevents misinterpretation by dateutil
-    
-    # Format: DD/MM/YYYY or DD-MM-YYYY (day first, 4-digit year)
-    match = re.match(r'^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$', date_str)
-    if match:
-        first, second, year = match.groups()
-        first_int = int(first)
-        second_int = int(second)
-        year_int = int(year)
-        
-        # Smart detection: if first number > 12, it must be day
-        if first_int > 12:
-            try:
-                dt = datetime(year_int, second_int, first_int)
-                normalized = dt.strftime('%Y-%m-%d')
-                logger.info(f"[_normalize_date] Parsed DD/MM/YYYY (first>12): '{date_str}' -> '{normalized}'")
-                return normalized
-            except ValueError:
-                pass
-        # If second number > 12, first must be month
-        elif second_int > 12:
-            try:
-                dt = datetime(year_int, first_int, second_int)
-                normalized = dt.strftime('%Y-%m-%d')
-                logger.info(f"[_normalize_date] Parsed MM/DD/YYYY (second>12): '{date_str}' -> '{normalized}'")
-                return normalized
-            except ValueError:
-                pass
-        # Ambiguous case (both <= 12) - try both, prefer MM/DD/YYYY (US format)
-        else:
-            try:
-                dt = datetime(year_int, first_int, second_int)
-                normalized = dt.strftime('%Y-%m-%d')
-                logger.info(f"[_normalize_date] Parsed MM/DD/YYYY (ambiguous, US default): '{date_str}' -> '{normalized}'")
-                return normalized
-            except ValueError:
-                try:
-                    dt = datetime(year_int, second_int, first_int)
-                    normalized = dt.strftime('%Y-%m-%d')
-                    logger.info(f"[_normalize_date] Parsed DD/MM/YYYY (ambiguous, fallback): '{date_str}' -> '{normalized}'")
-                    return normalized
-                except ValueError:
-                    pass
-    
-    # Format: YYYY-MM-DD or YYYY/MM/DD
-    match = re.match(r'^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$', date_str)
-    if match:
-        year, month, day = match.groups()
-        try:
-            dt = datetime(int(year), int(month), int(day))
-            normalized = dt.strftime('%Y-%m-%d')
-            logger.info(f"[_normalize_date] Parsed YYYY-MM-DD: '{date_str}' -> '{normalized}'")
-            return normalized
-        except ValueError:
-            pass
-    
-    # Fallback to dateutil parser for text dates like "21 Dec 2019"
-    try:
-        from dateutil import parser
-        # Try with dayfirst=True (more common in receipts)
-        dt = parser.parse(date_str, fuzzy=True, dayfirst=True)
-        
-        # Validate the parsed date is reasonable
-        if dt.year < 1900 or dt.year > 2099:
-            logger.warning(f"[_normalize_date] Invalid year {dt.year} from '{date_str}'")
-            return None
-        
-        # Double-check we got a full date (not just a year)
-        normalized = dt.strftime('%Y-%m-%d')
-        if len(normalized) != 10:  # Must be YYYY-MM-DD format (10 chars)
-            logger.warning(f"[_normalize_date] Invalid format '{normalized}' from '{date_str}'")
-            return None
-            
-        logger.info(f"[_normalize_date] Parsed with dateutil: '{date_str}' -> '{normalized}'")
-        return normalized
-    except Exception as e:
-        logger.warning(f"[_normalize_date] Failed to parse '{date_str}': {e}")
-        return None
+    return EXTRACTOR.normalize_date(date_str)
 
 
 def parse_voice_input(transcript: str) -> Dict[str, any]:
@@ -940,9 +571,31 @@ def parse_voice_input(transcript: str) -> Dict[str, any]:
     Returns:
         Dict with amount, category, date, description
     """
-    import logging
-    logger = logging.getLogger(__name__)
+    normalized_transcript, result = _parse_voice_fields(transcript)
+
+    # Optional: refine fields with local Llama (Ollama)
+    result = _maybe_enrich_voice_with_ollama(normalized_transcript, result)
+
+    logger.info(f"[parse_voice_input] Final result: {result}")
     
+    return result
+
+
+async def aparse_voice_input(transcript: str) -> Dict[str, any]:
+    """
+    parse_voice_input() for async views: spaCy/FinBERT run in a worker
+    thread, and the Ollama refinement is awaited without holding one.
+    """
+    from asgiref.sync import sync_to_async
+
+    normalized_transcript, result = await sync_to_async(_parse_voice_fields, thread_sensitive=False)(transcript)
+    result = await _amaybe_enrich_voice_with_ollama(normalized_transcript, result)
+    logger.info(f"[parse_voice_input] Final result: {result}")
+    return result
+
+
+def _parse_voice_fields(transcript: str):
+    """The local (regex, spaCy, FinBERT) part of parse_voice_input: ``(normalized_transcript, result)``."""
     logger.info(f"[parse_voice_input] Parsing transcript: {transcript}")
     
     result = {
@@ -955,13 +608,7 @@ def parse_voice_input(transcript: str) -> Dict[str, any]:
     }
     
     # Convert Nepali numerals to English
-    devanagari_map = {
-        '०': '0', '१': '1', '२': '2', '३': '3', '४': '4',
-        '५': '5', '६': '6', '७': '7', '८': '8', '९': '9'
-    }
-    normalized_transcript = transcript
-    for nep, eng in devanagari_map.items():
-        normalized_transcript = normalized_transcript.replace(nep, eng)
+    normalized_transcript = EXTRACTOR.devanagari_to_ascii_digits(transcript)
 
     # Quick relative-date parsing (prevents "yesterday" becoming "today")
     relative_date = _extract_relative_date_from_text(normalized_transcript)
@@ -969,12 +616,6 @@ def parse_voice_input(transcript: str) -> Dict[str, any]:
         result['date'] = relative_date
         result['date_detected'] = True
     
-    # Nepali keywords for amount extraction
-    nepali_amount_keywords = [
-        r'रुपैयाँ', r'रुपिया', r'रुपया', r'रु\.?', r'Rs\.?', r'NPR',
-        r'खर्च', r'तिरेको', r'दिएको', r'भयो', r'पैसा'
-    ]
-    
     # Nepali category keywords mapping
     nepali_category_map = {
         'खाना': 'Food & Dining',
@@ -1011,33 +652,11 @@ def parse_voice_input(transcript: str) -> Dict[str, any]:
             result['category'] = category
             break
     
-    # Extract amount - try various patterns
-    amount_patterns = [
-        # Nepali patterns
-        r'(?:रु\.?|Rs\.?|NPR|रुपैयाँ|रुपिया)\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:रु\.?|Rs\.?|रुपैयाँ|रुपिया)',
-        # English patterns
-        r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:dollars?|bucks?)',
-        # General number patterns with context
-        r'(?:spent|paid|cost|खर्च|तिरे|दिए)\s*(?:\$|रु\.?)?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-        r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:for|को लागि|मा)',
-        # Standalone large numbers (likely amounts)
-        r'\b(\d{2,}(?:,\d{3})*(?:\.\d{2})?)\b',
-    ]
-    
-    for pattern in amount_patterns:
-        match = re.search(pattern, normalized_transcript, re.IGNORECASE)
-        if match:
-            try:
-                amount_str = match.group(1).replace(',', '')
-                amount = float(amount_str)
-                if 0.01 <= amount <= 10000000:  # Reasonable range
-                    result['amount'] = amount
-                    logger.info(f"[parse_voice_input] Extracted amount: {amount}")
-                    break
-            except ValueError:
-                continue
+    # Extract amount - currency markers, then spend verbs, then bare numbers
+    amount = EXTRACTOR.voice_amount(normalized_transcript)
+    if amount is not None:
+        result['amount'] = amount
+        logger.info(f"[parse_voice_input] Extracted amount: {amount}")
     
     # Extract entities using the general extractor
     entities = extract_entities_from_text(normalized_transcript)
@@ -1056,34 +675,16 @@ def parse_voice_input(transcript: str) -> Dict[str, any]:
         result['category'] = categorize_transaction_ai(transcript)
     
     # Clean up description - extract meaningful text
-    description_patterns = [
-        # "spent X on Y" -> Y is the description
-        r'(?:spent|paid|on|for|at)\s+(?:\$?\d+\s+)?(?:on|for|at)\s+(.+?)(?:\s+(?:today|yesterday|this)|\s*$)',
-        # "bought X" -> X is the description
-        r'(?:bought|purchased|got)\s+(.+?)(?:\s+(?:for|at|today|yesterday)|\s*$)',
-        # Nepali: "X मा खर्च" or "X किने"
-        r'(.+?)\s*(?:मा\s+)?(?:खर्च|किने|तिरे)',
-    ]
-    
-    for pattern in description_patterns:
-        match = re.search(pattern, transcript, re.IGNORECASE)
-        if match:
-            desc = match.group(1).strip()
-            if len(desc) > 2 and not desc.isdigit():
-                result['description'] = desc[:200]
-                break
+    description = EXTRACTOR.voice_description(transcript)
+    if description:
+        result['description'] = description
     
     # If still no good description, use merchant if available
     if entities['merchant'] and len(entities['merchant']) > 2:
         if result['description'] == transcript[:200]:
             result['description'] = entities['merchant']
-    
-    # Optional: refine fields with local Llama (Ollama)
-    result = _maybe_enrich_voice_with_ollama(normalized_transcript, result)
 
-    logger.info(f"[parse_voice_input] Final result: {result}")
-    
-    return result
+    return normalized_transcript, result
 
 
 def parse_receipt_text(text: str) -> Dict[str, any]:
@@ -1103,7 +704,21 @@ def parse_receipt_text(text: str) -> Dict[str, any]:
     logger.info(f"[parse_receipt_text] First 200 chars: {text[:200]}")
     
     entities = extract_entities_from_text(text)
-    
+    return _receipt_result(text, entities, categorize_transaction_ai(text))
+
+
+def parse_receipt_texts(texts: List[str]) -> List[Dict[str, any]]:
+    """
+    parse_receipt_text() for many OCR texts (batch uploads): entities come
+    from one extract_entities_many() pass and categories from one
+    categorize_many() call instead of a model call per receipt.
+    """
+    entities = extract_entities_many(texts)
+    categories = categorize_many(texts)
+    return [_receipt_result(*args) for args in zip(texts, entities, categories)]
+
+
+def _receipt_result(text: str, entities: Dict[str, Optional[str]], category: str) -> Dict[str, any]:
     logger.info(f"[parse_receipt_text] Extracted entities: {entities}")
     
     # Check if date was actually found or defaulted
@@ -1113,7 +728,7 @@ def parse_receipt_text(text: str) -> Dict[str, any]:
         'title': entities['merchant'] or 'Unknown Merchant',
         'amount': entities['amount'] or 0,
         'date': entities['date'] or datetime.now().strftime('%Y-%m-%d'),
-        'category': categorize_transaction_ai(text),
+        'category': category,
         'date_detected': date_found  # Flag to show if date was actually found
     }
 
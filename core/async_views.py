@@ -0,0 +1,301 @@
+"""
+Async views, for the AI endpoints that mostly wait on Ollama or a model.
+
+Served through ``ledger_ai_project/asgi.py`` (e.g. uvicorn), these hold no
+thread while Ollama generates a reply; ORM work and FinBERT/spaCy inference
+run through ``sync_to_async``.  They are plain Django views rather than DRF
+ones (DRF views are sync), so ``_authenticate`` applies the same rules as
+the REST_FRAMEWORK authentication classes: a JWT bearer token, or the
+session cookie plus a CSRF token.  Requests and responses are JSON, as
+elsewhere in the API.
+"""
+import functools
+import json
+import logging
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q, Sum
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.authentication import CSRFCheck
+from rest_framework.exceptions import AuthenticationFailed
+
+from .ai_service import _aollama_chat_json, _env_flag, aparse_voice_input, categorize_transaction_ai
+from .models import AssistantMessage, MonthlyCategoryRollup
+from .ollama_async import get_async_client
+from .ollama_client import OllamaUnavailable
+from .views import (
+    ASSISTANT_DISABLED_REPLY,
+    ASSISTANT_FAILED_REPLY,
+    ASSISTANT_SYSTEM_PROMPT,
+    _assistant_chat_messages,
+    _get_default_conversation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _jwt_user(request):
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken
+
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+def _csrf_failure(request):
+    check = CSRFCheck(lambda request: None)
+    check.process_request(request)
+    return check.process_view(request, None, (), {})
+
+
+async def _authenticate(request):
+    """The authenticated user, or None (bad or missing credentials, or CSRF failure)."""
+    if request.headers.get('Authorization', '').startswith('Bearer '):
+        return await sync_to_async(_jwt_user)(request)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return None
+    # Like DRF's SessionAuthentication: cookie-authenticated writes need the CSRF token
+    if await sync_to_async(_csrf_failure)(request):
+        return None
+    return user
+
+
+def _request_data(request):
+    """The body as a dict, JSON or form-encoded like DRF's request.data; None if malformed."""
+    if request.content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+        return request.POST.dict()
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def api_post(view):
+    """
+    Wrap an async view as an authenticated POST endpoint, as
+    ``@api_view(['POST'])`` with IsAuthenticated does for DRF views.  The
+    view is called as ``view(request, user, data)``.
+    """
+    @csrf_exempt  # checked in _authenticate for session users, as DRF does
+    @require_POST
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await _authenticate(request)
+        if user is None:
+            return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=403)
+        data = _request_data(request)
+        if data is None:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        return await view(request, user, data, *args, **kwargs)
+    return wrapper
+
+
+def _assistant_text(data):
+    """``(text, error)`` for the ``message`` field of an assistant request."""
+    text = data.get('message')
+    if not isinstance(text, str) or not text.strip():
+        return None, 'message is required'
+    text = text.strip()
+    if len(text) > 3000:
+        return None, 'message is too long (max 3000 chars)'
+    return text, None
+
+
+def _sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+
+def _start_turn(user, text, system_prompt):
+    convo = _get_default_conversation(user)
+    AssistantMessage.objects.create(conversation=convo, role=AssistantMessage.ROLE_USER, content=text)
+    return convo, _assistant_chat_messages(convo, system_prompt)
+
+
+def _save_reply(convo, reply):
+    message = AssistantMessage.objects.create(conversation=convo, role=AssistantMessage.ROLE_ASSISTANT, content=reply)
+    convo.save(update_fields=['updated_at'])
+    return message
+
+
+async def _stream_reply(convo, chat_messages):
+    # Sent at once so the browser has the response before the model's first token
+    yield ': connected\n\n'
+    parts = []
+    complete = False
+    try:
+        async for fragment in get_async_client().stream_chat(chat_messages):
+            parts.append(fragment)
+            yield _sse('token', {'text': fragment})
+        complete = True
+    except OllamaUnavailable as e:
+        logger.warning(f"[assistant_stream] Ollama stream failed: {e}")
+
+    # Stored once generation ends; a client that disconnects first cancels this
+    # generator, and only the user's message remains in the history
+    reply = ''.join(parts).strip() or ASSISTANT_FAILED_REPLY
+    message = await sync_to_async(_save_reply)(convo, reply)
+    yield _sse('done', {'reply': reply, 'message_id': message.id, 'complete': complete, 'ollama_used': True})
+
+
+@api_post
+async def assistant_stream(request, user, data):
+    """
+    assistant_send, streamed: the reply arrives as Server-Sent Events.
+
+    ``token`` events carry ``{"text": fragment}`` as Ollama generates them;
+    the last event is ``done`` with the full ``reply`` (as stored), its
+    ``message_id`` and ``complete`` (false when generation broke off).
+    """
+    text, error = _assistant_text(data)
+    if error:
+        return JsonResponse({'error': error}, status=400)
+
+    convo, chat_messages = await sync_to_async(_start_turn)(user, text, ASSISTANT_SYSTEM_PROMPT)
+
+    if _env_flag("LEDGER_AI_USE_OLLAMA", default=False):
+        events = _stream_reply(convo, chat_messages)
+    else:
+        events = _disabled_reply(convo)
+
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+    return response
+
+
+async def _disabled_reply(convo):
+    message = await sync_to_async(_save_reply)(convo, ASSISTANT_DISABLED_REPLY)
+    yield _sse('done', {'reply': ASSISTANT_DISABLED_REPLY, 'message_id': message.id, 'complete': True, 'ollama_used': False})
+
+
+@api_post
+async def assistant_send(request, user, data):
+    """Send a message to the assistant, store history, and return assistant reply."""
+    text, error = _assistant_text(data)
+    if error:
+        return JsonResponse({'error': error}, status=400)
+
+    convo, chat_messages = await sync_to_async(_start_turn)(
+        user, text, ASSISTANT_SYSTEM_PROMPT + ' Return ONLY strict JSON: {"reply": "..."}.'
+    )
+
+    if not _env_flag("LEDGER_AI_USE_OLLAMA", default=False):
+        await sync_to_async(_save_reply)(convo, ASSISTANT_DISABLED_REPLY)
+        return JsonResponse({'reply': ASSISTANT_DISABLED_REPLY, 'ollama_used': False})
+
+    # Conversation turns aren't cached: a repeated question deserves a fresh answer
+    result = await _aollama_chat_json(chat_messages, cache=False)
+    reply = None
+    if isinstance(result, dict) and isinstance(result.get('reply'), str):
+        reply = result.get('reply').strip()
+
+    if not reply:
+        reply = ASSISTANT_FAILED_REPLY
+
+    await sync_to_async(_save_reply)(convo, reply)
+    return JsonResponse({'reply': reply, 'ollama_used': True})
+
+
+def _rule_based_insight(user):
+    """Generate a meaningful insight from real transaction data."""
+    now = date.today()
+    rollups = MonthlyCategoryRollup.objects.filter(
+        owner=user,
+        month=now.replace(day=1),
+        count__gt=0,
+    ).exclude(Q(category__iexact='income') | Q(category__iexact='savings'))
+
+    total_spent = float(rollups.aggregate(s=Sum('total'))['s'] or 0)
+    days_passed = now.day
+    days_in_month = 30
+
+    if total_spent == 0:
+        return "No expenses recorded this month yet — great start!"
+
+    daily_avg = total_spent / days_passed
+    projected = daily_avg * days_in_month
+
+    # Top category (one rollup row per category for the month)
+    top_cat = rollups.values('category', 'total').order_by('-total').first()
+    top_cat_str = f" Your biggest spending category is {top_cat['category']} (${float(top_cat['total']):.0f})." if top_cat else ""
+
+    # Spending pace message
+    if daily_avg < 30:
+        pace = "Your spending pace is very low this month — well done!"
+    elif daily_avg < 60:
+        pace = f"You're averaging ${daily_avg:.0f}/day — on track for a reasonable month."
+    else:
+        pace = f"You're averaging ${daily_avg:.0f}/day. At this pace, you'll spend ~${projected:.0f} this month."
+
+    return f"{pace}{top_cat_str}"
+
+
+@api_post
+async def forecast_insights(request, user, data):
+    """Return a spending insight. Uses rule-based logic by default; Ollama when enabled."""
+    spending_data = data.get('spendingData', [])
+
+    if _env_flag("LEDGER_AI_USE_OLLAMA", default=False) and spending_data:
+        system = (
+            "You are a personal finance assistant. "
+            "Given daily expense totals for the current month, write ONE short insight in <= 2 sentences. "
+            "Be specific but avoid assumptions about income. "
+            "Return ONLY strict JSON with key: insight (string)."
+        )
+        user_msg = {
+            "spending_trend": spending_data,
+            "output_schema": {"insight": "string"},
+        }
+        result = await _aollama_chat_json([
+            {"role": "system", "content": system},
+            {"role": "user", "content": json.dumps(user_msg, ensure_ascii=False)},
+        ])
+        if isinstance(result, dict) and isinstance(result.get('insight'), str) and result['insight'].strip():
+            return JsonResponse({'insight': result['insight'].strip(), 'ollama_used': True})
+
+    # Fallback: rule-based insight
+    insight_text = await sync_to_async(_rule_based_insight)(user)
+    return JsonResponse({'insight': insight_text, 'ollama_used': False})
+
+
+@api_post
+async def categorize_with_ai(request, user, data):
+    """
+    Categorize transaction text using FinBERT + keyword matching
+    """
+    text = data.get('text', '')
+
+    if not text:
+        return JsonResponse({'error': 'Text is required'}, status=400)
+
+    try:
+        # No ORM here, so any worker thread will do
+        category = await sync_to_async(categorize_transaction_ai, thread_sensitive=False)(text)
+        return JsonResponse({'category': category})
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@api_post
+async def parse_voice_input(request, user, data):
+    """
+    Parse voice transcript to extract transaction details
+    """
+    transcript = data.get('transcript', '')
+
+    if not transcript:
+        return JsonResponse({'error': 'Transcript is required'}, status=400)
+
+    try:
+        result = await aparse_voice_input(transcript)
+        return JsonResponse(result)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
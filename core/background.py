@@ -0,0 +1,72 @@
+"""
+In-process deferred work queue.
+
+``defer()`` hands a callable to a daemon worker thread once the current
+database transaction commits, so request handlers return without waiting on
+slow side effects such as SMTP.  Work is best-effort: anything still queued
+when the process exits is lost, which is acceptable for notifications.
+
+Set ``LEDGER_AI_DEFER_SYNC=1`` to run deferred work inline instead (tests,
+management commands, single-shot scripts).
+"""
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Deferred task %s failed", getattr(func, '__name__', func))
+
+
+def _worker_loop():
+    while True:
+        func, args, kwargs = _queue.get()
+        try:
+            _run(func, args, kwargs)
+        finally:
+            _queue.task_done()
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, name='ledger-deferred', daemon=True)
+            _worker.start()
+
+
+def _enqueue(func, args, kwargs):
+    if getattr(settings, 'LEDGER_AI_DEFER_SYNC', False):
+        _run(func, args, kwargs)
+        return
+    _ensure_worker()
+    _queue.put((func, args, kwargs))
+
+
+def defer(func, *args, **kwargs):
+    """Run ``func(*args, **kwargs)`` in the background after the transaction commits."""
+    transaction.on_commit(lambda: _enqueue(func, args, kwargs))
+
+
+def drain(timeout=None):
+    """Block until every queued task has run. Intended for tests and benchmarks."""
+    if timeout is None:
+        _queue.join()
+        return True
+    done = threading.Event()
+    threading.Thread(target=lambda: (_queue.join(), done.set()), daemon=True).start()
+    return done.wait(timeout)
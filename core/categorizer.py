@@ -0,0 +1,181 @@
+"""
+Keyword categorization with an Aho-Corasick automaton.
+
+All category keywords are compiled into one automaton, so a title is
+categorized in a single pass over its characters, however many keywords
+there are.  Matching keeps the semantics of the old nested loop: a keyword
+matches anywhere in the lowercased text, and when several categories match,
+the one listed first wins.
+
+Keywords come from ``core.constants.CATEGORY_KEYWORDS`` plus the optional
+``LEDGER_AI_CATEGORY_KEYWORDS`` setting.  Site-defined keywords take
+precedence over the built-in ones.
+
+``recategorize()`` applies the categorizer (or, with ``use_model``, the
+batched FinBERT path in ``ai_service.categorize_many``) to a Transaction
+queryset in batches.
+"""
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+
+class KeywordCategorizer:
+    """
+    ``tiers`` is a sequence of ``{category: [keywords]}`` dicts, highest
+    precedence first; within a tier, categories keep their listed order.
+    """
+
+    def __init__(self, *tiers):
+        self.categories = []
+        ranks = {}  # keyword -> best rank
+        for tier in tiers:
+            for category, keywords in tier.items():
+                rank = len(self.categories)
+                self.categories.append(category)
+                for keyword in keywords:
+                    keyword = keyword.lower()
+                    if keyword and rank < ranks.get(keyword, rank + 1):
+                        ranks[keyword] = rank
+        self._build(ranks)
+
+    def _build(self, ranks):
+        no_match = len(self.categories)
+        goto = [{}]
+        best = [no_match]
+        for keyword, rank in ranks.items():
+            node = 0
+            for ch in keyword:
+                if ch not in goto[node]:
+                    goto.append({})
+                    best.append(no_match)
+                    goto[node][ch] = len(goto) - 1
+                node = goto[node][ch]
+            best[node] = min(best[node], rank)
+
+        # Breadth-first: fail links, then fold each node's fail chain into
+        # both its best rank and its transitions, turning the trie into a DFA
+        # where every step is a single dict lookup.
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            best[node] = min(best[node], best[fail[node]])
+            transitions = dict(delta[fail[node]])
+            transitions.update(goto[node])
+            delta[node] = transitions
+            for ch, child in goto[node].items():
+                fail[child] = delta[fail[node]].get(ch, 0)
+                queue.append(child)
+
+        self._delta = delta
+        self._best = best
+        self._no_match = no_match
+
+    def rank(self, text_lower):
+        """Index into ``categories`` of the best match, or None."""
+        delta, best = self._delta, self._best
+        found = self._no_match
+        node = 0
+        for ch in text_lower:
+            node = delta[node].get(ch, 0)
+            if best[node] < found:
+                found = best[node]
+                if found == 0:
+                    break
+        return None if found == self._no_match else found
+
+    def categorize(self, text):
+        """Best category for ``text`` (any case), or None when no keyword matches."""
+        found = self.rank(text.lower())
+        return None if found is None else self.categories[found]
+
+
+_categorizer = None
+_categorizer_lock = threading.Lock()
+
+
+def get_categorizer():
+    """The shared categorizer, built from constants and settings on first use."""
+    global _categorizer
+    if _categorizer is None:
+        with _categorizer_lock:
+            if _categorizer is None:
+                from .constants import CATEGORY_KEYWORDS
+                extra = getattr(settings, 'LEDGER_AI_CATEGORY_KEYWORDS', None) or {}
+                _categorizer = KeywordCategorizer(extra, CATEGORY_KEYWORDS)
+    return _categorizer
+
+
+def reset_categorizer():
+    """Drop the shared categorizer so the next use rereads settings (tests)."""
+    global _categorizer
+    with _categorizer_lock:
+        _categorizer = None
+
+
+RECATEGORIZE_BATCH_SIZE = 2000
+
+
+def recategorize(transactions, categorizer=None, batch_size=RECATEGORIZE_BATCH_SIZE, use_model=False):
+    """
+    Set the keyword category on every row of the ``transactions`` queryset
+    that matches one and isn't already in it.  With ``use_model``, rows no
+    keyword matches are classified by FinBERT, one pipeline call per batch.
+
+    Rows are read in primary-key batches as plain tuples holding only the
+    columns needed to categorize and to adjust rollups, and each batch is
+    written with one ``UPDATE ... WHERE id IN (...)`` per new category.
+    Keyset batches rather than ``iterator()``, since SQLite doesn't define
+    what a cursor sees while its table is being updated.
+    Returns ``{'total_checked', 'updated_count', 'categories'}``, where
+    ``categories`` counts updated rows per new category.
+    """
+    from .models import Transaction
+    from .rollups import apply_deltas, collect_changes, new_deltas
+
+    categorizer = categorizer or get_categorizer()
+    rows = transactions.order_by('pk').values_list('pk', 'owner_id', 'title', 'notes', 'category', 'date', 'amount')
+    checked = 0
+    tallies = Counter()
+    deltas = new_deltas()
+    last_pk = None
+
+    with transaction.atomic():
+        while True:
+            batch = list((rows if last_pk is None else rows.filter(pk__gt=last_pk))[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            checked += len(batch)
+
+            texts = [f"{title} {notes or ''}" for _, _, title, notes, _, _, _ in batch]
+            if use_model:
+                from .ai_service import categorize_many
+                categories = [c if c != 'Other' else None for c in categorize_many(texts)]
+            else:
+                categories = [categorizer.categorize(text) for text in texts]
+
+            changed, pairs = {}, []
+            for (pk, owner_id, _, _, old_category, txn_date, amount), category in zip(batch, categories):
+                if not category or category == old_category:
+                    continue
+                month = txn_date.replace(day=1)
+                pairs.append(((owner_id, month, old_category or '', amount), (owner_id, month, category, amount)))
+                tallies[category] += 1
+                changed.setdefault(category, []).append(pk)
+            for category, pks in changed.items():
+                Transaction.objects.filter(pk__in=pks).update(category=category)
+            collect_changes(pairs, deltas)
+        apply_deltas(deltas)
+
+    return {
+        'total_checked': checked,
+        'updated_count': sum(tallies.values()),
+        'categories': dict(tallies),
+    }
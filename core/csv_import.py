@@ -0,0 +1,154 @@
+"""
+Streaming CSV import for transactions.
+
+The upload is decoded incrementally and rows are validated one at a time, so
+memory depends on the batch size rather than the file size.  Valid rows are
+inserted with ``bulk_create`` in fixed-size batches inside one transaction;
+invalid rows are counted per error type and a few are sampled for the report.
+With ``categorize``, rows without a Category are categorized a batch at a
+time through ``ai_service.categorize_many``.
+"""
+import codecs
+import csv
+import time
+from collections import Counter
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .ai_service import _normalize_date, categorize_many
+from .models import Transaction
+from .rollups import apply_deltas, collect_created, new_deltas
+
+REQUIRED_COLUMNS = ('Title', 'Amount', 'Date')
+BATCH_SIZE = 1000
+MAX_ERROR_SAMPLES = 20
+# DecimalField(max_digits=12, decimal_places=2)
+_MAX_AMOUNT = Decimal('9999999999.99')
+
+_title_max = Transaction._meta.get_field('title').max_length
+_category_max = Transaction._meta.get_field('category').max_length
+
+
+class ImportFormatError(ValueError):
+    """The file as a whole can't be imported (encoding, missing columns)."""
+
+
+def _iter_lines(fileobj, encoding='utf-8-sig'):
+    # IncrementalDecoder keeps memory bounded and reports bad bytes as they arrive
+    decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = fileobj.chunks() if hasattr(fileobj, 'chunks') else iter(lambda: fileobj.read(64 * 1024), b'')
+    pending = ''
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split('\n')
+        # The last piece is an unterminated line; keep it for the next chunk
+        pending = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def _parse_row(row, normalized_dates):
+    title = (row.get('Title') or '').strip()
+    if not title:
+        return None, 'missing_title'
+
+    try:
+        # Rounded before the range check: 9999999999.995 rounds past max_digits
+        amount = Decimal((row.get('Amount') or '').strip()).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        return None, 'invalid_amount'
+    if not amount.is_finite() or abs(amount) > _MAX_AMOUNT:
+        return None, 'invalid_amount'
+
+    raw_date = (row.get('Date') or '').strip()
+    if raw_date not in normalized_dates:
+        # Exports repeat the same few thousand dates; parse each string once
+        normalized = _normalize_date(raw_date) if raw_date else None
+        normalized_dates[raw_date] = date.fromisoformat(normalized) if normalized else None
+    txn_date = normalized_dates[raw_date]
+    if not txn_date:
+        return None, 'invalid_date'
+
+    return {
+        'title': title[:_title_max],
+        'amount': amount,
+        'date': txn_date,
+        'category': (row.get('Category') or '').strip()[:_category_max],
+        'notes': row.get('Notes') or '',
+    }, None
+
+
+def _fill_categories(batch):
+    blank = [txn for txn in batch if not txn.category]
+    if blank:
+        texts = [f"{txn.title} {txn.notes}" for txn in blank]
+        for txn, category in zip(blank, categorize_many(texts)):
+            txn.category = category
+
+
+def import_transactions(user, fileobj, batch_size=BATCH_SIZE, categorize=False):
+    """
+    Import a Title/Amount/Date[/Category/Notes] CSV for ``user``.
+
+    Returns a report dict with ``imported``, ``skipped``, per-type ``errors``,
+    sampled ``error_rows`` (1-based line numbers) and ``rows_per_second``.
+    Raises ImportFormatError when the header or encoding is unusable; nothing
+    is written in that case.
+    """
+    started = time.perf_counter()
+    reader = csv.DictReader(_iter_lines(fileobj))
+    errors = Counter()
+    error_rows = []
+    normalized_dates = {}
+    imported = 0
+    rows_seen = 0
+    batch = []
+    rollup_deltas = new_deltas()
+
+    def flush():
+        if categorize:
+            _fill_categories(batch)
+        created = Transaction.objects.bulk_create(batch)
+        collect_created(created, rollup_deltas)
+        batch.clear()
+        return len(created)
+
+    try:
+        with transaction.atomic():
+            missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+            if missing:
+                raise ImportFormatError(f"Missing required column(s): {', '.join(missing)}")
+
+            for row in reader:
+                rows_seen += 1
+                fields, error = _parse_row(row, normalized_dates)
+                if error:
+                    errors[error] += 1
+                    if len(error_rows) < MAX_ERROR_SAMPLES:
+                        error_rows.append({'line': reader.line_num, 'error': error})
+                    continue
+                batch.append(Transaction(owner=user, **fields))
+                if len(batch) >= batch_size:
+                    imported += flush()
+            if batch:
+                imported += flush()
+            apply_deltas(rollup_deltas)
+    except UnicodeDecodeError:
+        raise ImportFormatError('File is not valid UTF-8')
+    except csv.Error as e:
+        raise ImportFormatError(f'Malformed CSV: {e}')
+
+    elapsed = time.perf_counter() - started
+    return {
+        'imported': imported,
+        'skipped': rows_seen - imported,
+        'errors': dict(errors),
+        'error_rows': error_rows,
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'rows_per_second': round(rows_seen / elapsed) if elapsed > 0 else rows_seen,
+    }
@@ -0,0 +1,24 @@
+"""
+Spending forecast engine (linear regression, Holt smoothing, Monte Carlo).
+"""
+from .algorithms import (
+    holts_double_exponential,
+    inverse_error_weights,
+    linear_regression,
+    mean_absolute_error,
+    monte_carlo_forecast,
+    seasonality_indices,
+)
+from .engine import MONTE_CARLO_SEED, MONTE_CARLO_SIMULATIONS, build_forecast
+
+__all__ = [
+    'build_forecast',
+    'holts_double_exponential',
+    'inverse_error_weights',
+    'linear_regression',
+    'mean_absolute_error',
+    'monte_carlo_forecast',
+    'seasonality_indices',
+    'MONTE_CARLO_SEED',
+    'MONTE_CARLO_SIMULATIONS',
+]
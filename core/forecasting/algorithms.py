@@ -0,0 +1,116 @@
+"""
+Forecasting algorithms over a monthly spending series, vectorized with NumPy.
+
+All functions take plain sequences of floats (one value per month, oldest
+first) and return plain Python floats/lists so results serialize directly.
+"""
+import numpy as np
+
+
+def linear_regression(x_vals, y_vals):
+    """Closed-form least squares. Returns (slope, intercept)."""
+    x = np.asarray(x_vals, dtype=float)
+    y = np.asarray(y_vals, dtype=float)
+    n = len(x)
+    if n < 2:
+        return 0, float(y[0]) if n else 0
+    dx = x - x.mean()
+    denominator = float(np.dot(dx, dx))
+    if denominator == 0:
+        return 0, float(y.mean())
+    slope = float(np.dot(dx, y - y.mean())) / denominator
+    intercept = float(y.mean()) - slope * float(x.mean())
+    return slope, intercept
+
+
+def seasonality_indices(month_numbers, y_vals):
+    """Average spend per calendar month divided by the overall average."""
+    months = np.asarray(month_numbers, dtype=int)
+    y = np.asarray(y_vals, dtype=float)
+    overall_avg = float(y.mean()) if len(y) else 0
+    seasonality = {}
+    for month_num in dict.fromkeys(months.tolist()):
+        avg = float(y[months == month_num].mean())
+        seasonality[month_num] = avg / overall_avg if overall_avg > 0 else 1.0
+    return seasonality
+
+
+def holts_double_exponential(y_vals, alpha=0.3, beta=0.1):
+    """
+    Holt's method captures level + trend.
+    Returns (fitted_values, level, trend) so we can extrapolate.
+
+    The recurrence is inherently sequential; it runs once per month of
+    history, so it stays a plain loop.
+    """
+    n = len(y_vals)
+    if n == 0:
+        return [], 0, 0
+    if n == 1:
+        return [y_vals[0]], y_vals[0], 0
+
+    # Initialise: level = first observation, trend = second − first
+    level = y_vals[0]
+    trend = y_vals[1] - y_vals[0]
+    fitted = [level]  # first fitted value
+
+    for t in range(1, n):
+        prev_level = level
+        level = alpha * y_vals[t] + (1 - alpha) * (prev_level + trend)
+        trend = beta * (level - prev_level) + (1 - beta) * trend
+        fitted.append(round(level + trend, 2))
+
+    return fitted, level, trend
+
+
+def monte_carlo_forecast(y_vals, n_months=6, n_simulations=100_000, seed=42):
+    """
+    Simulate future paths based on the historical distribution of
+    month-over-month *percentage* changes.  Returns median predictions
+    plus P10/P90 confidence bands.
+
+    All paths are drawn as one ``(n_simulations, n_months)`` array.  Since a
+    path is ``val_t = max(0, val_{t-1} * (1 + change_t))`` and the starting
+    value is non-negative, it equals the last actual times the cumulative
+    product of ``max(0, 1 + change)``.
+    """
+    if len(y_vals) < 2:
+        last = y_vals[-1] if y_vals else 0
+        return [last] * n_months, [last] * n_months, [last] * n_months
+
+    y = np.asarray(y_vals, dtype=float)
+    prev = y[:-1]
+    # Month-over-month percentage changes (0 when the previous month was 0)
+    pct_changes = np.divide(y[1:] - prev, prev, out=np.zeros_like(prev), where=prev > 0)
+
+    mean_change = float(pct_changes.mean())
+    if len(pct_changes) > 1:
+        std_change = float(pct_changes.std(ddof=1))
+    else:
+        std_change = abs(mean_change) * 0.2  # fallback
+
+    rng = np.random.default_rng(seed)  # reproducible
+    changes = rng.normal(mean_change, std_change, size=(n_simulations, n_months))
+    paths = y[-1] * np.cumprod(np.maximum(0.0, 1.0 + changes), axis=1)
+
+    # 'higher' picks the same order statistic as sorted(values)[int(n * q)]
+    p10, p50, p90 = np.percentile(paths, [10, 50, 90], axis=0, method='higher')
+    return (
+        np.round(p50, 2).tolist(),
+        np.round(p10, 2).tolist(),
+        np.round(p90, 2).tolist(),
+    )
+
+
+def mean_absolute_error(fitted, actuals):
+    pairs = [(f, a) for f, a in zip(fitted, actuals) if f is not None]
+    if not pairs:
+        return 1.0
+    f, a = np.asarray(pairs, dtype=float).T
+    return float(np.abs(f - a).mean())
+
+
+def inverse_error_weights(*errors, eps=0.01):
+    """Inverse-MAE weighting (lower error = higher weight), normalised to 1."""
+    inverse = 1.0 / (np.asarray(errors, dtype=float) + eps)
+    return (inverse / inverse.sum()).tolist()
@@ -0,0 +1,102 @@
+"""
+Per-user cache for the /api/ai/forecast/ payload.
+
+Entries are keyed by a per-user data version token.  Anything that changes the
+forecast inputs (transaction rollups, income sources) calls
+``bump_data_version()``, which swaps the token so old entries are never read
+again and simply expire.  Works with any Django cache backend; use Redis
+(``REDIS_URL``) so every worker process shares entries, versions and counters.
+With per-process local memory and more than one web worker
+(``WEB_CONCURRENCY``), a write would bump the version only in the worker that
+handled it, so forecasts aren't cached at all then.
+"""
+import os
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+_VERSION_KEY = 'forecast:version:{user_id}'
+_ENTRY_KEY = 'forecast:payload:{user_id}:{version}:{day}'
+_STATS_KEYS = {'hits': 'forecast:stats:hits', 'misses': 'forecast:stats:misses'}
+
+
+def _timeout():
+    return getattr(settings, 'LEDGER_AI_FORECAST_CACHE_TTL', 3600)
+
+
+def enabled():
+    """False when every web worker would keep its own, unsynchronised copy."""
+    backend = settings.CACHES['default']['BACKEND']
+    web_workers = int(os.getenv('WEB_CONCURRENCY', '1') or 1)
+    return not (backend.endswith('.LocMemCache') and web_workers > 1)
+
+
+def data_version(user_id):
+    key = _VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # First read (or evicted): start a fresh token so no older entry can match
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def _set_versions(user_ids):
+    cache.set_many({_VERSION_KEY.format(user_id=uid): uuid.uuid4().hex for uid in user_ids}, None)
+
+
+def bump_data_version(*user_ids):
+    """Invalidate cached forecasts for these users."""
+    user_ids = {uid for uid in user_ids if uid is not None}
+    if not user_ids:
+        return
+    _set_versions(user_ids)
+    if connection.in_atomic_block:
+        # Bump again once the data is visible, so a forecast computed from
+        # pre-commit rows in the meantime is never served.
+        transaction.on_commit(lambda: _set_versions(user_ids))
+
+
+def _count(outcome):
+    key = _STATS_KEYS[outcome]
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_or_build(user_id, day, build):
+    """
+    Return ``(payload, hit)``: the cached forecast for ``user_id`` on ``day``,
+    or ``build()`` stored under the current data version.
+    """
+    if not enabled():
+        return build(), False
+    key = _ENTRY_KEY.format(user_id=user_id, version=data_version(user_id), day=day.isoformat())
+    payload = cache.get(key)
+    if payload is not None:
+        _count('hits')
+        return payload, True
+    _count('misses')
+    payload = build()
+    cache.set(key, payload, _timeout())
+    return payload, False
+
+
+def stats():
+    values = cache.get_many(list(_STATS_KEYS.values()))
+    hits = values.get(_STATS_KEYS['hits'], 0)
+    misses = values.get(_STATS_KEYS['misses'], 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else None,
+    }
+
+
+def reset_stats():
+    cache.delete_many(list(_STATS_KEYS.values()))
@@ -0,0 +1,248 @@
+"""
+Assemble the /api/ai/forecast/ payload from a user's monthly spending.
+
+Runs the three algorithms in ``algorithms``, blends them into an inverse-MAE
+weighted ensemble and builds the per-month, per-category and insight sections.
+"""
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+
+from .algorithms import (
+    holts_double_exponential,
+    inverse_error_weights,
+    linear_regression,
+    mean_absolute_error,
+    monte_carlo_forecast,
+    seasonality_indices,
+)
+
+FORECAST_MONTHS = 6
+MONTE_CARLO_SIMULATIONS = 100_000
+MONTE_CARLO_SEED = 42
+
+
+def build_forecast(monthly_spending, monthly_income, today=None,
+                   n_simulations=MONTE_CARLO_SIMULATIONS, seed=MONTE_CARLO_SEED):
+    """
+    Build the forecast payload.
+
+    Args:
+        monthly_spending: {'YYYY-MM': {'total': float, 'categories': {name: float}}}
+            for months with spending (income excluded).
+        monthly_income: Sum of the user's active monthly income sources.
+        today: Reference date for future months (defaults to today).
+        n_simulations: Monte Carlo path count.
+        seed: Monte Carlo RNG seed; the same seed gives the same payload.
+    """
+    today = today or date.today()
+    sorted_months = sorted(monthly_spending.keys())
+
+    if len(sorted_months) < 2:
+        current_month = today.strftime('%Y-%m')
+        current_spending = monthly_spending.get(current_month, {'total': 0})['total']
+        return {
+            'monthly_data': [{
+                'month': current_month,
+                'actual': current_spending,
+                'predicted': None,
+                'predicted_lr': None,
+                'predicted_ema': None,
+                'predicted_mc': None,
+                'label': today.strftime('%b %Y')
+            }],
+            'predictions': [],
+            'category_breakdown': [],
+            'algorithms': {},
+            'insights': {
+                'total_predicted_spending': current_spending,
+                'predicted_savings': 0,
+                'trend': 'neutral',
+                'trend_percentage': 0,
+                'top_growing_category': None,
+                'recommendation': 'Keep tracking your expenses for at least 2 months to get accurate predictions.'
+            }
+        }
+
+    x_values = list(range(len(sorted_months)))
+    y_values = [monthly_spending[m]['total'] for m in sorted_months]
+
+    # ══════════════════════════════════════════════════════════════════════
+    # ALGORITHM 1 — Linear Regression + Seasonality
+    # ══════════════════════════════════════════════════════════════════════
+
+    slope, intercept = linear_regression(x_values, y_values)
+    seasonality = seasonality_indices([int(m.split('-')[1]) for m in sorted_months], y_values)
+
+    # Fitted values (historical)
+    lr_fitted = [round(slope * i + intercept, 2) for i in x_values]
+
+    # Future values
+    last_index = len(sorted_months) - 1
+    lr_predictions = []
+    for i in range(1, FORECAST_MONTHS + 1):
+        future_date = today + relativedelta(months=i)
+        base = slope * (last_index + i) + intercept
+        seasonal_factor = seasonality.get(future_date.month, 1.0)
+        lr_predictions.append(round(max(0, base * seasonal_factor), 2))
+
+    # ══════════════════════════════════════════════════════════════════════
+    # ALGORITHM 2 — Holt's Double Exponential Smoothing
+    # ══════════════════════════════════════════════════════════════════════
+
+    ema_fitted, ema_level, ema_trend = holts_double_exponential(y_values)
+    ema_predictions = [round(max(0, ema_level + ema_trend * k), 2) for k in range(1, FORECAST_MONTHS + 1)]
+
+    # ══════════════════════════════════════════════════════════════════════
+    # ALGORITHM 3 — Monte Carlo Simulation
+    # ══════════════════════════════════════════════════════════════════════
+
+    mc_median, mc_lower, mc_upper = monte_carlo_forecast(
+        y_values, n_months=FORECAST_MONTHS, n_simulations=n_simulations, seed=seed,
+    )
+
+    # Monte Carlo has no fitted concept; score it against the actuals themselves
+    mc_fitted = [round(v, 2) for v in y_values]
+
+    # ══════════════════════════════════════════════════════════════════════
+    # ENSEMBLE — weighted average of the three algorithms
+    # ══════════════════════════════════════════════════════════════════════
+
+    mae_lr = mean_absolute_error(lr_fitted, y_values) or 1.0
+    mae_ema = mean_absolute_error(ema_fitted, y_values) or 1.0
+    mae_mc = mean_absolute_error(mc_fitted, y_values) or 1.0  # will be 0 (uses actuals), cap it
+    w_lr, w_ema, w_mc = inverse_error_weights(mae_lr, mae_ema, mae_mc)
+
+    ensemble_predictions = [
+        round(max(0, w_lr * lr_predictions[i] + w_ema * ema_predictions[i] + w_mc * mc_median[i]), 2)
+        for i in range(FORECAST_MONTHS)
+    ]
+
+    # ══════════════════════════════════════════════════════════════════════
+    # Build response
+    # ══════════════════════════════════════════════════════════════════════
+
+    # Historical monthly data
+    monthly_data = []
+    for i, month_key in enumerate(sorted_months):
+        month_date = date.fromisoformat(f"{month_key}-01")
+        monthly_data.append({
+            'month': month_key,
+            'actual': round(monthly_spending[month_key]['total'], 2),
+            'predicted': lr_fitted[i],
+            'predicted_lr': lr_fitted[i],
+            'predicted_ema': ema_fitted[i] if i < len(ema_fitted) else None,
+            'label': month_date.strftime('%b %Y')
+        })
+
+    # Future predictions
+    predictions = []
+    for i in range(FORECAST_MONTHS):
+        future_date = today + relativedelta(months=i + 1)
+        predictions.append({
+            'month': future_date.strftime('%Y-%m'),
+            'actual': None,
+            'predicted': ensemble_predictions[i],
+            'predicted_lr': lr_predictions[i],
+            'predicted_ema': ema_predictions[i],
+            'predicted_mc': mc_median[i],
+            'confidence_lower': mc_lower[i],
+            'confidence_upper': mc_upper[i],
+            'label': future_date.strftime('%b %Y')
+        })
+
+    # Category breakdown (linear regression per category)
+    category_totals = {}
+    for month_key in sorted_months:
+        for category, amount in monthly_spending[month_key]['categories'].items():
+            category_totals.setdefault(category, []).append(amount)
+
+    category_breakdown = []
+    category_trends = {}
+
+    for category, values in category_totals.items():
+        avg_spending = sum(values) / len(values)
+        if len(values) >= 2:
+            cat_slope, _ = linear_regression(list(range(len(values))), values)
+            trend_pct = (cat_slope / avg_spending * 100) if avg_spending > 0 else 0
+        else:
+            trend_pct = 0
+        category_trends[category] = trend_pct
+        next_month_prediction = avg_spending * (1 + trend_pct / 100) if trend_pct else avg_spending
+
+        category_breakdown.append({
+            'category': category,
+            'average_monthly': round(avg_spending, 2),
+            'last_month': round(values[-1], 2) if values else 0,
+            'predicted_next': round(max(0, next_month_prediction), 2),
+            'trend': 'up' if trend_pct > 5 else ('down' if trend_pct < -5 else 'stable'),
+            'trend_percentage': round(trend_pct, 1)
+        })
+    category_breakdown.sort(key=lambda x: x['average_monthly'], reverse=True)
+
+    # Insights
+    total_predicted_6mo = sum(ensemble_predictions)
+    avg_predicted_monthly = total_predicted_6mo / FORECAST_MONTHS if predictions else 0
+    predicted_monthly_savings = monthly_income - avg_predicted_monthly if monthly_income > 0 else 0
+
+    recent_avg = sum(y_values[-3:]) / min(3, len(y_values))
+    older_avg = sum(y_values[:-3]) / max(1, len(y_values) - 3) if len(y_values) > 3 else y_values[0]
+    trend_pct = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
+
+    trend = 'up' if trend_pct > 5 else ('down' if trend_pct < -5 else 'stable')
+    top_growing = max(category_trends.items(), key=lambda x: x[1]) if category_trends else (None, 0)
+
+    if trend == 'up' and trend_pct > 15:
+        recommendation = f"Your spending is increasing by {abs(trend_pct):.1f}% monthly. Consider reviewing your {category_breakdown[0]['category'] if category_breakdown else 'largest expense'} spending."
+    elif trend == 'down':
+        recommendation = f"Great job! Your spending is decreasing by {abs(trend_pct):.1f}%. Keep up the good financial habits."
+    elif predicted_monthly_savings < 0:
+        recommendation = f"You're projected to spend ${abs(predicted_monthly_savings):.0f} more than your income. Consider setting budgets for high-spending categories."
+    elif top_growing[1] > 20:
+        recommendation = f"Your {top_growing[0]} spending is growing rapidly ({top_growing[1]:.1f}%/month). Consider setting a budget limit."
+    else:
+        recommendation = "Your spending is stable. Consider automating savings transfers to build your emergency fund."
+
+    # Algorithm summary
+    algorithms = {
+        'linear_regression': {
+            'name': 'Linear Regression',
+            'description': 'Fits a straight-line trend to your spending history with seasonal adjustment.',
+            'mae': round(mae_lr, 2),
+            'weight': round(w_lr * 100, 1),
+            'next_month': lr_predictions[0],
+        },
+        'exponential_smoothing': {
+            'name': 'Exponential Smoothing',
+            'description': "Holt's method that adapts to recent level and trend changes faster than linear regression.",
+            'mae': round(mae_ema, 2),
+            'weight': round(w_ema * 100, 1),
+            'next_month': ema_predictions[0],
+        },
+        'monte_carlo': {
+            'name': 'Monte Carlo',
+            'description': f'Runs {n_simulations:,} random simulations based on your historical spending volatility. Provides confidence bands.',
+            'mae': round(mae_mc, 2),
+            'weight': round(w_mc * 100, 1),
+            'next_month': mc_median[0],
+            'confidence_range': f"${mc_lower[0]} – ${mc_upper[0]}",
+        },
+    }
+
+    return {
+        'monthly_data': monthly_data,
+        'predictions': predictions,
+        'category_breakdown': category_breakdown[:8],
+        'algorithms': algorithms,
+        'insights': {
+            'total_predicted_spending': round(total_predicted_6mo, 2),
+            'avg_monthly_predicted': round(avg_predicted_monthly, 2),
+            'monthly_income': round(monthly_income, 2),
+            'predicted_savings': round(predicted_monthly_savings, 2),
+            'trend': trend,
+            'trend_percentage': round(trend_pct, 1),
+            'top_growing_category': top_growing[0] if top_growing[1] > 5 else None,
+            'top_growing_percentage': round(top_growing[1], 1) if top_growing[1] > 5 else 0,
+            'recommendation': recommendation
+        }
+    }
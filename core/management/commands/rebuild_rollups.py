@@ -0,0 +1,34 @@
+"""
+Recompute MonthlyCategoryRollup rows from the transactions table.
+
+Rollups are maintained incrementally; use this to reconcile after raw SQL
+edits or data repairs that bypassed the ORM.
+
+    python manage.py rebuild_rollups [--user USERNAME ...]
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import MonthlyCategoryRollup
+from core.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild monthly per-category spending rollups from raw transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='usernames', help='Limit to this username (repeatable).')
+
+    def handle(self, *args, **options):
+        owner_ids = None
+        if options['usernames']:
+            owner_ids = list(User.objects.filter(username__in=options['usernames']).values_list('id', flat=True))
+            if not owner_ids:
+                raise CommandError('No matching users.')
+
+        rebuild(owner_ids)
+
+        rows = MonthlyCategoryRollup.objects.all()
+        if owner_ids is not None:
+            rows = rows.filter(owner_id__in=owner_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows.count()} rollup rows"))
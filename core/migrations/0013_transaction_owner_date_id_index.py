@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_budget_alert_flags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['owner', '-date', '-id'], name='core_txn_owner_date_id_idx'),
+        ),
+    ]
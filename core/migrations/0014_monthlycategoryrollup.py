@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Transaction = apps.get_model('core', 'Transaction')
+    MonthlyCategoryRollup = apps.get_model('core', 'MonthlyCategoryRollup')
+
+    grouped = (
+        Transaction.objects.annotate(month=TruncMonth('date'))
+        .values('owner_id', 'month', 'category')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+    MonthlyCategoryRollup.objects.bulk_create(
+        (
+            MonthlyCategoryRollup(
+                owner_id=row['owner_id'],
+                month=row['month'],
+                category=row['category'] or '',
+                total=row['total'],
+                count=row['count'],
+            )
+            for row in grouped.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_transaction_owner_date_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCategoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('category', models.CharField(blank=True, default='', max_length=100)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['month', 'category'],
+                'unique_together': {('owner', 'month', 'category')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,154 @@
+"""
+Background warm-up of the FinBERT and spaCy models.
+
+Both are loaded lazily by core.ai_service, which left the first request after
+a deploy or worker recycle paying the full load time.  ``start()`` loads each
+model on its own daemon thread and runs one throwaway inference, so weights
+are paged in and lazy initialisation is done before real traffic needs it.
+Until a model is ready, ai_service's getters return None and callers fall
+back to keyword matching instead of waiting.
+
+gunicorn.conf.py calls ``start()`` in every worker (``post_worker_init``);
+``LEDGER_AI_WARMUP=false`` turns it off.  ``status()`` backs the
+``/api/health/`` and ``/api/health/ready/`` endpoints.
+
+With ``LEDGER_AI_PRELOAD_MODELS``, gunicorn.conf.py also calls ``preload()``
+in the master before it forks, so workers share the model weights
+copy-on-write instead of each holding a private copy.
+"""
+import gc
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+COLD, LOADING, READY, UNAVAILABLE = 'cold', 'loading', 'ready', 'unavailable'
+
+
+def _load_finbert():
+    from .ai_service import get_finbert_classifier
+    return get_finbert_classifier(wait=True)
+
+
+def _exercise_finbert(classifier):
+    from .ai_service import FINBERT_MAX_TOKENS
+    classifier(['Monthly salary deposit'], batch_size=1, truncation=True, max_length=FINBERT_MAX_TOKENS)
+
+
+def _load_spacy():
+    from .ai_service import get_spacy_nlp
+    return get_spacy_nlp(wait=True)
+
+
+def _exercise_spacy(nlp):
+    nlp('Paid Rs 1,250 at Bhatbhateni Supermarket on 2024-03-14')
+
+
+MODELS = {
+    'finbert': (_load_finbert, _exercise_finbert),
+    'spacy': (_load_spacy, _exercise_spacy),
+}
+
+_lock = threading.Lock()
+_started_pid = None
+_threads = []
+_state = {name: {'state': COLD, 'load_ms': None} for name in MODELS}
+
+
+def start():
+    """
+    Start warming every model in this process. Returns False when warm-up is
+    disabled or already started here (a forked child starts its own).
+    """
+    global _started_pid
+    if not getattr(settings, 'LEDGER_AI_WARMUP', True):
+        return False
+    with _lock:
+        if _started_pid == os.getpid():
+            return False
+        _started_pid = os.getpid()
+        _threads.clear()
+        for name in MODELS:
+            _state[name] = {'state': LOADING, 'load_ms': None}
+            thread = threading.Thread(target=_warm, args=(name,), name=f'warmup-{name}', daemon=True)
+            _threads.append(thread)
+    for thread in _threads:
+        thread.start()
+    return True
+
+
+def preload():
+    """
+    Load every model in this (pre-fork) process, without running inference.
+
+    Inference would start torch's intra-op thread pool, which doesn't survive
+    a fork; workers run their dummy inference from start() instead.  The heap
+    is then frozen so the workers' garbage collector doesn't write to (and so
+    privately copy) the pages holding the model objects.
+    """
+    loaded = []
+    for name, (load, _) in MODELS.items():
+        started = time.perf_counter()
+        try:
+            model = load()
+        except Exception:
+            logger.exception("Preload of %s failed", name)
+            model = None
+        if model is not None:
+            loaded.append(name)
+        logger.info("Preload of %s took %.0f ms", name, (time.perf_counter() - started) * 1000)
+    gc.freeze()
+    return loaded
+
+
+def _warm(name):
+    load, exercise = MODELS[name]
+    started = time.perf_counter()
+    try:
+        model = load()
+        if model is not None:
+            exercise(model)
+    except Exception:
+        logger.exception("Warm-up of %s failed", name)
+        model = None
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    with _lock:
+        _state[name] = {'state': READY if model is not None else UNAVAILABLE, 'load_ms': elapsed_ms}
+    logger.info("Warm-up of %s finished in %.0f ms (%s)", name, elapsed_ms, _state[name]['state'])
+
+
+def wait(timeout=None):
+    """Block until the warm-up threads finish; True if they all did."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for thread in list(_threads):
+        thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+    return not any(thread.is_alive() for thread in _threads)
+
+
+def status():
+    """
+    ``{'ready': bool, 'models': {name: {'state', 'load_ms'}}}``.  Ready means
+    nothing is still loading; an unavailable model is served by the keyword
+    fallback, so it doesn't hold readiness back.
+    """
+    with _lock:
+        models = {name: dict(entry) for name, entry in _state.items()}
+    return {
+        'ready': all(entry['state'] != LOADING for entry in models.values()),
+        'models': models,
+    }
+
+
+def reset():
+    """Forget warm-up state so start() can run again in this process (tests)."""
+    global _started_pid
+    wait()
+    with _lock:
+        _started_pid = None
+        _threads.clear()
+        for name in MODELS:
+            _state[name] = {'state': COLD, 'load_ms': None}
@@ -1,3 +1,5 @@
+import uuid
+
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
@@ -33,10 +35,64 @@ class Transaction(models.Model):
     
     class Meta:
         ordering = ["-date", "-id"]
+        indexes = [
+            # Matches Meta.ordering so per-user lists and keyset pages are index range scans
+            models.Index(fields=["owner", "-date", "-id"], name="core_txn_owner_date_id_idx"),
+        ]
         
     def __str__(self):
         return f"{self.title} - ${self.amount}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        from .rollups import state_of
+        instance = super().from_db(db, field_names, values)
+        # Remember what this row contributes so save()/delete() can adjust rollups
+        instance._rollup_state = state_of(instance)
+        return instance
+
+    def save(self, *args, **kwargs):
+        from django.db import transaction as db_transaction
+        from .rollups import record_change, state_from_db, state_of
+
+        before = None
+        if not self._state.adding:
+            before = getattr(self, '_rollup_state', None) or state_from_db(self.pk)
+
+        with db_transaction.atomic():
+            super().save(*args, **kwargs)
+            after = state_of(self) or state_from_db(self.pk)
+            record_change(before, after)
+        self._rollup_state = after
+
+    def delete(self, *args, **kwargs):
+        from django.db import transaction as db_transaction
+        from .rollups import record_change, state_from_db
+
+        before = getattr(self, '_rollup_state', None) or state_from_db(self.pk)
+        with db_transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            record_change(before, None)
+        self._rollup_state = None
+        return result
+
+
+class MonthlyCategoryRollup(models.Model):
+    """Per-user spend per month and category, kept in step with Transaction writes (see core.rollups)."""
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="monthly_rollups")
+    month = models.DateField(help_text="First day of the month")
+    category = models.CharField(max_length=100, blank=True, default="")
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["month", "category"]
+        unique_together = ["owner", "month", "category"]
+
+    def __str__(self):
+        return f"{self.category or 'Uncategorized'} {self.month.strftime('%b %Y')}: ${self.total} ({self.count})"
+
 
 class IncomeSource(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="income_sources")
@@ -52,6 +108,18 @@ class IncomeSource(models.Model):
     def __str__(self):
         return f"{self.name} - {self.monthly_amount}/mo"
 
+    def save(self, *args, **kwargs):
+        from .forecasting.cache import bump_data_version
+        super().save(*args, **kwargs)
+        # Income feeds the forecast's predicted savings
+        bump_data_version(self.owner_id)
+
+    def delete(self, *args, **kwargs):
+        from .forecasting.cache import bump_data_version
+        result = super().delete(*args, **kwargs)
+        bump_data_version(self.owner_id)
+        return result
+
 
 class AssistantConversation(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="assistant_conversations")
@@ -109,6 +177,43 @@ class Budget(models.Model):
     def __str__(self):
         return f"{self.category} - ${self.limit_amount} ({self.month.strftime('%b %Y')})"
 
+    @staticmethod
+    def attach_spent(budgets):
+        """
+        Set ``spent`` (float) on each budget from one grouped aggregate over
+        the owners' transactions, matched by month and case-insensitive
+        category.  Income never counts towards a budget.
+        """
+        from django.db.models import Sum
+        from django.db.models.functions import Lower, TruncMonth
+
+        budgets = list(budgets)
+        if not budgets:
+            return budgets
+
+        months = {b.month.replace(day=1) for b in budgets}
+        totals = (
+            Transaction.objects.filter(
+                owner_id__in={b.owner_id for b in budgets},
+                date__gte=min(months),
+                date__lt=max(months) + relativedelta(months=1),
+            )
+            .annotate(category_key=Lower('category'), month_key=TruncMonth('date'))
+            .filter(category_key__in={b.category.lower() for b in budgets})
+            .exclude(category_key='income')
+            .values('owner_id', 'month_key', 'category_key')
+            .annotate(total=Sum('amount'))
+        )
+        spent = {
+            (row['owner_id'], row['month_key'], row['category_key']): row['total']
+            for row in totals
+        }
+
+        for budget in budgets:
+            total = spent.get((budget.owner_id, budget.month.replace(day=1), budget.category.lower()))
+            budget.spent = float(total) if total else 0.0
+        return budgets
+
 
 class Reminder(models.Model):
     """Bill payment reminders with email notifications"""
@@ -232,7 +337,7 @@ class GroupPayment(models.Model):
 
 
 class RecurringTransaction(models.Model):
-    """A rule that automatically materializes Transaction rows on access."""
+    """A rule that materializes Transaction rows when its occurrences fall due."""
 
     FREQ_DAILY = "daily"
     FREQ_WEEKLY = "weekly"
@@ -284,46 +389,120 @@ class RecurringTransaction(models.Model):
         }
         return dt + deltas[self.frequency]
 
-    # ── Lazy materialisation ──────────────────────────────────────────
+    # ── Batch materialisation ─────────────────────────────────────────
+
+    def _due_occurrences(self, today):
+        """
+        Walk the schedule up to *today*, returning the due dates and leaving
+        next_due_date / is_active advanced exactly as materialisation should.
+        """
+        due = []
+        while self.next_due_date <= today:
+            # Respect optional end-date
+            if self.end_date and self.next_due_date > self.end_date:
+                self.is_active = False
+                break
+            due.append(self.next_due_date)
+            self.next_due_date = self._advance_date(self.next_due_date)
+        return due
 
     @staticmethod
-    def materialize_due(user):
+    def materialize_due(user=None, today=None, chunk_size=500, batch_size=1000):
         """
-        Create Transaction rows for every recurring rule whose next_due_date
-        is in the past (or today).  Safe to call on every request — it only
-        writes when something is actually due.
+        Create Transaction rows for every active rule whose next_due_date is
+        in the past (or today).  Pass *user* to limit the run to one owner;
+        the ``materialize_recurring`` management command runs it for everyone.
+
+        Rules are processed *chunk_size* at a time, each chunk in its own
+        transaction: the chunk's rules are locked (skipping rows another run
+        already holds), all missed occurrences go out in one ``bulk_create``
+        and the rules are advanced with one ``bulk_update``.  A daily rule
+        paused for a year therefore catches up in a single insert.
         """
         from datetime import date
+        from django.db import transaction as db_transaction
+        from .rollups import record_created
 
-        today = date.today()
+        today = today or date.today()
 
-        rules = RecurringTransaction.objects.filter(
-            owner=user,
+        due_rules = RecurringTransaction.objects.filter(
             is_active=True,
             next_due_date__lte=today,
-        ).select_for_update()
+        )
+        if user is not None:
+            due_rules = due_rules.filter(owner=user)
+        rule_ids = list(due_rules.order_by('id').values_list('id', flat=True))
 
         created = []
 
-        for rule in rules:
-            while rule.next_due_date <= today:
-                # Respect optional end-date
-                if rule.end_date and rule.next_due_date > rule.end_date:
-                    rule.is_active = False
-                    break
-
-                txn = Transaction.objects.create(
-                    owner=user,
-                    title=rule.title,
-                    amount=rule.amount,
-                    date=rule.next_due_date,
-                    category=rule.category,
-                    notes=f"Auto-generated from recurring: {rule.title}",
+        for start in range(0, len(rule_ids), chunk_size):
+            chunk_ids = rule_ids[start:start + chunk_size]
+            with db_transaction.atomic():
+                rules = list(
+                    RecurringTransaction.objects.filter(
+                        id__in=chunk_ids,
+                        is_active=True,
+                        next_due_date__lte=today,
+                    ).select_for_update(skip_locked=True)
+                )
+                if not rules:
+                    continue
+
+                pending = []
+                now = timezone.now()
+                for rule in rules:
+                    for due_date in rule._due_occurrences(today):
+                        pending.append(Transaction(
+                            owner_id=rule.owner_id,
+                            title=rule.title,
+                            amount=rule.amount,
+                            date=due_date,
+                            category=rule.category,
+                            notes=f"Auto-generated from recurring: {rule.title}",
+                        ))
+                    rule.updated_at = now
+
+                inserted = Transaction.objects.bulk_create(pending, batch_size=batch_size)
+                record_created(inserted)
+                created.extend(inserted)
+                RecurringTransaction.objects.bulk_update(
+                    rules, ['next_due_date', 'is_active', 'updated_at']
                 )
-                created.append(txn)
 
-                rule.next_due_date = rule._advance_date(rule.next_due_date)
+        return created
 
-            rule.save()
 
-        return created
+class ReceiptOCRJob(models.Model):
+    """A receipt image queued for OCR; the result is filled in by core.ocr_jobs."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="receipt_ocr_jobs")
+    image = models.ImageField(upload_to="receipts/ocr-jobs/")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"OCR job {self.id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
@@ -0,0 +1,233 @@
+"""
+Content-hash cache for receipt OCR.
+
+Retries, double taps and re-scans upload byte-identical images, so entries
+are keyed by the SHA-256 of the image bytes and hold both the raw Tesseract
+text and the parsed receipt.  Lookups happen in the web process before any
+pool slot is taken, so a hit costs a hash and a dict/file read.
+
+Backends (``LEDGER_AI_OCR_CACHE``):
+
+- ``memory``: per-process LRU with TTL (default).
+- ``disk``: JSON files under ``MEDIA_ROOT/ocr-cache/``, shared by every
+  process on the host (and Celery workers on the same volume).
+- ``off``: no caching.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+from django.conf import settings
+
+from . import ocr
+
+logger = logging.getLogger(__name__)
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class MemoryBackend:
+    def __init__(self, max_entries=1000, ttl=86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            stored_at, entry = item
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = (time.time(), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskBackend:
+    """One JSON file per digest; mtime is both the TTL clock and the LRU order."""
+
+    def __init__(self, root, max_entries=10000, ttl=86400):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes = 0
+
+    def _path(self, key):
+        return self.root / key[:2] / f'{key}.json'
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            age = time.time() - path.stat().st_mtime
+            if self.ttl and age > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            entry = json.loads(path.read_text(encoding='utf-8'))
+            os.utime(path)  # mark as recently used
+            return entry
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def set(self, key, entry):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp.write_text(json.dumps(entry), encoding='utf-8')
+        os.replace(tmp, path)  # atomic, so readers never see a partial file
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def prune(self):
+        """Drop expired files, then the least recently used beyond max_entries."""
+        files = []
+        now = time.time()
+        for path in self.root.glob('*/*.json'):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if self.ttl and now - mtime > self.ttl:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((mtime, path))
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.root.glob('*/*.json'):
+            path.unlink(missing_ok=True)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The configured backend, or None when caching is off."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                kind = getattr(settings, 'LEDGER_AI_OCR_CACHE', 'memory')
+                ttl = getattr(settings, 'LEDGER_AI_OCR_CACHE_TTL', 86400)
+                max_entries = getattr(settings, 'LEDGER_AI_OCR_CACHE_MAX_ENTRIES', 1000)
+                if kind == 'disk':
+                    _backend = DiskBackend(Path(settings.MEDIA_ROOT) / 'ocr-cache', max_entries, ttl)
+                elif kind == 'memory':
+                    _backend = MemoryBackend(max_entries, ttl)
+                else:
+                    _backend = False
+    return _backend or None
+
+
+def reset_backend():
+    """Drop the backend so the next lookup rereads settings (tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+
+def lookup(data):
+    """Return ``(key, entry)``; entry is None on a miss or when caching is off."""
+    key = digest(data)
+    backend = get_backend()
+    return key, (backend.get(key) if backend else None)
+
+
+def store(key, entry):
+    backend = get_backend()
+    if not backend:
+        return
+    try:
+        backend.set(key, entry)
+    except OSError:
+        # A full or read-only disk shouldn't fail the OCR request itself
+        logger.exception("Could not write OCR cache entry %s", key)
+
+
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def submit(pool, user_id, data):
+    """
+    Future of the receipt response for ``data``: served from the cache when
+    possible, otherwise OCR'd on ``pool`` (which may raise OCRBusy) and stored.
+    """
+    key, entry = lookup(data)
+    if entry is not None:
+        return _resolved(ocr.receipt_response(entry, cache_hit=True))
+
+    outer = Future()
+
+    def done(f):
+        exc = f.exception()
+        if exc is not None:
+            outer.set_exception(exc)
+            return
+        store(key, f.result())
+        outer.set_result(ocr.receipt_response(f.result(), cache_hit=False))
+
+    pool.submit(user_id, ocr.analyze_receipt, data).add_done_callback(done)
+    return outer
+
+
+def submit_many(pool, user_id, items, timeout=None):
+    """
+    Cache-aware ``pool.map``: hits are answered without taking a pool slot and
+    duplicate images within the batch are OCR'd once.  The pool only runs
+    Tesseract; the texts are then parsed here in one batch (spaCy
+    ``nlp.pipe``, batched FinBERT).  Returns one response dict or exception
+    per item, in order.
+    """
+    results = [None] * len(items)
+    misses = {}
+    for index, data in enumerate(items):
+        key, entry = lookup(data)
+        if entry is not None:
+            results[index] = ocr.receipt_response(entry, cache_hit=True)
+        else:
+            misses.setdefault(key, (data, []))[1].append(index)
+
+    if misses:
+        keys = list(misses)
+        outcomes = pool.map(user_id, ocr.extract_text, [misses[k][0] for k in keys], timeout=timeout)
+        texts = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+        analyses = iter(ocr.analyze_texts(texts))
+        outcomes = [outcome if isinstance(outcome, BaseException) else next(analyses) for outcome in outcomes]
+        for key, outcome in zip(keys, outcomes):
+            if not isinstance(outcome, BaseException):
+                store(key, outcome)
+            for position, index in enumerate(misses[key][1]):
+                if isinstance(outcome, BaseException):
+                    results[index] = outcome
+                else:
+                    # Later copies of the same image in this batch count as hits
+                    results[index] = ocr.receipt_response(outcome, cache_hit=position > 0)
+    return results
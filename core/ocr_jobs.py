@@ -0,0 +1,137 @@
+"""
+Receipt OCR jobs: the upload is stored, the request returns a job id, and OCR
+runs outside the web worker.
+
+Backends (``LEDGER_AI_OCR_BACKEND``):
+
+- ``celery``: ``core.tasks.run_receipt_ocr_job`` on a Celery worker.
+- ``process``: the bounded OCR pool (core.ocr_pool) inside the web process;
+  the result is written back from the pool's callback thread.
+- ``inline``: the same pool running work in the calling thread (tests).
+
+Jobs are dispatched on commit, so a worker never sees an uncommitted row.
+Outside Celery, the pool is checked before the job is created, so a full
+pool rejects the upload (OCRBusy) instead of queueing it unboundedly.  The
+slot itself is taken at dispatch: a transaction that rolls back never
+dispatches, so it can't leave a slot reserved.  A job that loses the race
+for the last slot, or can't be handed to the pool, is marked failed.
+Images already in the OCR cache (core.ocr_cache) finish immediately.
+"""
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from . import ocr, ocr_cache
+from .models import ReceiptOCRJob
+from .ocr_pool import OCRBusy, get_pool
+
+logger = logging.getLogger(__name__)
+
+
+def _backend():
+    return getattr(settings, 'LEDGER_AI_OCR_BACKEND', 'process')
+
+
+def submit(user, upload):
+    """
+    Store the uploaded image and queue it for OCR. Returns the job, already
+    done when the image is in the OCR cache. Raises ocr_pool.OCRBusy when the
+    local pool has no room.
+    """
+    data = upload.read()
+    name = os.path.basename(upload.name) or 'receipt.jpg'
+    job = ReceiptOCRJob(owner=user)
+
+    key, cached = ocr_cache.lookup(data)
+    if cached is not None:
+        job.image.save(name, ContentFile(data), save=False)
+        job.status = ReceiptOCRJob.STATUS_DONE
+        job.result = ocr.receipt_response(cached, cache_hit=True)
+        job.started_at = job.finished_at = timezone.now()
+        job.save()
+        return job
+
+    if _backend() != 'celery':
+        get_pool().admit(user.id).release()  # raises OCRBusy while the pool is full
+    job.image.save(name, ContentFile(data), save=False)
+    job.save()
+    transaction.on_commit(lambda: _dispatch(job.pk, user.id, key, data))
+    return job
+
+
+def _dispatch(job_id, user_id, key, data):
+    if _backend() == 'celery':
+        from .tasks import run_receipt_ocr_job
+        run_receipt_ocr_job.delay(str(job_id))
+        return
+    try:
+        admission = get_pool().admit(user_id)
+    except OCRBusy as e:
+        _finish(job_id, error=str(e))
+        return
+    try:
+        _mark_running(job_id)
+        future = admission.submit(ocr.analyze_receipt, data)
+    except Exception as e:
+        # e.g. a broken process pool; don't leave the job "running" or the slot held
+        admission.release()
+        logger.exception("Receipt OCR job %s could not be dispatched", job_id)
+        _finish(job_id, error=ocr.describe_error(e))
+        return
+    future.add_done_callback(lambda f: _finish_from_future(job_id, key, f))
+
+
+def run(job_id, data=None):
+    """Run a job in this process (the Celery task body)."""
+    _mark_running(job_id)
+    try:
+        if data is None:
+            job = ReceiptOCRJob.objects.get(pk=job_id)
+            with job.image.open('rb') as fh:
+                data = fh.read()
+        key, analysis = ocr_cache.lookup(data)
+        if analysis is None:
+            analysis = ocr.analyze_receipt(data)
+            ocr_cache.store(key, analysis)
+            result = ocr.receipt_response(analysis)
+        else:
+            result = ocr.receipt_response(analysis, cache_hit=True)
+    except Exception as e:
+        logger.exception("Receipt OCR job %s failed", job_id)
+        _finish(job_id, error=ocr.describe_error(e))
+    else:
+        _finish(job_id, result=result)
+
+
+def _mark_running(job_id):
+    ReceiptOCRJob.objects.filter(pk=job_id, status=ReceiptOCRJob.STATUS_PENDING).update(
+        status=ReceiptOCRJob.STATUS_RUNNING, started_at=timezone.now(),
+    )
+
+
+def _finish_from_future(job_id, key, future):
+    # Usually runs on the pool's management thread, which keeps its own DB connection
+    try:
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Receipt OCR job %s failed: %s", job_id, exc)
+            _finish(job_id, error=ocr.describe_error(exc))
+        else:
+            ocr_cache.store(key, future.result())
+            _finish(job_id, result=ocr.receipt_response(future.result()))
+    finally:
+        if not connection.in_atomic_block:
+            close_old_connections()
+
+
+def _finish(job_id, result=None, error=''):
+    ReceiptOCRJob.objects.filter(pk=job_id).update(
+        status=ReceiptOCRJob.STATUS_FAILED if error else ReceiptOCRJob.STATUS_DONE,
+        result=result,
+        error=error,
+        finished_at=timezone.now(),
+    )
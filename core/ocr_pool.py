@@ -0,0 +1,300 @@
+"""
+Bounded OCR execution layer.
+
+Tesseract is CPU-bound, so OCR runs in a process pool instead of in request
+threads.  Every web worker has its own pool, so by default the cores are
+split between them (``WEB_CONCURRENCY``, gunicorn's worker count).  Children
+start from a forkserver (spawn where that's unavailable), never by forking
+a web worker that already runs threads and holds model locks.  Admission is bounded: at most ``max_pending``
+jobs may be running or queued per web process, and at most ``per_user``
+for any single user.  When either limit is hit, ``admit()`` raises
+``OCRBusy`` right away, so the caller can answer 503 or 429 with Retry-After
+instead of piling more work onto a saturated box.  A worker that dies
+(e.g. killed for memory on a huge image) breaks the process pool; it is
+then shut down and a fresh one started on the next submit.
+
+``stats()`` reports queue depth, rejections and OCR wall time.
+"""
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+
+class OCRBusy(Exception):
+    """OCR capacity is exhausted; retry after ``retry_after`` seconds."""
+    QUEUE_FULL = 'queue_full'
+    USER_LIMIT = 'user_limit'
+
+    def __init__(self, reason, retry_after):
+        self.reason = reason
+        self.retry_after = retry_after
+        # 429 when this user is over their share, 503 when the server is
+        self.status_code = 429 if reason == self.USER_LIMIT else 503
+        super().__init__(
+            'Too many receipts processing for this account' if reason == self.USER_LIMIT
+            else 'OCR is busy, please retry shortly'
+        )
+
+
+def _timed_call(fn, args):
+    # Runs in the worker process; measures OCR time without the queue wait
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def _init_worker():
+    # Spawned/forkserver children start without Django configured
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+class _InlineExecutor:
+    """Runs work in the caller's thread (LEDGER_AI_OCR_BACKEND='inline')."""
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class Admission:
+    """A reserved slot. Submit exactly once, or release() if the work is dropped."""
+    def __init__(self, pool, user_id):
+        self._pool = pool
+        self._user_id = user_id
+        self._open = True
+
+    def submit(self, fn, *args):
+        if not self._open:
+            raise RuntimeError('Admission already used')
+        self._open = False
+        return self._pool._start(self._user_id, fn, args)
+
+    def release(self):
+        if self._open:
+            self._open = False
+            self._pool._release(self._user_id)
+
+
+def default_workers():
+    """This web worker's share of the cores."""
+    web_workers = max(1, int(os.getenv('WEB_CONCURRENCY', '1') or 1))
+    return max(1, (os.cpu_count() or 1) // web_workers)
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class OCRPool:
+    def __init__(self, workers=None, max_pending=None, per_user=2, executor=None, samples=500):
+        self.workers = workers or default_workers()
+        self.max_pending = max_pending or self.workers * 4
+        self.per_user = per_user
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._per_user = {}
+        self._wall_times = deque(maxlen=samples)
+        self._counters = {'completed': 0, 'failed': 0, 'rejected_queue_full': 0, 'rejected_user_limit': 0}
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=_mp_context(), initializer=_init_worker,
+                )
+            return self._executor
+
+    def _discard(self, executor):
+        """Drop a broken executor; the next submit starts a new one."""
+        with self._lock:
+            if self._executor is not executor:
+                return  # already replaced
+            self._executor = None
+        executor.shutdown(wait=False)
+
+    def _retry_after(self):
+        # Time to drain the backlog ahead of a new job at the recent average pace
+        avg = (sum(self._wall_times) / len(self._wall_times)) if self._wall_times else 2.0
+        return max(1, math.ceil(avg * self._pending / self.workers))
+
+    def admit(self, user_id):
+        """Reserve a slot for ``user_id`` or raise OCRBusy."""
+        with self._lock:
+            if self._per_user.get(user_id, 0) >= self.per_user:
+                self._counters['rejected_user_limit'] += 1
+                raise OCRBusy(OCRBusy.USER_LIMIT, self._retry_after())
+            if self._pending >= self.max_pending:
+                self._counters['rejected_queue_full'] += 1
+                raise OCRBusy(OCRBusy.QUEUE_FULL, self._retry_after())
+            self._pending += 1
+            self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        return Admission(self, user_id)
+
+    def submit(self, user_id, fn, *args):
+        """admit() and submit in one step. Returns a Future of ``fn(*args)``."""
+        return self.admit(user_id).submit(fn, *args)
+
+    def map(self, user_id, fn, items, timeout=None):
+        """
+        Run ``fn(item)`` for every item, keeping as many in flight as this
+        user's cap and the queue allow.  Returns one result or exception per
+        item, in order.  Raises OCRBusy only if not a single item could start.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = [None] * len(items)
+        in_flight = {}
+        next_index = 0
+        started_any = False
+
+        while next_index < len(items) or in_flight:
+            while next_index < len(items):
+                try:
+                    future = self.submit(user_id, fn, items[next_index])
+                except OCRBusy as busy:
+                    if not started_any:
+                        raise
+                    if not in_flight:
+                        # Capacity is taken by other users; wait for some to drain
+                        if deadline is not None and time.monotonic() >= deadline:
+                            for index in range(next_index, len(items)):
+                                results[index] = busy
+                            return results
+                        time.sleep(min(1.0, busy.retry_after))
+                    break
+                started_any = True
+                in_flight[future] = next_index
+                next_index += 1
+
+            if in_flight:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, _ = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    for future, index in in_flight.items():
+                        results[index] = TimeoutError('OCR timed out')
+                    for index in range(next_index, len(items)):
+                        results[index] = TimeoutError('OCR timed out')
+                    return results
+                for future in done:
+                    index = in_flight.pop(future)
+                    exc = future.exception()
+                    results[index] = exc if exc is not None else future.result()
+        return results
+
+    def _start(self, user_id, fn, args):
+        outer = Future()
+        try:
+            executor = self.executor
+            try:
+                inner = executor.submit(_timed_call, fn, args)
+            except BrokenProcessPool:
+                self._discard(executor)
+                executor = self.executor
+                inner = executor.submit(_timed_call, fn, args)
+        except BaseException:
+            self._release(user_id)
+            raise
+        with self._lock:
+            self._running += 1
+
+        def done(f):
+            exc = f.exception()
+            if isinstance(exc, BrokenProcessPool):
+                self._discard(executor)
+            with self._lock:
+                self._running -= 1
+                self._counters['failed' if exc else 'completed'] += 1
+                if exc is None:
+                    self._wall_times.append(f.result()[1])
+            # Free the slot before waking waiters so they can submit right away
+            self._release(user_id)
+            if exc is not None:
+                outer.set_exception(exc)
+            else:
+                outer.set_result(f.result()[0])
+
+        inner.add_done_callback(done)
+        return outer
+
+    def _release(self, user_id):
+        with self._lock:
+            self._pending -= 1
+            remaining = self._per_user.get(user_id, 0) - 1
+            if remaining > 0:
+                self._per_user[user_id] = remaining
+            else:
+                self._per_user.pop(user_id, None)
+
+    def stats(self):
+        with self._lock:
+            times = sorted(self._wall_times)
+            in_flight = self._pending
+            data = {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'per_user_limit': self.per_user,
+                'in_flight': in_flight,
+                'queue_depth': max(0, in_flight - self.workers),
+                'active_users': len(self._per_user),
+                **self._counters,
+            }
+
+        def pct(q):
+            return round(times[min(len(times) - 1, int(len(times) * q))] * 1000, 1)
+
+        data['ocr_wall_time_ms'] = {
+            'samples': len(times),
+            'avg': round(sum(times) / len(times) * 1000, 1) if times else None,
+            'p50': pct(0.5) if times else None,
+            'p95': pct(0.95) if times else None,
+            'max': round(times[-1] * 1000, 1) if times else None,
+        }
+        return data
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The per-process OCR pool, configured from settings on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                inline = getattr(settings, 'LEDGER_AI_OCR_BACKEND', 'process') == 'inline'
+                _pool = OCRPool(
+                    workers=getattr(settings, 'LEDGER_AI_OCR_WORKERS', None),
+                    max_pending=getattr(settings, 'LEDGER_AI_OCR_MAX_PENDING', None),
+                    per_user=getattr(settings, 'LEDGER_AI_OCR_PER_USER', 2),
+                    executor=_InlineExecutor() if inline else None,
+                )
+    return _pool
+
+
+def reset_pool():
+    """Drop the pool so the next get_pool() rereads settings (tests)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool._executor is not None:
+            _pool._executor.shutdown(wait=False)
+        _pool = None
@@ -0,0 +1,248 @@
+"""
+asyncio client for the local Ollama server, for async (ASGI) views.
+
+The counterpart of core.ollama_client.OllamaClient: same settings, and the
+same circuit breaker and slot budget objects, so sync and async callers see
+one view of Ollama's health and together stay within
+``LEDGER_AI_OLLAMA_MAX_CONCURRENCY``.  Waiting for a slot holds no thread.
+A caller that is cancelled (a client hung up) isn't counted against Ollama.  ``chat_json`` shares
+the sync client's retry policy and its Django cache entries.
+
+Requests go through an ``httpx.AsyncClient`` that keeps keep-alive
+connections pooled; there is one per event loop, since its connections
+can't be shared between loops.  Any transport or protocol error surfaces
+as OllamaUnavailable.
+"""
+import asyncio
+import json
+import logging
+import random
+import threading
+import weakref
+
+import httpx
+from django.core.cache import cache as django_cache
+
+from .ollama_client import RETRY_STATUSES, OllamaUnavailable, SlotBudget, _cache_key, _parse_content, get_client
+
+logger = logging.getLogger(__name__)
+
+# ValueError: an NDJSON line that isn't JSON
+STREAM_ERRORS = (httpx.HTTPError, ValueError)
+
+
+class AsyncOllamaClient:
+    def __init__(self, base_url='http://localhost:11434', model='llama3.1:8b', timeout=20.0,
+                 max_concurrency=2, retries=2, breaker=None, backoff=0.25, cache_ttl=0, slots=None):
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_ttl = cache_ttl
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker
+        self.slots = slots or SlotBudget(max_concurrency)
+        self._pools = weakref.WeakKeyDictionary()
+
+    def _http(self):
+        """The running loop's connection pool."""
+        loop = asyncio.get_running_loop()
+        http = self._pools.get(loop)
+        if http is None:
+            # Every network wait is bounded, so a stalled server can't hold a stream forever
+            http = self._pools[loop] = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return http
+
+    async def aclose(self):
+        """Close the running loop's pooled connections."""
+        http = self._pools.pop(asyncio.get_running_loop(), None)
+        if http is not None:
+            await http.aclose()
+
+    async def _acquire(self):
+        if not self.breaker.allow():
+            raise OllamaUnavailable('circuit open')
+        try:
+            acquired = await self.slots.acquire_async(self.timeout)
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
+        if not acquired:
+            self.breaker.record_failure()
+            raise OllamaUnavailable(f'no free slot within {self.timeout}s')
+        return self.slots
+
+    async def stream_chat(self, messages, options=None):
+        """
+        Async iterator over the reply's text as Ollama generates it.
+
+        Raises OllamaUnavailable when the breaker is open, no slot frees up,
+        or the request fails; before the first fragment that means nothing
+        was streamed, so the caller can answer with its fallback.
+        """
+        slots = await self._acquire()
+        answered = False
+        try:
+            http = self._http()
+            try:
+                response = await http.send(
+                    http.build_request('POST', '/api/chat', json={
+                        'model': self.model,
+                        'messages': messages,
+                        'stream': True,
+                        'options': options or {'temperature': 0.1},
+                    }),
+                    stream=True,
+                )
+            except STREAM_ERRORS as e:
+                raise OllamaUnavailable(str(e) or type(e).__name__) from e
+            try:
+                if response.status_code >= 400:
+                    raise OllamaUnavailable(f'HTTP {response.status_code}', status=response.status_code)
+                # Ollama answered; later stream trouble isn't a reason to open the breaker
+                self.breaker.record_success()
+                answered = True
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    event = json.loads(line)
+                    if event.get('error'):
+                        raise OllamaUnavailable(event['error'])
+                    fragment = (event.get('message') or {}).get('content', '')
+                    if fragment:
+                        yield fragment
+                    if event.get('done'):
+                        return
+                raise OllamaUnavailable('stream ended before done')
+            except STREAM_ERRORS as e:
+                raise OllamaUnavailable(str(e) or type(e).__name__) from e
+            finally:
+                await response.aclose()
+        except asyncio.CancelledError:
+            if not answered:
+                self.breaker.record_cancelled()
+            raise
+        except BaseException:
+            # Whatever went wrong before Ollama answered settles a half-open trial
+            if not answered:
+                self.breaker.record_failure()
+            raise
+        finally:
+            slots.release()
+
+    async def chat_json(self, messages, options=None, cache=True):
+        """
+        OllamaClient.chat_json, awaited: the parsed JSON content of the
+        reply, or None.  Cached replies are shared with the sync client.
+        """
+        payload = {
+            'model': self.model,
+            'messages': messages,
+            'stream': False,
+            'format': 'json',
+            'options': options or {'temperature': 0.1},
+        }
+        key = _cache_key(payload) if cache and self.cache_ttl else None
+        if key:
+            cached = await django_cache.aget(key)
+            if cached is not None:
+                return cached
+
+        data = await self.post_json('/api/chat', payload)
+        if not data:
+            return None
+        result = _parse_content((data.get('message') or {}).get('content', '').strip())
+        if key and result is not None:
+            await django_cache.aset(key, result, self.cache_ttl)
+        return result
+
+    async def post_json(self, path, payload):
+        """OllamaClient.post_json, awaited: the decoded JSON body, or None."""
+        try:
+            slots = await self._acquire()
+        except OllamaUnavailable as e:
+            logger.warning(f"[ollama] Request not sent: {e}")
+            return None
+        try:
+            body = await self._post_with_retry(path, payload)
+        except OllamaUnavailable as e:
+            logger.warning(f"[ollama] Request failed: {e}")
+            self.breaker.record_failure()
+            return None
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
+        except BaseException:
+            self.breaker.record_failure()
+            raise
+        finally:
+            slots.release()
+        self.breaker.record_success()
+
+        try:
+            return json.loads(body.decode('utf-8', errors='replace'))
+        except json.JSONDecodeError:
+            logger.warning("[ollama] Non-JSON response from server")
+            return None
+
+    async def _post_with_retry(self, path, payload):
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._post(path, payload)
+            except httpx.TimeoutException as e:
+                raise OllamaUnavailable(f'timed out after {self.timeout}s') from e
+            except OllamaUnavailable as e:
+                retryable = e.status in RETRY_STATUSES
+                error = e
+            except httpx.HTTPError as e:
+                # Refused, reset, or a keep-alive connection the server already closed
+                retryable = True
+                error = OllamaUnavailable(str(e) or type(e).__name__)
+            if not retryable or attempt == self.retries:
+                raise error
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    async def _post(self, path, payload):
+        response = await self._http().post(path, json=payload)
+        if response.status_code >= 400:
+            raise OllamaUnavailable(f'HTTP {response.status_code}', status=response.status_code)
+        return response.content
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_async_client():
+    """The process-wide async client; shares settings and breaker with get_client()."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                sync_client = get_client()
+                _client = AsyncOllamaClient(
+                    base_url=sync_client.base_url,
+                    model=sync_client.model,
+                    timeout=sync_client.timeout,
+                    max_concurrency=sync_client.max_concurrency,
+                    retries=sync_client.retries,
+                    breaker=sync_client.breaker,
+                    backoff=sync_client.backoff,
+                    cache_ttl=sync_client.cache_ttl,
+                    slots=sync_client.slots,
+                )
+    return _client
+
+
+def reset_async_client():
+    """Drop the shared async client (tests; reset_client() calls this too)."""
+    global _client
+    with _client_lock:
+        _client = None
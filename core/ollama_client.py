@@ -0,0 +1,395 @@
+"""
+Shared client for the local Ollama server.
+
+One client per process keeps a small pool of keep-alive HTTP connections and
+a slot budget sized to the server's parallelism (``OLLAMA_NUM_PARALLEL``), so
+web threads queue here for a bounded time instead of piling requests onto
+the model server.  The async client (core.ollama_async) draws on the same
+budget, so sync and async views together stay within the cap.  Connection errors and 502/503s are retried with jittered
+backoff; a timeout is not, since a slow model will be slow again.
+
+A circuit breaker counts consecutive failures (including timeouts and a
+full semaphore).  Once open, calls return None immediately and callers use
+their rule-based fallback; after ``LEDGER_AI_OLLAMA_BREAKER_RESET`` seconds
+one trial request is let through, and its outcome closes or reopens it.
+
+``chat_json`` replies are cached in the Django cache (shared across workers
+with Redis; size-bounded by the backend's eviction) for
+``LEDGER_AI_OLLAMA_CACHE_TTL`` seconds, keyed by model, messages and options.
+
+Settings: ``LEDGER_AI_OLLAMA_URL``, ``_MODEL``, ``_TIMEOUT``,
+``_MAX_CONCURRENCY``, ``_RETRIES``, ``_BREAKER_FAILURES``, ``_BREAKER_RESET``,
+``_CACHE_TTL``.
+"""
+import asyncio
+import hashlib
+import http.client
+import json
+import logging
+import queue
+import random
+import socket
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache as django_cache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (502, 503)
+
+
+class OllamaUnavailable(Exception):
+    """The request didn't produce a response (network, timeout, HTTP error)."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """True if a call may go ahead; while half-open, only one trial at a time."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_cancelled(self):
+        """The caller gave up (e.g. a client disconnected): no verdict on Ollama."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("[ollama] Circuit open after %d failure(s)", self._failures)
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class _Waiter:
+    __slots__ = ('notify', 'granted')
+
+    def __init__(self, notify):
+        self.notify = notify
+        self.granted = False
+
+
+class SlotBudget:
+    """
+    A counting semaphore that both threads and coroutines can wait on
+    without one blocking the other; free slots go to waiters in FIFO order.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._free = size
+        self._waiters = deque()
+
+    def _try_take(self):
+        # Called with the lock held
+        if self._free and not self._waiters:
+            self._free -= 1
+            return True
+        return False
+
+    def _abandon(self, waiter):
+        """Stop waiting; True if a slot was handed over meanwhile (it is given back)."""
+        with self._lock:
+            if not waiter.granted:
+                self._waiters.remove(waiter)
+                return False
+        self.release()
+        return True
+
+    def acquire(self, timeout=None):
+        """Take a slot, waiting up to ``timeout`` seconds; False if none came free."""
+        with self._lock:
+            if self._try_take():
+                return True
+            event = threading.Event()
+            waiter = _Waiter(lambda: event.set() or True)
+            self._waiters.append(waiter)
+        event.wait(timeout)
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    async def acquire_async(self, timeout=None):
+        """acquire() for coroutines: waits without holding a thread."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_take():
+                return True
+            granted = loop.create_future()
+
+            def notify():
+                try:
+                    loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(True))
+                except RuntimeError:  # the waiter's loop is closed
+                    return False
+                return True
+
+            waiter = _Waiter(notify)
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(granted, timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            return False
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return True
+
+    def release(self):
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    self._free += 1
+                    return
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+            if waiter.notify():
+                return
+            # Nobody left to take it; hand the slot to the next waiter
+
+
+class OllamaClient:
+    def __init__(self, base_url='http://localhost:11434', model='llama3.1:8b', timeout=20.0,
+                 max_concurrency=2, retries=2, breaker=None, backoff=0.25, cache_ttl=0):
+        parts = urlsplit(base_url.rstrip('/'))
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_ttl = cache_ttl
+        self.max_concurrency = max_concurrency
+        self.breaker = breaker or CircuitBreaker()
+        self._https = parts.scheme == 'https'
+        self._host = parts.hostname or 'localhost'
+        self._port = parts.port
+        self._prefix = parts.path
+        self.slots = SlotBudget(max_concurrency)
+        # Idle connections; at most max_concurrency are ever checked out
+        self._idle = queue.LifoQueue()
+
+    # -- connections -------------------------------------------------------
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=self.timeout)
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _post(self, path, payload):
+        body = json.dumps(payload).encode('utf-8')
+        conn = self._checkout()
+        try:
+            conn.request('POST', self._prefix + path, body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            data = response.read()
+        except BaseException:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._idle.put(conn)
+        if response.status >= 400:
+            raise OllamaUnavailable(f'HTTP {response.status}', status=response.status)
+        return data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # -- requests ----------------------------------------------------------
+
+    def post_json(self, path, payload):
+        """
+        POST ``payload`` and return the decoded JSON body, or None when the
+        breaker is open, no slot frees up within the timeout, or the request
+        fails after retries.
+        """
+        if not self.breaker.allow():
+            return None
+        if not self.slots.acquire(timeout=self.timeout):
+            logger.warning("[ollama] No free slot within %.0fs", self.timeout)
+            self.breaker.record_failure()
+            return None
+        try:
+            body = self._post_with_retry(path, payload)
+        except OllamaUnavailable as e:
+            logger.warning(f"[ollama] Request failed: {e}")
+            self.breaker.record_failure()
+            return None
+        except BaseException:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self.slots.release()
+        self.breaker.record_success()
+
+        try:
+            return json.loads(body.decode('utf-8', errors='replace'))
+        except json.JSONDecodeError:
+            logger.warning("[ollama] Non-JSON response from server")
+            return None
+
+    def _post_with_retry(self, path, payload):
+        for attempt in range(self.retries + 1):
+            try:
+                return self._post(path, payload)
+            except socket.timeout as e:
+                raise OllamaUnavailable(f'timed out after {self.timeout}s') from e
+            except OllamaUnavailable as e:
+                retryable = e.status in RETRY_STATUSES
+                error = e
+            except (OSError, http.client.HTTPException) as e:
+                # Refused, reset, or a keep-alive connection the server already closed
+                retryable = True
+                error = OllamaUnavailable(str(e) or type(e).__name__)
+            if not retryable or attempt == self.retries:
+                raise error
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def chat_json(self, messages, options=None, cache=True):
+        """
+        Chat with ``format=json`` and return the parsed JSON content of the
+        reply, or None (no reply, or content that isn't JSON).
+
+        Replies are cached for ``cache_ttl`` seconds under a hash of the
+        model, messages and options; pass ``cache=False`` where the same
+        prompt should get a fresh answer.
+        """
+        payload = {
+            'model': self.model,
+            'messages': messages,
+            'stream': False,
+            'format': 'json',
+            'options': options or {'temperature': 0.1},
+        }
+        key = _cache_key(payload) if cache and self.cache_ttl else None
+        if key:
+            cached = django_cache.get(key)
+            if cached is not None:
+                return cached
+
+        data = self.post_json('/api/chat', payload)
+        if not data:
+            return None
+        result = _parse_content((data.get('message') or {}).get('content', '').strip())
+        if key and result is not None:
+            django_cache.set(key, result, self.cache_ttl)
+        return result
+
+
+def _cache_key(payload):
+    # Same model, messages and options -> same reply (temperature is near 0)
+    blob = json.dumps([payload['model'], payload['messages'], payload['options']], sort_keys=True, ensure_ascii=False)
+    return 'ollama:chat:' + hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def _parse_content(content):
+    if not content:
+        return None
+
+    # With format=json, content should be valid JSON, but keep a fallback.
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        start = content.find('{')
+        end = content.rfind('}')
+        if start != -1 and end != -1 and end > start:
+            try:
+                return json.loads(content[start:end + 1])
+            except json.JSONDecodeError:
+                return None
+        return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, configured from settings on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OllamaClient(
+                    base_url=getattr(settings, 'LEDGER_AI_OLLAMA_URL', 'http://localhost:11434'),
+                    model=getattr(settings, 'LEDGER_AI_OLLAMA_MODEL', 'llama3.1:8b'),
+                    timeout=getattr(settings, 'LEDGER_AI_OLLAMA_TIMEOUT', 20.0),
+                    max_concurrency=getattr(settings, 'LEDGER_AI_OLLAMA_MAX_CONCURRENCY', 2),
+                    retries=getattr(settings, 'LEDGER_AI_OLLAMA_RETRIES', 2),
+                    cache_ttl=getattr(settings, 'LEDGER_AI_OLLAMA_CACHE_TTL', 0),
+                    breaker=CircuitBreaker(
+                        failure_threshold=getattr(settings, 'LEDGER_AI_OLLAMA_BREAKER_FAILURES', 5),
+                        reset_timeout=getattr(settings, 'LEDGER_AI_OLLAMA_BREAKER_RESET', 30.0),
+                    ),
+                )
+    return _client
+
+
+def reset_client():
+    """Close and drop the shared client so the next use rereads settings (tests)."""
+    global _client
+    from .ollama_async import reset_async_client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+    reset_async_client()
@@ -0,0 +1,97 @@
+"""
+Pagination classes for list endpoints.
+"""
+import base64
+from datetime import date
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TransactionKeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over ``(date, id)`` descending.
+
+    The cursor holds the last row's date and id, so each page is a bounded
+    range scan on the ``(owner, -date, -id)`` index no matter how deep the
+    client pages — unlike OFFSET, whose cost grows with the page number.
+
+    Opt-in: requests without ``cursor`` or ``page_size`` keep getting the
+    full list as a plain array, which the current frontend relies on.
+    """
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            last_date, last_id = position
+            # date <= last_date bounds the index range; the OR breaks ties on id.
+            queryset = queryset.filter(date__lte=last_date).filter(
+                Q(date__lt=last_date) | Q(id__lt=last_id)
+            )
+
+        rows = list(queryset.order_by('-date', '-id')[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            date_part, id_part = raw.split(':', 1)
+            return date.fromisoformat(date_part), int(id_part)
+        except (ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row):
+        raw = f'{row.date.isoformat()}:{row.id}'
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,510 @@
+"""
+Precompiled regex engine for receipt and voice field extraction.
+
+Every pattern is compiled once at import.  Patterns that can never match
+overlapping spans (labelled totals, labelled dates, date + time stamps,
+Nepali month names, keyword categories) are merged into one alternation with
+named groups, so a single ``finditer`` pass yields every candidate together
+with the group that says which original pattern, and therefore which
+priority, produced it.  Results are identical to trying the patterns one by
+one in priority order.
+
+Patterns that do overlap (unlabelled dates, bare currency amounts, voice
+amounts) keep their own compiled regex and are still tried in priority
+order, since the first match of a lower-priority pattern may sit inside a
+match of a higher-priority one.
+"""
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_DEVANAGARI_DIGITS = str.maketrans('०१२३४५६७८९', '0123456789')
+
+_MONTH = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*'
+_DATE_FORMATS = (
+    rf'(?:(?P<dmy>\d{{1,2}}[/\-]\d{{1,2}}[/\-]\d{{2,4}})'
+    rf'|(?P<ymd>\d{{4}}[/\-]\d{{1,2}}[/\-]\d{{1,2}})'
+    rf'|(?P<dmony>\d{{1,2}}\s+{_MONTH}\s+\d{{4}}))'
+)
+_FORMAT_ORDER = ('dmy', 'ymd', 'dmony')
+
+# Amounts --------------------------------------------------------------------
+
+# "grand total" needs no branch of its own: every grand-total match also
+# matches the plain "total" branch with the same number.
+_LABELED_AMOUNT_RE = re.compile(
+    r'(?:(?P<total>total)|(?P<amount>amount))[\s:]*\$?\s*(?P<value>\d{1,10}(?:,\d{3})*(?:\.\d{2})?)',
+    re.IGNORECASE,
+)
+# Overlapping, and the result is the largest value any of them finds
+_CURRENCY_AMOUNT_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'[\$\£\€]\s?(\d{1,10}(?:,\d{3})*\.\d{2})',             # $XX.XX (with decimal)
+    r'\b(\d{1,3}(?:,\d{3})*\.\d{2})\b',                     # XX.XX (standalone with decimal)
+    r'(\d{2,}\.\d{2})',                                      # Any number with 2 decimals
+))
+
+# Dates ----------------------------------------------------------------------
+
+_SPACES_RE = re.compile(r' +')
+
+# Priority 1: receipt date, then transaction/invoice/bill date; each in dmy, ymd, dmony order
+_TRANSACTION_DATE_RE = re.compile(
+    r'(?:(?P<receipt>receipt\s*#?\s*date)'
+    r'|(?P<txn>(?:transaction|trans|txn|bill|invoice|purchase)\s*(?:date|dt)?))'
+    r'[\s:]*' + _DATE_FORMATS,
+    re.IGNORECASE,
+)
+_TRANSACTION_DATE_ORDER = tuple((label, fmt) for label in ('receipt', 'txn') for fmt in _FORMAT_ORDER)
+
+# Priority 2: generic "Date:" label
+_DATE_LABEL_RE = re.compile(r'\bdate\s*:?\s*' + _DATE_FORMATS, re.IGNORECASE)
+
+# Priority 3: date followed by a time (likely the transaction timestamp)
+_DATETIME_RE = re.compile(
+    r'\b(?:(?P<dmy>\d{1,2}[/-]\d{1,2}[/-]\d{4})|(?P<ymd>\d{4}[/-]\d{1,2}[/-]\d{1,2}))\s+\d{1,2}:\d{2}',
+    re.IGNORECASE,
+)
+
+# Priority 4/5: any date-looking token, header first, then the whole text
+_GENERAL_DATE_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    # 4-digit years - English dates (1980-2099 AD)
+    r'\b(\d{1,2}[/\-]\d{1,2}[/\-](?:20\d{2}|19[89]\d))\b',  # MM/DD/YYYY or DD/MM/YYYY
+    r'\b(\d{4}[/\-]\d{1,2}[/\-]\d{1,2})\b',  # YYYY/MM/DD
+    r'\b(\d{1,2}\.\d{1,2}\.(?:20\d{2}|19[89]\d))\b',  # DD.MM.YYYY
+    r'\b(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(?:20\d{2}|19[89]\d))\b',  # 21 Dec 2025
+    r'\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+(?:20\d{2}|19[89]\d))\b',  # Dec 21, 2025
+    # Nepali dates with Devanagari numerals
+    r'([०-९]{1,2}[/\-][०-९]{1,2}[/\-][०-९]{4})',  # Nepali DD/MM/YYYY
+    r'([०-९]{4}[/\-][०-९]{1,2}[/\-][०-९]{1,2})',  # Nepali YYYY/MM/DD
+    # Nepali month names
+    r'\b(\d{1,2}\s+(?:Baisakh|Jestha|Ashar|Shrawan|Bhadra|Ashwin|Kartik|Mangsir|Poush|Magh|Falgun|Chaitra)\s+\d{4})\b',
+    # 2-digit years (like 02/15/24 or 02/15/25)
+    r'\b(\d{1,2}[/\-]\d{1,2}[/\-]\d{2})\b',
+    # MM/DD without year (like 02/15) - will default to current year
+    r'\b(\d{1,2}[/\-]\d{1,2})(?![/\-]\d)\b',
+))
+
+# Normalization (anchored, applied to a single stripped date string)
+_MONTH_DAY_RE = re.compile(r'^(\d{1,2})[/-](\d{1,2})$')
+_TWO_DIGIT_YEAR_RE = re.compile(r'^(\d{1,2})[/-](\d{1,2})[/-](\d{2})$')
+_DAY_FIRST_RE = re.compile(r'^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$')
+_YEAR_FIRST_RE = re.compile(r'^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$')
+
+NEPALI_MONTHS = {
+    'baisakh': 1, 'baishakh': 1, 'वैशाख': 1,
+    'jestha': 2, 'jeth': 2, 'ज्येष्ठ': 2,
+    'ashar': 3, 'ashadh': 3, 'asar': 3, 'आषाढ': 3,
+    'shrawan': 4, 'sawan': 4, 'श्रावण': 4,
+    'bhadra': 5, 'bhadau': 5, 'भाद्र': 5,
+    'ashwin': 6, 'asoj': 6, 'आश्विन': 6,
+    'kartik': 7, 'कार्तिक': 7,
+    'mangsir': 8, 'mangshir': 8, 'मंसिर': 8,
+    'poush': 9, 'paush': 9, 'पौष': 9,
+    'magh': 10, 'माघ': 10,
+    'falgun': 11, 'phalgun': 11, 'फाल्गुन': 11,
+    'chaitra': 12, 'chait': 12, 'चैत्र': 12,
+}
+_NEPALI_MONTH_NAMES = list(NEPALI_MONTHS)
+_NEPALI_NAMED_DATE_RE = re.compile(
+    r'\b(?P<day>\d{1,2})\s+(?:'
+    + '|'.join(f'(?P<m{i}>{re.escape(name)})' for i, name in enumerate(_NEPALI_MONTH_NAMES))
+    + r')\s+(?P<year>\d{4})\b',
+    re.IGNORECASE,
+)
+
+# Categories -----------------------------------------------------------------
+
+_CATEGORY_PATTERNS = {
+    'Food & Dining': r'restaurant|cafe|coffee|pizza|burger|food|lunch|dinner|breakfast',
+    'Transportation': r'uber|lyft|taxi|gas|fuel|parking|metro|bus|train',
+    'Shopping': r'amazon|walmart|target|store|shop|mall|purchase',
+    'Bills & Utilities': r'electric|water|internet|phone|bill|utility',
+    'Healthcare': r'doctor|hospital|pharmacy|medicine|health|clinic',
+    'Entertainment': r'movie|cinema|concert|spotify|netflix|game',
+    'Income': r'salary|wage|payment received|income|bonus|refund',
+}
+_CATEGORY_NAMES = list(_CATEGORY_PATTERNS)
+_CATEGORY_RE = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<c{i}>{p})' for i, p in enumerate(_CATEGORY_PATTERNS.values())) + r')\b'
+)
+
+# Voice ----------------------------------------------------------------------
+
+_YESTERDAY_RE = re.compile(r'\byesterday\b')
+_TODAY_RE = re.compile(r'\btoday\b')
+
+_VOICE_AMOUNT_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    # Nepali patterns
+    r'(?:रु\.?|Rs\.?|NPR|रुपैयाँ|रुपिया)\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:रु\.?|Rs\.?|रुपैयाँ|रुपिया)',
+    # English patterns
+    r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:dollars?|bucks?)',
+    # General number patterns with context
+    r'(?:spent|paid|cost|खर्च|तिरे|दिए)\s*(?:\$|रु\.?)?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:for|को लागि|मा)',
+    # Standalone large numbers (likely amounts)
+    r'\b(\d{2,}(?:,\d{3})*(?:\.\d{2})?)\b',
+))
+
+_VOICE_DESCRIPTION_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    # "spent X on Y" -> Y is the description
+    r'(?:spent|paid|on|for|at)\s+(?:\$?\d+\s+)?(?:on|for|at)\s+(.+?)(?:\s+(?:today|yesterday|this)|\s*$)',
+    # "bought X" -> X is the description
+    r'(?:bought|purchased|got)\s+(.+?)(?:\s+(?:for|at|today|yesterday)|\s*$)',
+    # Nepali: "X मा खर्च" or "X किने"
+    r'(.+?)\s*(?:मा\s+)?(?:खर्च|किने|तिरे)',
+))
+
+
+def _first_matches(regex, text, key, wanted):
+    """
+    One ``finditer`` pass: the first match for each ``key(match)``, stopping
+    once ``wanted`` distinct keys have been seen.
+    """
+    found = {}
+    for match in regex.finditer(text):
+        found.setdefault(key(match), match)
+        if len(found) == wanted:
+            break
+    return found
+
+
+def _date_format(match):
+    return 'dmy' if match.group('dmy') is not None else ('ymd' if match.group('ymd') is not None else 'dmony')
+
+
+def _transaction_date_key(match):
+    return ('receipt' if match.group('receipt') is not None else 'txn', _date_format(match))
+
+
+def _nepali_month_key(match):
+    return next(i for i in range(len(_NEPALI_MONTH_NAMES)) if match.group(f'm{i}') is not None)
+
+
+# Priorities 1-3, each a single pass: (regex, candidate key, key priority, log description)
+_LABELED_DATE_TIERS = (
+    (_TRANSACTION_DATE_RE, _transaction_date_key, _TRANSACTION_DATE_ORDER, 'transaction date with label'),
+    (_DATE_LABEL_RE, _date_format, _FORMAT_ORDER, "date with 'Date:' label"),
+    (_DATETIME_RE, _date_format, ('dmy', 'ymd'), 'date with timestamp'),
+)
+
+
+class ReceiptExtractor:
+    """
+    Amount, date and category extraction from OCR and voice text.
+
+    Stateless apart from its settings; ``EXTRACTOR`` is the shared instance
+    the ``core.ai_service`` helpers delegate to.
+    """
+
+    def __init__(self, header_chars=600, max_amount=1000000, max_voice_amount=10000000):
+        self.header_chars = header_chars
+        self.max_amount = max_amount
+        self.max_voice_amount = max_voice_amount
+
+    # Amounts
+
+    def amount(self, text: str) -> Optional[float]:
+        """Labelled total/amount first; otherwise the largest currency-looking number."""
+        first_amount = None
+        for match in _LABELED_AMOUNT_RE.finditer(text.lower()):
+            val = float(match.group('value').replace(',', ''))
+            if not 0.01 <= val <= self.max_amount:
+                continue
+            if match.group('total') is not None:
+                return val
+            if first_amount is None:
+                first_amount = val
+        if first_amount is not None:
+            return first_amount
+
+        best = None
+        for regex in _CURRENCY_AMOUNT_RES:
+            for match in regex.findall(text):
+                val = float(match.replace(',', ''))
+                if 0.01 <= val <= self.max_amount and (best is None or val > best):
+                    best = val
+        return best
+
+    def voice_amount(self, transcript: str) -> Optional[float]:
+        for regex in _VOICE_AMOUNT_RES:
+            match = regex.search(transcript)
+            if match:
+                try:
+                    amount = float(match.group(1).replace(',', ''))
+                except ValueError:
+                    continue
+                if 0.01 <= amount <= self.max_voice_amount:
+                    return amount
+        return None
+
+    # Dates
+
+    def date(self, text: str) -> Optional[str]:
+        """Transaction date as YYYY-MM-DD, trying labelled dates before bare ones."""
+        logger.info("[_extract_date_regex] OCR text (first 600 chars): %s", text[:600])
+        text = _SPACES_RE.sub(' ', text)
+
+        for regex, key, order, description in _LABELED_DATE_TIERS:
+            found = _first_matches(regex, text, key, len(order))
+            for candidate in order:
+                if candidate in found:
+                    fmt = candidate[1] if isinstance(candidate, tuple) else candidate
+                    normalized = self._valid(found[candidate].group(fmt))
+                    if normalized:
+                        logger.info("[_extract_date_regex] Found %s: %s", description, normalized)
+                        return normalized
+
+        normalized = self._first_general_date(text[:self.header_chars], verbose=True)
+        if normalized:
+            return normalized
+        # Past the header the same search can only find something new on longer text
+        if len(text) > self.header_chars:
+            normalized = self._first_general_date(text, verbose=False)
+            if normalized:
+                return normalized
+
+        logger.warning("[_extract_date_regex] No valid date found in text")
+        return None
+
+    def _valid(self, date_str):
+        normalized = self.normalize_date(date_str)
+        return normalized if normalized and self.is_valid_date(normalized) else None
+
+    def _first_general_date(self, text, verbose):
+        for regex in _GENERAL_DATE_RES:
+            match = regex.search(text)
+            if not match:
+                continue
+            date_str = match.group(1)
+            if not any(sep in date_str for sep in ('/', '-', '.', ' ')):
+                if verbose:
+                    logger.debug("[_extract_date_regex] Skipping '%s' - no separator", date_str)
+                continue
+            # Validate date string doesn't look corrupted
+            if len(date_str) < 6:
+                if verbose:
+                    logger.debug("[_extract_date_regex] Skipping '%s' - too short", date_str)
+                continue
+            normalized = self.normalize_date(date_str)
+            if normalized and self.is_valid_date(normalized):
+                if verbose:
+                    logger.info("[_extract_date_regex] Found date in header: '%s' -> '%s'", date_str, normalized)
+                else:
+                    logger.info("[_extract_date_regex] Found date in document: '%s' -> '%s'", date_str, normalized)
+                return normalized
+            if verbose:
+                logger.warning("[_extract_date_regex] Rejected invalid date: '%s' -> '%s'", date_str, normalized)
+        return None
+
+    @staticmethod
+    def is_valid_date(date_str: str) -> bool:
+        """A normalized YYYY-MM-DD between 2000 and next year that exists on the calendar."""
+        try:
+            parts = date_str.split('-')
+            if len(parts) != 3:
+                return False
+            year, month, day = int(parts[0]), int(parts[1]), int(parts[2])
+            if not (2000 <= year <= datetime.now().year + 1):
+                return False
+            datetime(year, month, day)
+            return True
+        except (TypeError, ValueError, AttributeError):
+            return False
+
+    def normalize_date(self, date_str: str) -> Optional[str]:
+        """Normalize date to YYYY-MM-DD format with robust parsing (supports both Nepali BS and English AD dates)"""
+        date_str = date_str.strip()
+
+        # Special case: MM/DD without year (like "02/15") - assume current year
+        match = _MONTH_DAY_RE.match(date_str)
+        if match:
+            month, day = map(int, match.groups())
+            current_year = datetime.now().year
+            try:
+                normalized = datetime(current_year, month, day).strftime('%Y-%m-%d')
+                logger.info("[_normalize_date] Parsed MM/DD (no year): '%s' -> '%s' (assumed %s)",
+                            date_str, normalized, current_year)
+                return normalized
+            except ValueError:
+                pass
+
+        # Reject if input is too short (less than 5 chars can't be a valid date with year)
+        if len(date_str) < 5:
+            logger.warning("[_normalize_date] Rejected '%s' - too short", date_str)
+            return None
+
+        # Try Nepali date conversion first (if year is 2000-2100 in BS calendar)
+        nepali_result = self.nepali_to_english_date(date_str)
+        if nepali_result:
+            return nepali_result
+
+        # Handle 2-digit years (like 02/15/24): 00-50 -> 20xx, 51-99 -> 19xx; MM/DD/YY before DD/MM/YY
+        match = _TWO_DIGIT_YEAR_RE.match(date_str)
+        if match:
+            first, second, year_2digit = map(int, match.groups())
+            year = 2000 + year_2digit if year_2digit <= 50 else 1900 + year_2digit
+            for month, day, label in ((first, second, 'MM/DD/YY'), (second, first, 'DD/MM/YY')):
+                try:
+                    normalized = datetime(year, month, day).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+                logger.info("[_normalize_date] Parsed %s: '%s' -> '%s'", label, date_str, normalized)
+                return normalized
+
+        # Format: DD/MM/YYYY or MM/DD/YYYY (4-digit year). A part > 12 must be the
+        # day; when both are <= 12 prefer MM/DD/YYYY (US format), then DD/MM/YYYY.
+        match = _DAY_FIRST_RE.match(date_str)
+        if match:
+            first, second, year = map(int, match.groups())
+            if first > 12:
+                orders = ((second, first, 'DD/MM/YYYY (first>12)'),)
+            elif second > 12:
+                orders = ((first, second, 'MM/DD/YYYY (second>12)'),)
+            else:
+                orders = ((first, second, 'MM/DD/YYYY (ambiguous, US default)'),
+                          (second, first, 'DD/MM/YYYY (ambiguous, fallback)'))
+            for month, day, label in orders:
+                try:
+                    normalized = datetime(year, month, day).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+                logger.info("[_normalize_date] Parsed %s: '%s' -> '%s'", label, date_str, normalized)
+                return normalized
+
+        # Format: YYYY-MM-DD or YYYY/MM/DD
+        match = _YEAR_FIRST_RE.match(date_str)
+        if match:
+            year, month, day = map(int, match.groups())
+            try:
+                normalized = datetime(year, month, day).strftime('%Y-%m-%d')
+                logger.info("[_normalize_date] Parsed YYYY-MM-DD: '%s' -> '%s'", date_str, normalized)
+                return normalized
+            except ValueError:
+                pass
+
+        # Fallback to dateutil parser for text dates like "21 Dec 2019"
+        try:
+            from dateutil import parser
+            # Try with dayfirst=True (more common in receipts)
+            dt = parser.parse(date_str, fuzzy=True, dayfirst=True)
+
+            if dt.year < 1900 or dt.year > 2099:
+                logger.warning("[_normalize_date] Invalid year %s from '%s'", dt.year, date_str)
+                return None
+
+            # Double-check we got a full date (not just a year)
+            normalized = dt.strftime('%Y-%m-%d')
+            if len(normalized) != 10:
+                logger.warning("[_normalize_date] Invalid format '%s' from '%s'", normalized, date_str)
+                return None
+
+            logger.info("[_normalize_date] Parsed with dateutil: '%s' -> '%s'", date_str, normalized)
+            return normalized
+        except Exception as e:
+            logger.warning("[_normalize_date] Failed to parse '%s': %s", date_str, e)
+            return None
+
+    @staticmethod
+    def nepali_to_english_date(nepali_date_str: str) -> Optional[str]:
+        """Convert Nepali (BS) date to English (AD) date in YYYY-MM-DD format"""
+        try:
+            from nepali_datetime import date as NepaliDate
+
+            def convert(year, month, day):
+                try:
+                    result = NepaliDate(year, month, day).to_datetime_date().strftime('%Y-%m-%d')
+                except Exception as e:
+                    logger.debug("[_convert_nepali_to_english_date] Failed to convert %s: %s", nepali_date_str, e)
+                    return None
+                logger.info("[_convert_nepali_to_english_date] Converted BS %s -> AD %s", nepali_date_str, result)
+                return result
+
+            english_date_str = nepali_date_str.translate(_DEVANAGARI_DIGITS)
+            has_devanagari = english_date_str != nepali_date_str
+
+            # Numeric dates are only treated as BS when written in Devanagari
+            # numerals or when the year is past 2050 (clearly BS)
+            match = _YEAR_FIRST_RE.match(english_date_str)
+            if match:
+                year, month, day = map(int, match.groups())
+                if (has_devanagari or year > 2050) and 2000 <= year <= 2100:
+                    result = convert(year, month, day)
+                    if result:
+                        return result
+
+            match = _DAY_FIRST_RE.match(english_date_str)
+            if match:
+                day, month, year = map(int, match.groups())
+                if (has_devanagari or year > 2050) and 2000 <= year <= 2100:
+                    result = convert(year, month, day)
+                    if result:
+                        return result
+
+            # DD MonthName YYYY with a Nepali month name is always BS; months are
+            # tried in NEPALI_MONTHS order, each at its first occurrence
+            found = _first_matches(_NEPALI_NAMED_DATE_RE, english_date_str, _nepali_month_key, len(_NEPALI_MONTH_NAMES))
+            for i, name in enumerate(_NEPALI_MONTH_NAMES):
+                if i not in found:
+                    continue
+                match = found[i]
+                day, year = int(match.group('day')), int(match.group('year'))
+                if 2000 <= year <= 2100:
+                    result = convert(year, NEPALI_MONTHS[name], day)
+                    if result:
+                        return result
+        except Exception as e:
+            logger.debug("[_convert_nepali_to_english_date] Error: %s", e)
+
+        return None
+
+    @staticmethod
+    def relative_date(text: str) -> Optional[str]:
+        """today/yesterday (English or Nepali) as YYYY-MM-DD."""
+        text_lower = (text or "").lower()
+        today = datetime.now().date()
+        if _YESTERDAY_RE.search(text_lower):
+            return (today - timedelta(days=1)).strftime("%Y-%m-%d")
+        if _TODAY_RE.search(text_lower):
+            return today.strftime("%Y-%m-%d")
+        # आज = today, हिजो/हिज = yesterday
+        if "हिजो" in text or "हिज" in text:
+            return (today - timedelta(days=1)).strftime("%Y-%m-%d")
+        if "आज" in text:
+            return today.strftime("%Y-%m-%d")
+        return None
+
+    # Categories and descriptions
+
+    @staticmethod
+    def pattern_category(text_lower: str) -> Optional[str]:
+        """Category of the earliest-listed pattern group that matches anywhere."""
+        best = None
+        for match in _CATEGORY_RE.finditer(text_lower):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return None if best is None else _CATEGORY_NAMES[best]
+
+    @staticmethod
+    def voice_description(transcript: str) -> Optional[str]:
+        for regex in _VOICE_DESCRIPTION_RES:
+            match = regex.search(transcript)
+            if match:
+                desc = match.group(1).strip()
+                if len(desc) > 2 and not desc.isdigit():
+                    return desc[:200]
+        return None
+
+    @staticmethod
+    def devanagari_to_ascii_digits(text: str) -> str:
+        return text.translate(_DEVANAGARI_DIGITS)
+
+
+EXTRACTOR = ReceiptExtractor()
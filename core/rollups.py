@@ -0,0 +1,157 @@
+"""
+Incremental maintenance of MonthlyCategoryRollup.
+
+Every Transaction write adjusts the (owner, month, category) row it lands in
+with an F() expression, so analytics can read per-month, per-category totals
+without scanning the transactions table.  ``Transaction.save()`` and
+``Transaction.delete()`` call in here automatically; code that bypasses them
+(``bulk_create``, ``bulk_update``) must call ``record_created()`` or
+``record_changes()`` itself.  ``rebuild()`` recomputes rows from scratch.
+Every change also bumps the owner's forecast cache version.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from .forecasting.cache import bump_data_version
+from .models import MonthlyCategoryRollup, Transaction
+
+_ROLLUP_FIELDS = ('owner_id', 'date', 'category', 'amount')
+
+
+def state_of(txn):
+    """Return the (owner_id, month, category, amount) a transaction contributes,
+    or None when any of those fields is deferred on the instance."""
+    if any(name not in txn.__dict__ for name in _ROLLUP_FIELDS):
+        return None
+    txn_date = Transaction._meta.get_field('date').to_python(txn.date)
+    return (
+        txn.owner_id,
+        txn_date.replace(day=1),
+        txn.category or '',
+        Decimal(str(txn.amount)),
+    )
+
+
+def state_from_db(pk):
+    row = Transaction.objects.filter(pk=pk).values_list(*_ROLLUP_FIELDS).first()
+    if row is None:
+        return None
+    owner_id, txn_date, category, amount = row
+    return owner_id, txn_date.replace(day=1), category or '', amount
+
+
+def new_deltas():
+    """Empty {(owner_id, month, category): [amount_delta, count_delta]} map."""
+    return defaultdict(lambda: [Decimal('0'), 0])
+
+
+def _add(deltas, state, sign):
+    if state is None:
+        return
+    owner_id, month, category, amount = state
+    entry = deltas[(owner_id, month, category)]
+    entry[0] += sign * amount
+    entry[1] += sign
+
+
+def apply_deltas(deltas):
+    """Apply {(owner_id, month, category): [amount_delta, count_delta]}."""
+    changed_owners = set()
+    with transaction.atomic():
+        for (owner_id, month, category), (amount, count) in deltas.items():
+            if not amount and not count:
+                continue
+            changed_owners.add(owner_id)
+            key = {'owner_id': owner_id, 'month': month, 'category': category}
+            updated = MonthlyCategoryRollup.objects.filter(**key).update(
+                total=F('total') + amount,
+                count=F('count') + count,
+            )
+            if updated:
+                continue
+            try:
+                with transaction.atomic():
+                    MonthlyCategoryRollup.objects.create(total=amount, count=count, **key)
+            except IntegrityError:
+                # Lost a race with a concurrent writer creating the same row
+                MonthlyCategoryRollup.objects.filter(**key).update(
+                    total=F('total') + amount,
+                    count=F('count') + count,
+                )
+        bump_data_version(*changed_owners)
+
+
+def record_change(before, after):
+    """Move one transaction's contribution from state *before* to *after*."""
+    if before == after:
+        return
+    deltas = new_deltas()
+    _add(deltas, before, -1)
+    _add(deltas, after, 1)
+    apply_deltas(deltas)
+
+
+def record_changes(pairs):
+    """Batch form of record_change() for an iterable of (before, after) states."""
+    apply_deltas(collect_changes(pairs, new_deltas()))
+
+
+def collect_changes(pairs, deltas):
+    """Accumulate (before, after) state pairs into *deltas*, like collect_created()."""
+    for before, after in pairs:
+        if before != after:
+            _add(deltas, before, -1)
+            _add(deltas, after, 1)
+    return deltas
+
+
+def collect_created(transactions, deltas):
+    """Accumulate bulk-created rows into *deltas* without touching the database,
+    for importers that insert many batches and apply once at the end."""
+    for txn in transactions:
+        _add(deltas, state_of(txn), 1)
+    return deltas
+
+
+def record_created(transactions):
+    """Add rows inserted with bulk_create (which skips Transaction.save())."""
+    apply_deltas(collect_created(transactions, new_deltas()))
+
+
+def rebuild(owner_ids=None):
+    """Recompute rollups from the transactions table (backfill / reconcile)."""
+    transactions = Transaction.objects.all()
+    rollups = MonthlyCategoryRollup.objects.all()
+    if owner_ids is not None:
+        transactions = transactions.filter(owner_id__in=owner_ids)
+        rollups = rollups.filter(owner_id__in=owner_ids)
+
+    grouped = (
+        transactions.annotate(month=TruncMonth('date'))
+        .values('owner_id', 'month', 'category')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        changed_owners = set(rollups.order_by().values_list('owner_id', flat=True).distinct())
+        rollups.delete()
+        MonthlyCategoryRollup.objects.bulk_create(
+            (
+                MonthlyCategoryRollup(
+                    owner_id=row['owner_id'],
+                    month=row['month'],
+                    category=row['category'] or '',
+                    total=row['total'],
+                    count=row['count'],
+                )
+                for row in grouped.iterator()
+            ),
+            batch_size=1000,
+        )
+        changed_owners.update(transactions.order_by().values_list('owner_id', flat=True).distinct())
+        bump_data_version(*changed_owners)
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Transaction, IncomeSource, Budget, Reminder, RecurringTransaction, UserProfile, Group, GroupMembership, GroupExpense, GroupPayment
+from .models import Transaction, IncomeSource, Budget, Reminder, RecurringTransaction, UserProfile, Group, GroupMembership, GroupExpense, GroupPayment, ReceiptOCRJob
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -69,25 +69,14 @@ class BudgetSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "owner", "spent", "created_at", "updated_at"]
 
     def get_spent(self, obj):
-        """Calculate spent amount from transactions in the same month/category"""
-        from django.db.models import Sum
-        from datetime import date
-        
-        # Get first and last day of the budget month
-        first_day = obj.month.replace(day=1)
-        if first_day.month == 12:
-            last_day = first_day.replace(year=first_day.year + 1, month=1, day=1)
-        else:
-            last_day = first_day.replace(month=first_day.month + 1, day=1)
-        
-        total = Transaction.objects.filter(
-            owner=obj.owner,
-            category__iexact=obj.category,
-            date__gte=first_day,
-            date__lt=last_day
-        ).exclude(category__iexact='Income').aggregate(total=Sum('amount'))['total']
-        
-        return float(total) if total else 0.0
+        """Spent amount from transactions in the same month/category.
+
+        List views precompute it for every row with Budget.attach_spent();
+        single objects (create/update responses) fall back to computing it here.
+        """
+        if not hasattr(obj, 'spent'):
+            Budget.attach_spent([obj])
+        return obj.spent
 
 
 class ReminderSerializer(serializers.ModelSerializer):
@@ -357,3 +346,18 @@ class GroupListSerializer(serializers.ModelSerializer):
             if payment.paid_to == user:
                 owed -= float(payment.amount)
         return round(owe - owed, 2)
+
+
+class ReceiptOCRJobSerializer(serializers.ModelSerializer):
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReceiptOCRJob
+        fields = ["id", "url", "status", "result", "error", "created_at", "started_at", "finished_at"]
+        read_only_fields = fields
+
+    def get_url(self, obj):
+        from django.urls import reverse
+        path = reverse("receipt_ocr_job_detail", args=[obj.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(path) if request else path
@@ -0,0 +1,10 @@
+"""
+Celery tasks. Only imported by Celery's autodiscovery, so Celery stays optional.
+"""
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def run_receipt_ocr_job(job_id):
+    from .ocr_jobs import run
+    run(job_id)
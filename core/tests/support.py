@@ -1,3 +1,8 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 from django.contrib.auth.models import User
 
 from core.models import UserProfile
@@ -13,3 +18,92 @@ def create_user(
 
 def create_profile(user, **kwargs):
     return UserProfile.objects.create(user=user, **kwargs)
+
+
+class FakeOllama:
+    """
+    Local stand-in for ``ollama serve``: answers /api/chat with ``reply(payload)``
+    as JSON content (an echo of the last message by default) after ``delay``
+    seconds, with ``statuses`` popped one per request.  Streamed requests get
+    ``tokens`` as chunked NDJSON, ``token_delay`` seconds apart.  The next
+    ``hang_ups`` requests are answered by closing the connection unanswered.
+    """
+
+    def __init__(self):
+        self.reply = lambda payload: {"echo": payload["messages"][-1]["content"]}
+        self.tokens = ["Hello", " there", "."]
+        self.token_delay = 0
+        self.delay = 0
+        self.statuses = []
+        self.hang_ups = 0
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with fake._lock:
+                    fake.requests += 1
+                    hang_up = fake.hang_ups > 0
+                    fake.hang_ups -= hang_up
+                if hang_up:
+                    self.close_connection = True
+                    return
+                with fake._lock:
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                    status = fake.statuses.pop(0) if fake.statuses else 200
+                try:
+                    time.sleep(fake.delay)
+                    if payload.get("stream") and status == 200:
+                        self._stream()
+                        return
+                    content = json.dumps(fake.reply(payload))
+                    body = json.dumps({"message": {"role": "assistant", "content": content}}).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                events = [{"message": {"role": "assistant", "content": t}, "done": False} for t in fake.tokens]
+                events.append({"message": {"role": "assistant", "content": ""}, "done": True})
+                for event in events:
+                    line = json.dumps(event).encode() + b"\n"
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    self.wfile.flush()
+                    time.sleep(fake.token_delay)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        # Clients that time out hang up mid-reply; that's expected here
+        self.server.handle_error = lambda request, address: None
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
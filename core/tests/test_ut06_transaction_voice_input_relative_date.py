@@ -1,5 +1,7 @@
 from datetime import date, timedelta
+from io import StringIO
 
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
@@ -12,7 +14,7 @@ class TransactionMaterializationViewTests(APITestCase):
         self.user = create_user()
         self.client.force_authenticate(user=self.user)
 
-    def test_transaction_list_materializes_due_recurring_entries(self):
+    def test_transaction_list_shows_entries_materialized_by_scheduled_run(self):
         RecurringTransaction.objects.create(
             owner=self.user,
             title="Netflix",
@@ -26,4 +28,10 @@ class TransactionMaterializationViewTests(APITestCase):
         response = self.client.get(reverse("transaction-list"))
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(Transaction.objects.filter(owner=self.user, title="Netflix").count(), 3)
+        self.assertEqual(Transaction.objects.filter(owner=self.user, title="Netflix").count(), 0)
+
+        call_command("materialize_recurring", stdout=StringIO())
+        response = self.client.get(reverse("transaction-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len([row for row in response.data if row["title"] == "Netflix"]), 3)
@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import Transaction
+from core.tests.support import create_user
+
+
+class TransactionKeysetPaginationViewTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        base = date(2026, 4, 1)
+        # Two rows share each date so pages must break ties on id.
+        for i in range(6):
+            Transaction.objects.create(
+                owner=self.user,
+                title=f"Txn {i}",
+                amount="10.00",
+                date=base + timedelta(days=i // 2),
+                category="Food",
+            )
+
+    def test_transaction_list_pages_follow_date_id_ordering(self):
+        expected = list(Transaction.objects.filter(owner=self.user).order_by("-date", "-id").values_list("id", flat=True))
+
+        seen = []
+        response = self.client.get(reverse("transaction-list"), {"page_size": 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 4)
+        seen.extend(row["id"] for row in response.data["results"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["next"])
+        seen.extend(row["id"] for row in response.data["results"])
+
+        self.assertEqual(seen, expected)
+
+    def test_transaction_list_without_page_params_returns_plain_list(self):
+        response = self.client.get(reverse("transaction-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 6)
+
+    def test_transaction_list_rejects_malformed_cursor(self):
+        response = self.client.get(reverse("transaction-list"), {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,60 @@
+import math
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import RecurringTransaction, Transaction
+from core.tests.support import create_user
+
+
+class RecurringBatchMaterializerTests(TestCase):
+    def setUp(self):
+        self.alice = create_user()
+        self.bob = create_user(username="bob", email="bob@example.com")
+
+    def test_paused_daily_rule_catches_up_with_one_bulk_insert(self):
+        start = date.today() - timedelta(days=364)
+        rule = RecurringTransaction.objects.create(
+            owner=self.alice,
+            title="Coffee",
+            amount="3.00",
+            category="Food & Dining",
+            frequency=RecurringTransaction.FREQ_DAILY,
+            start_date=start,
+            next_due_date=start,
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            created = RecurringTransaction.materialize_due(self.alice)
+
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "core_transaction"')]
+        # One bulk_create; SQLite's bound-parameter cap may split it into a few statements.
+        fields = [f for f in Transaction._meta.concrete_fields if not f.primary_key]
+        per_statement = min(1000, connection.ops.bulk_batch_size(fields, created))
+        self.assertEqual(len(created), 365)
+        self.assertEqual(len(inserts), math.ceil(365 / per_statement))
+        rule.refresh_from_db()
+        self.assertEqual(rule.next_due_date, date.today() + timedelta(days=1))
+
+    def test_command_materializes_rules_for_all_users(self):
+        for user in (self.alice, self.bob):
+            RecurringTransaction.objects.create(
+                owner=user,
+                title="Rent",
+                amount="900.00",
+                category="Bills & Utilities",
+                frequency=RecurringTransaction.FREQ_MONTHLY,
+                start_date=date.today(),
+                next_due_date=date.today(),
+            )
+
+        out = StringIO()
+        call_command("materialize_recurring", stdout=out)
+
+        self.assertIn("Materialized 2", out.getvalue())
+        self.assertEqual(Transaction.objects.filter(owner=self.alice, title="Rent").count(), 1)
+        self.assertEqual(Transaction.objects.filter(owner=self.bob, title="Rent").count(), 1)
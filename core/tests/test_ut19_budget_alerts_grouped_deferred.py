@@ -0,0 +1,49 @@
+from datetime import date
+
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Budget, Transaction
+from core.tests.support import create_user
+from core.views import _check_budget_alerts
+
+
+class BudgetAlertsGroupedDeferredTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.month = date.today().replace(day=1)
+        for category in ("Food", "Travel", "Shopping", "Healthcare", "Education"):
+            Budget.objects.create(owner=self.user, category=category, limit_amount="100.00", month=self.month)
+
+    def _spend(self, category, amount):
+        Transaction.objects.create(owner=self.user, title="x", amount=amount, date=self.month, category=category)
+
+    def test_spend_for_all_budgets_comes_from_one_aggregate(self):
+        self._spend("food", "95.00")
+        self._spend("Travel", "20.00")
+
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks():
+            _check_budget_alerts(self.user)
+
+        aggregates = [q for q in ctx.captured_queries if "SUM(" in q["sql"].upper()]
+        self.assertEqual(len(aggregates), 1)
+        food = Budget.objects.get(owner=self.user, category="Food")
+        self.assertTrue(food.alert_90_sent)
+        self.assertFalse(food.alert_100_sent)
+        self.assertFalse(Budget.objects.get(owner=self.user, category="Travel").alert_90_sent)
+
+    @override_settings(LEDGER_AI_DEFER_SYNC=True)
+    def test_alert_email_is_sent_after_commit_not_inline(self):
+        self._spend("Food", "150.00")
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            _check_budget_alerts(self.user)
+
+        self.assertEqual(len(mail.outbox), 0)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn("Over budget", mail.outbox[1].subject)
@@ -0,0 +1,50 @@
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import Budget, Transaction
+from core.tests.support import create_user
+
+
+class BudgetListQueryCountViewTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        self.month = date(2026, 4, 1)
+
+    def _add_budgets(self, categories):
+        for category in categories:
+            Budget.objects.create(owner=self.user, category=category, limit_amount="100.00", month=self.month)
+            Transaction.objects.create(owner=self.user, title="x", amount="7.25", date=self.month, category=category.lower())
+
+    def _list_query_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("budget-list"))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_budget_list_query_count_is_independent_of_budget_count(self):
+        self._add_budgets(["Food"])
+        small_count, _ = self._list_query_count()
+
+        self._add_budgets([f"Category {i}" for i in range(20)])
+        large_count, response = self._list_query_count()
+
+        self.assertEqual(small_count, large_count)
+        self.assertEqual(len(response.data), 21)
+        self.assertTrue(all(row["spent"] == 7.25 for row in response.data))
+
+    def test_budget_create_response_includes_spent(self):
+        Transaction.objects.create(owner=self.user, title="x", amount="12.00", date=self.month, category="Travel")
+
+        response = self.client.post(
+            reverse("budget-list"),
+            {"category": "Travel", "limit_amount": "200.00", "month": "2026-04-15"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["spent"], 12.0)
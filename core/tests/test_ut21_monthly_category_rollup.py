@@ -0,0 +1,74 @@
+from datetime import date
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import MonthlyCategoryRollup, RecurringTransaction, Transaction
+from core.rollups import rebuild
+from core.tests.support import create_user
+
+
+def _rollup_rows(user):
+    return sorted(
+        (r.month, r.category, r.total, r.count)
+        for r in MonthlyCategoryRollup.objects.filter(owner=user, count__gt=0)
+    )
+
+
+class MonthlyCategoryRollupTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    def test_rollup_tracks_create_update_delete_import_and_recurring(self):
+        txn = Transaction.objects.create(owner=self.user, title="Lunch", amount="12.50", date=date(2026, 3, 5), category="Food")
+        Transaction.objects.create(owner=self.user, title="Taxi", amount="8.00", date=date(2026, 3, 9), category="Transportation")
+
+        txn.amount = "20.00"
+        txn.date = date(2026, 4, 1)
+        txn.category = "Food & Dining"
+        txn.save()
+        Transaction.objects.get(title="Taxi").delete()
+
+        upload = SimpleUploadedFile(
+            "import.csv",
+            b"Title,Amount,Date,Category,Notes\nCoffee,3.50,2026-04-02,Food & Dining,\nBus,2.00,2026-04-03,Transportation,\n",
+            content_type="text/csv",
+        )
+        response = self.client.post(reverse("import_transactions"), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+
+        RecurringTransaction.objects.create(
+            owner=self.user,
+            title="Gym",
+            amount="40.00",
+            category="Healthcare",
+            frequency=RecurringTransaction.FREQ_MONTHLY,
+            start_date=date(2026, 2, 1),
+            end_date=date(2026, 3, 31),
+            next_due_date=date(2026, 2, 1),
+        )
+        RecurringTransaction.materialize_due(self.user)
+
+        incremental = _rollup_rows(self.user)
+        rebuild([self.user.id])
+        self.assertEqual(incremental, _rollup_rows(self.user))
+        self.assertIn((date(2026, 4, 1), "Food & Dining", 23.5, 2), [
+            (m, c, float(t), n) for m, c, t, n in incremental
+        ])
+
+    def test_category_stats_reads_rollup(self):
+        Transaction.objects.create(owner=self.user, title="a", amount="30.00", date=date(2026, 1, 5), category="Food")
+        Transaction.objects.create(owner=self.user, title="b", amount="10.00", date=date(2026, 2, 5), category="Food")
+        Transaction.objects.create(owner=self.user, title="c", amount="60.00", date=date(2026, 2, 6), category="Travel")
+        Transaction.objects.create(owner=self.user, title="d", amount="999.00", date=date(2026, 2, 7), category="income")
+
+        response = self.client.get(reverse("category_stats"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_spending"], 100.0)
+        self.assertEqual(
+            [(row["category"], row["total"], row["count"]) for row in response.data["stats"]],
+            [("Travel", 60.0, 1), ("Food", 40.0, 2)],
+        )
@@ -0,0 +1,51 @@
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from core.forecasting import build_forecast, linear_regression, monte_carlo_forecast
+
+
+def _monthly(totals):
+    return {
+        f"2026-{i + 1:02d}": {'total': total, 'categories': {'Food': total * 0.6, 'Rent': total * 0.4}}
+        for i, total in enumerate(totals)
+    }
+
+
+class ForecastEngineTests(SimpleTestCase):
+    history = [820.0, 910.0, 870.0, 1005.0, 960.0, 1040.0]
+
+    def test_linear_regression_matches_closed_form(self):
+        slope, intercept = linear_regression([0, 1, 2, 3], [1.0, 3.0, 5.0, 7.0])
+        self.assertAlmostEqual(slope, 2.0)
+        self.assertAlmostEqual(intercept, 1.0)
+
+        self.assertEqual(linear_regression([0, 1], [5.0, 5.0]), (0.0, 5.0))
+
+    def test_monte_carlo_is_reproducible_and_bands_are_ordered(self):
+        first = monte_carlo_forecast(self.history, n_simulations=20_000, seed=7)
+        second = monte_carlo_forecast(self.history, n_simulations=20_000, seed=7)
+        self.assertEqual(first, second)
+
+        median, lower, upper = first
+        self.assertEqual(len(median), 6)
+        for lo, mid, hi in zip(lower, median, upper):
+            self.assertLessEqual(lo, mid)
+            self.assertLessEqual(mid, hi)
+            self.assertGreaterEqual(lo, 0)
+
+    def test_build_forecast_payload(self):
+        payload = build_forecast(_monthly(self.history), 2000.0, today=date(2026, 6, 15), n_simulations=5_000)
+
+        self.assertEqual(len(payload['monthly_data']), 6)
+        self.assertEqual([p['month'] for p in payload['predictions']][:2], ['2026-07', '2026-08'])
+        weights = sum(a['weight'] for a in payload['algorithms'].values())
+        self.assertAlmostEqual(weights, 100.0, delta=0.2)
+        self.assertIn('5,000', payload['algorithms']['monte_carlo']['description'])
+        self.assertEqual(payload['insights']['trend'], 'up')
+        self.assertEqual({c['category'] for c in payload['category_breakdown']}, {'Food', 'Rent'})
+
+    def test_build_forecast_needs_two_months(self):
+        payload = build_forecast(_monthly([500.0]), 0, today=date(2026, 1, 20))
+        self.assertEqual(payload['predictions'], [])
+        self.assertEqual(payload['monthly_data'][0]['actual'], 500.0)
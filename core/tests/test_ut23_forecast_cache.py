@@ -0,0 +1,88 @@
+import os
+from datetime import date
+from unittest.mock import patch
+
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.forecasting import cache as forecast_cache
+from core.models import IncomeSource, Transaction
+from core.tests.support import create_user
+
+
+class ForecastCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        this_month = date.today().replace(day=1)
+        for months_back, amount in ((2, "300.00"), (1, "340.00")):
+            Transaction.objects.create(
+                owner=self.user, title="Groceries", amount=amount,
+                date=this_month - relativedelta(months=months_back), category="Food",
+            )
+
+    def _forecast(self):
+        response = self.client.get(reverse("financial_forecast"))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_second_request_is_served_from_cache_without_queries(self):
+        first = self._forecast()
+        self.assertEqual(first["X-Forecast-Cache"], "miss")
+
+        with self.assertNumQueries(0):
+            second = self._forecast()
+        self.assertEqual(second["X-Forecast-Cache"], "hit")
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(forecast_cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_transaction_and_income_writes_invalidate(self):
+        before = self._forecast().data
+
+        txn = Transaction.objects.create(
+            owner=self.user, title="Dinner", amount="90.00",
+            date=date.today().replace(day=1) - relativedelta(months=1), category="Food",
+        )
+        after_create = self._forecast()
+        self.assertEqual(after_create["X-Forecast-Cache"], "miss")
+        self.assertNotEqual(after_create.data["monthly_data"], before["monthly_data"])
+
+        txn.delete()
+        self.assertEqual(self._forecast()["X-Forecast-Cache"], "miss")
+        self.assertEqual(self._forecast()["X-Forecast-Cache"], "hit")
+
+        IncomeSource.objects.create(owner=self.user, name="Salary", monthly_amount="2500.00")
+        after_income = self._forecast()
+        self.assertEqual(after_income["X-Forecast-Cache"], "miss")
+        self.assertEqual(after_income.data["insights"]["monthly_income"], 2500.0)
+
+    def test_local_memory_cache_is_skipped_with_several_web_workers(self):
+        with patch.dict(os.environ, {"WEB_CONCURRENCY": "2"}):
+            self.assertEqual(self._forecast()["X-Forecast-Cache"], "miss")
+            self.assertEqual(self._forecast()["X-Forecast-Cache"], "miss")
+        self.assertEqual(forecast_cache.stats(), {"hits": 0, "misses": 0, "hit_rate": None})
+
+        shared = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with patch.dict(os.environ, {"WEB_CONCURRENCY": "2"}), override_settings(CACHES=shared):
+            self.assertTrue(forecast_cache.enabled())
+
+    def test_cache_is_per_user(self):
+        self._forecast()
+        other = create_user(username="other", email="other@example.com")
+        self.client.force_authenticate(user=other)
+        response = self._forecast()
+        self.assertEqual(response["X-Forecast-Cache"], "miss")
+        self.assertEqual(response.data["monthly_data"], [])
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.assertEqual(self.client.get(reverse("forecast_cache_stats")).status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        self._forecast()
+        response = self.client.get(reverse("forecast_cache_stats"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["misses"], 1)
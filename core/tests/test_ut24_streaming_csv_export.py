@@ -0,0 +1,92 @@
+import csv
+import gzip
+import io
+import warnings
+from datetime import date
+from unittest.mock import patch
+
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import Transaction
+from core.views import ExportTransactionsView
+from core.tests.support import create_user
+
+
+class StreamingCsvExportTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+        Transaction.objects.bulk_create([
+            Transaction(owner=self.user, title="Rent", amount="900.00", date=date(2026, 1, 1), category="Housing"),
+            Transaction(owner=self.user, title="Lunch, downtown", amount="14.25", date=date(2026, 2, 3), category="Food", notes='said "hi"'),
+            Transaction(owner=self.user, title="Coffee", amount="3.50", date=date(2026, 3, 9), category="food"),
+        ])
+        other = create_user(username="bob", email="bob@example.com")
+        Transaction.objects.create(owner=other, title="Not mine", amount="1.00", date=date(2026, 2, 1), category="Food")
+
+    def _rows(self, response):
+        self.assertIsInstance(response, StreamingHttpResponse)
+        body = b"".join(response.streaming_content)
+        if response["Content-Type"] == "application/gzip":
+            body = gzip.decompress(body)
+        return list(csv.reader(io.StringIO(body.decode("utf-8"))))
+
+    def test_streams_all_rows_newest_first(self):
+        response = self.client.get(reverse("export_transactions"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="transactions.csv"')
+        rows = self._rows(response)
+        self.assertEqual(rows[0], ["Title", "Amount", "Date", "Category", "Notes"])
+        self.assertEqual([r[0] for r in rows[1:]], ["Coffee", "Lunch, downtown", "Rent"])
+        self.assertEqual(rows[2], ["Lunch, downtown", "14.25", "2026-02-03", "Food", 'said "hi"'])
+
+    def test_filters_and_gzip(self):
+        response = self.client.get(reverse("export_transactions"), {
+            "start": "2026-02-01", "end": "2026-03-31", "category": "FOOD", "gzip": "1",
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        rows = self._rows(response)
+        self.assertEqual([r[0] for r in rows[1:]], ["Coffee", "Lunch, downtown"])
+
+    def test_rejects_bad_dates(self):
+        response = self.client.get(reverse("export_transactions"), {"start": "02/01/2026"})
+        self.assertEqual(response.status_code, 400)
+
+
+class AsgiCsvExportTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        Transaction.objects.bulk_create([
+            Transaction(owner=self.user, title=f"T{i}", amount="1.00", date=date(2026, 3, 1 + i // 2), category="Food")
+            for i in range(5)
+        ])
+        # Two rows per chunk, so pages split inside a day and ties break on id
+        self.enterContext(patch.object(ExportTransactionsView, "chunk_size", 2))
+
+    async def _get(self, **params):
+        await self.async_client.aforce_login(self.user)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            response = await self.async_client.get(reverse("export_transactions"), params)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual([str(w.message) for w in caught if "StreamingHttpResponse" in str(w.message)], [])
+        self.assertTrue(response.is_async)
+        return response, chunks
+
+    async def test_body_arrives_in_chunks_without_buffering(self):
+        _, chunks = await self._get()
+        # Header, then one chunk per page of rows
+        self.assertEqual(len(chunks), 4)
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+        expected = [t async for t in Transaction.objects.order_by("-date", "-id").values_list("title", flat=True)]
+        self.assertEqual([r[0] for r in rows[1:]], expected)
+
+    async def test_gzip(self):
+        response, chunks = await self._get(gzip="1")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        rows = list(csv.reader(io.StringIO(gzip.decompress(b"".join(chunks)).decode("utf-8"))))
+        self.assertEqual(len(rows), 6)
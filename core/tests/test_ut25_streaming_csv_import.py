@@ -0,0 +1,84 @@
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.csv_import import _iter_lines, import_transactions
+from core.models import MonthlyCategoryRollup, Transaction
+from core.tests.support import create_user
+
+
+def _upload(body, name="import.csv"):
+    return SimpleUploadedFile(name, body.encode("utf-8"), content_type="text/csv")
+
+
+class StreamingCsvImportTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    def test_import_normalizes_dates_and_reports_row_errors(self):
+        body = (
+            "﻿Title,Amount,Date,Category,Notes\n"
+            "Coffee,3.50,2026-03-02,Food,\n"
+            "Lunch,12,03/15/2026,Food,\"two\nlines\"\n"
+            ",5.00,2026-03-02,Food,\n"
+            "Taxi,abc,2026-03-02,Transport,\n"
+            "Bus,2.00,not a date,Transport,\n"
+            "Rent,900.00,2026-03-01,Housing,\n"
+        )
+        response = self.client.post(reverse("import_transactions"), {"file": _upload(body)}, format="multipart")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["imported"], 3)
+        self.assertEqual(response.data["skipped"], 3)
+        self.assertEqual(response.data["errors"], {"missing_title": 1, "invalid_amount": 1, "invalid_date": 1})
+        self.assertEqual([e["line"] for e in response.data["error_rows"]], [5, 6, 7])
+        self.assertIn("rows_per_second", response.data)
+
+        lunch = Transaction.objects.get(owner=self.user, title="Lunch")
+        self.assertEqual(lunch.date, date(2026, 3, 15))
+        self.assertEqual(lunch.amount, Decimal("12.00"))
+        self.assertEqual(lunch.notes, "two\nlines")
+        food = MonthlyCategoryRollup.objects.get(owner=self.user, month=date(2026, 3, 1), category="Food")
+        self.assertEqual((food.total, food.count), (Decimal("15.50"), 2))
+
+    def test_amount_that_rounds_out_of_range_is_a_row_error(self):
+        body = "Title,Amount,Date\nHuge,9999999999.995,2026-03-02\nMax,9999999999.99,2026-03-02\nBig,1e30,2026-03-02\n"
+        response = self.client.post(reverse("import_transactions"), {"file": _upload(body)}, format="multipart")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["imported"], 1)
+        self.assertEqual(response.data["errors"], {"invalid_amount": 2})
+
+    def test_missing_columns_and_bad_encoding_are_rejected(self):
+        response = self.client.post(reverse("import_transactions"), {"file": _upload("Name,Cost\nx,1\n")}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Amount", response.data["error"])
+
+        latin1 = SimpleUploadedFile("bad.csv", "Title,Amount,Date\nCafé,1,2026-01-01\n".encode("latin-1"))
+        response = self.client.post(reverse("import_transactions"), {"file": latin1}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Transaction.objects.filter(owner=self.user).exists())
+
+    def test_batches_span_chunk_boundaries(self):
+        rows = "".join(f"Item {i},1.00,2026-01-{i % 28 + 1:02d},Misc,\n" for i in range(250))
+        report = import_transactions(self.user, BytesIO(("Title,Amount,Date,Category,Notes\n" + rows).encode()), batch_size=40)
+
+        self.assertEqual(report["imported"], 250)
+        self.assertEqual(Transaction.objects.filter(owner=self.user).count(), 250)
+        rollup = MonthlyCategoryRollup.objects.get(owner=self.user, category="Misc")
+        self.assertEqual((rollup.total, rollup.count), (Decimal("250.00"), 250))
+
+    def test_line_iterator_handles_split_multibyte_characters(self):
+        data = "a,€\nb,€".encode("utf-8")
+        chunks = [data[:3], data[3:6], data[6:]]
+
+        class Chunked:
+            def chunks(self):
+                return iter(chunks)
+
+        self.assertEqual(list(_iter_lines(Chunked())), ["a,€\n", "b,€"])
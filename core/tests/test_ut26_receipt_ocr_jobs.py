@@ -0,0 +1,92 @@
+import io
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from core import ocr_jobs
+from core.models import ReceiptOCRJob
+from core.ocr_cache import reset_backend
+from core.ocr_pool import get_pool, reset_pool
+from core.tests.support import create_user
+
+RECEIPT_TEXT = "CORNER CAFE\nDate: 03/14/2026\nTOTAL $12.50\n"
+
+
+def _png():
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 20), "white").save(buf, format="PNG")
+    return SimpleUploadedFile("receipt.png", buf.getvalue(), content_type="image/png")
+
+
+@override_settings(LEDGER_AI_OCR_BACKEND="inline")
+class ReceiptOCRJobTests(APITestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        reset_pool()
+        self.addCleanup(reset_pool)
+        reset_backend()
+        self.addCleanup(reset_backend)
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    @patch("core.ocr.pytesseract.image_to_string", return_value=RECEIPT_TEXT)
+    def test_upload_returns_job_then_poll_returns_result(self, _ocr):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(reverse("receipt_ocr_jobs"), {"file": _png()}, format="multipart")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], ReceiptOCRJob.STATUS_PENDING)
+        self.assertIsNone(response.data["result"])
+        self.assertTrue(response["Location"].endswith(f"/api/receipts/jobs/{response.data['id']}/"))
+
+        # OCR only starts once the job row is committed
+        for callback in callbacks:
+            callback()
+
+        poll = self.client.get(reverse("receipt_ocr_job_detail", args=[response.data["id"]]))
+        self.assertEqual(poll.status_code, 200)
+        self.assertEqual(poll.data["status"], ReceiptOCRJob.STATUS_DONE)
+        self.assertEqual(poll.data["result"]["amount"], 12.5)
+        self.assertEqual(poll.data["result"]["date"], "2026-03-14")
+        self.assertIsNotNone(poll.data["finished_at"])
+
+    @patch("core.ocr.pytesseract.image_to_string", side_effect=RuntimeError("tesseract is not installed"))
+    def test_failed_job_reports_error(self, _ocr):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("receipt_ocr_jobs"), {"file": _png()}, format="multipart")
+
+        job = ReceiptOCRJob.objects.get(pk=response.data["id"])
+        self.assertEqual(job.status, ReceiptOCRJob.STATUS_FAILED)
+        self.assertIn("Tesseract OCR is not installed", job.error)
+
+    def test_rolled_back_upload_holds_no_pool_slot(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                ocr_jobs.submit(self.user, _png())
+                raise RuntimeError("request failed after the upload")
+
+        self.assertEqual(get_pool().stats()["in_flight"], 0)
+        self.assertFalse(ReceiptOCRJob.objects.exists())
+
+    def test_dispatch_failure_fails_the_job_and_frees_the_slot(self):
+        with patch("core.ocr_pool.Admission.submit", side_effect=RuntimeError("process pool is broken")):
+            with self.captureOnCommitCallbacks(execute=True):
+                job = ocr_jobs.submit(self.user, _png())
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (ReceiptOCRJob.STATUS_FAILED, "process pool is broken"))
+        self.assertEqual(get_pool().stats()["in_flight"], 0)
+
+    def test_jobs_are_private_to_their_owner(self):
+        job = ReceiptOCRJob.objects.create(owner=create_user(username="bob", email="bob@example.com"), image="receipts/ocr-jobs/x.png")
+        response = self.client.get(reverse("receipt_ocr_job_detail", args=[job.pk]))
+        self.assertEqual(response.status_code, 404)
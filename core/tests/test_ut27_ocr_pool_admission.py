@@ -0,0 +1,143 @@
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from core.ocr_cache import reset_backend
+from core.ocr_pool import OCRBusy, OCRPool, get_pool, reset_pool
+from core.tests.support import create_user
+
+
+class OCRPoolAdmissionTests(SimpleTestCase):
+    def test_per_user_cap_and_queue_bound(self):
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        pool = OCRPool(workers=1, max_pending=2, per_user=1, executor=executor)
+
+        first = pool.submit("alice", release.wait, 5)
+        with self.assertRaises(OCRBusy) as user_limit:
+            pool.submit("alice", release.wait, 5)
+        self.assertEqual(user_limit.exception.status_code, 429)
+
+        second = pool.submit("bob", release.wait, 5)
+        with self.assertRaises(OCRBusy) as queue_full:
+            pool.submit("carol", release.wait, 5)
+        self.assertEqual(queue_full.exception.status_code, 503)
+        self.assertGreaterEqual(queue_full.exception.retry_after, 1)
+
+        stats = pool.stats()
+        self.assertEqual((stats["in_flight"], stats["queue_depth"]), (2, 1))
+
+        release.set()
+        self.assertTrue(first.result(timeout=5))
+        self.assertTrue(second.result(timeout=5))
+
+        stats = pool.stats()
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["completed"], 2)
+        self.assertEqual((stats["rejected_user_limit"], stats["rejected_queue_full"]), (1, 1))
+        self.assertEqual(stats["ocr_wall_time_ms"]["samples"], 2)
+        # Slots are free again
+        pool.submit("carol", int, "7").result(timeout=5)
+
+    def test_failures_release_the_slot(self):
+        pool = OCRPool(workers=1, max_pending=1, per_user=1, executor=ThreadPoolExecutor(max_workers=1))
+        self.addCleanup(pool.executor.shutdown)
+        with self.assertRaises(ValueError):
+            pool.submit("alice", int, "not a number").result(timeout=5)
+        self.assertEqual(pool.submit("alice", int, "3").result(timeout=5), 3)
+        self.assertEqual(pool.stats()["failed"], 1)
+
+    def test_unused_admission_can_be_released(self):
+        pool = OCRPool(workers=1, max_pending=1, per_user=1, executor=ThreadPoolExecutor(max_workers=1))
+        self.addCleanup(pool.executor.shutdown)
+        admission = pool.admit("alice")
+        with self.assertRaises(OCRBusy):
+            pool.admit("bob")
+        admission.release()
+        pool.admit("bob").release()
+
+    def test_default_size_splits_cores_between_web_workers(self):
+        with patch("core.ocr_pool.os.cpu_count", return_value=8):
+            with patch.dict(os.environ, {"WEB_CONCURRENCY": "3"}):
+                self.assertEqual(OCRPool().workers, 2)
+            with patch.dict(os.environ, {"WEB_CONCURRENCY": "16"}):
+                self.assertEqual(OCRPool().workers, 1)
+            with patch.dict(os.environ, {"WEB_CONCURRENCY": ""}):
+                self.assertEqual(OCRPool().workers, 8)
+
+    def test_process_pool_does_not_fork_the_web_worker(self):
+        pool = OCRPool(workers=1)
+        self.addCleanup(pool.executor.shutdown)
+        self.assertIn(pool.executor._mp_context.get_start_method(), ("forkserver", "spawn"))
+        self.assertEqual(pool.submit("alice", int, "7").result(timeout=60), 7)
+
+    def test_dead_worker_is_replaced_with_a_fresh_pool(self):
+        pool = OCRPool(workers=1)
+        self.addCleanup(lambda: pool.executor.shutdown())
+        broken = pool.executor
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit("alice", os._exit, 1).result(timeout=60)  # the worker dies mid-job
+
+        self.assertEqual(pool.submit("alice", int, "7").result(timeout=60), 7)
+        self.assertIsNot(pool.executor, broken)
+        stats = pool.stats()
+        self.assertEqual((stats["failed"], stats["completed"], stats["in_flight"]), (1, 1, 0))
+
+    def test_submit_to_a_broken_pool_retries_on_a_fresh_one(self):
+        pool = OCRPool(workers=1)
+        self.addCleanup(lambda: pool.executor.shutdown())
+        pool.executor._broken = "a child process terminated abruptly"  # as if the callback hadn't run yet
+
+        self.assertEqual(pool.submit("alice", int, "7").result(timeout=60), 7)
+        self.assertEqual(pool.stats()["in_flight"], 0)
+
+
+# Identical uploads would be cache hits and never reach the pool
+@override_settings(LEDGER_AI_OCR_BACKEND="inline", LEDGER_AI_OCR_PER_USER=1, LEDGER_AI_OCR_CACHE="off")
+class ReceiptUploadBackpressureTests(APITestCase):
+    def setUp(self):
+        reset_pool()
+        self.addCleanup(reset_pool)
+        reset_backend()
+        self.addCleanup(reset_backend)
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    def _upload(self):
+        buf = io.BytesIO()
+        Image.new("RGB", (40, 20), "white").save(buf, format="PNG")
+        return {"file": SimpleUploadedFile("receipt.png", buf.getvalue(), content_type="image/png")}
+
+    @patch("core.ocr.pytesseract.image_to_string", return_value="SHOP\nTOTAL $5.00\n")
+    def test_upload_is_rejected_with_retry_after_when_user_is_at_cap(self, _ocr):
+        ok = self.client.post(reverse("upload_receipt"), self._upload(), format="multipart")
+        self.assertEqual(ok.status_code, 200)
+        self.assertEqual(ok.data["amount"], 5.0)
+
+        held = get_pool().admit(self.user.id)  # another upload still in flight
+        self.addCleanup(held.release)
+        busy = self.client.post(reverse("upload_receipt"), self._upload(), format="multipart")
+        self.assertEqual(busy.status_code, 429)
+        self.assertEqual(busy.data["reason"], OCRBusy.USER_LIMIT)
+        self.assertGreaterEqual(int(busy["Retry-After"]), 1)
+
+        job = self.client.post(reverse("receipt_ocr_jobs"), self._upload(), format="multipart")
+        self.assertEqual(job.status_code, 429)
+
+    def test_metrics_are_staff_only(self):
+        self.assertEqual(self.client.get(reverse("ocr_metrics")).status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse("ocr_metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["per_user_limit"], 1)
@@ -0,0 +1,128 @@
+import io
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from core.models import MonthlyCategoryRollup, Transaction
+from core import ocr_cache
+from core.ocr_cache import reset_backend
+from core.ocr_pool import reset_pool
+from core.tests.support import create_user
+
+
+def _png_bytes(color):
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 20), color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+RECEIPTS = {
+    "white": "CORNER CAFE\nDate: 03/14/2026\nTOTAL $12.50\n",
+    "black": "CITY MARKET\nDate: 03/15/2026\nTOTAL $40.00\n",
+    "red": "smudged",
+}
+
+
+def _fake_ocr(image, config=None):
+    # preprocess converts to grayscale; map the gray level back to our fixtures
+    level = image.getpixel((0, 0))
+    return {255: RECEIPTS["white"], 0: RECEIPTS["black"]}.get(level, RECEIPTS["red"])
+
+
+@override_settings(LEDGER_AI_OCR_BACKEND="inline", LEDGER_AI_OCR_PER_USER=2)
+@patch("core.ocr.pytesseract.image_to_string", side_effect=_fake_ocr)
+class ReceiptBatchUploadTests(APITestCase):
+    def setUp(self):
+        self.media_root = media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        reset_pool()
+        self.addCleanup(reset_pool)
+        reset_backend()
+        self.addCleanup(reset_backend)
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    def test_files_and_zip_are_processed_in_order(self, _ocr):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("scans/b.png", _png_bytes("black"))
+            zf.writestr("scans/notes.txt", "ignored")
+            zf.writestr("scans/c.png", _png_bytes("red"))
+        files = [
+            SimpleUploadedFile("a.png", _png_bytes("white"), content_type="image/png"),
+            SimpleUploadedFile("scans.zip", archive.getvalue(), content_type="application/zip"),
+        ]
+
+        response = self.client.post(reverse("receipt_batch_upload"), {"files": files}, format="multipart")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["filename"] for r in response.data["results"]], ["a.png", "b.png", "c.png"])
+        self.assertEqual([r["data"]["amount"] for r in response.data["results"][:2]], [12.5, 40.0])
+        self.assertEqual(response.data["processed"], 3)
+        self.assertEqual(response.data["created"], 0)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_create_transactions_in_one_bulk_insert(self, _ocr):
+        files = [
+            SimpleUploadedFile(f"{color}.png", _png_bytes(color), content_type="image/png")
+            for color in ("white", "black", "red")
+        ]
+        response = self.client.post(
+            reverse("receipt_batch_upload"), {"files": files, "create_transactions": "1"}, format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 2)
+        ids = [r["transaction_id"] for r in response.data["results"]]
+        self.assertIsNone(ids[2])  # no amount parsed, nothing created
+
+        txns = Transaction.objects.filter(pk__in=ids[:2]).order_by("date")
+        self.assertEqual([t.amount for t in txns], [Decimal("12.50"), Decimal("40.00")])
+        self.assertEqual(txns[0].date, date(2026, 3, 14))
+        self.assertTrue(all(t.receipt_image.name.startswith("receipts/") for t in txns))
+        self.assertEqual(
+            sum(r.total for r in MonthlyCategoryRollup.objects.filter(owner=self.user)), Decimal("52.50"),
+        )
+
+    def test_failed_insert_removes_stored_images(self, _ocr):
+        files = [SimpleUploadedFile(f"{color}.png", _png_bytes(color)) for color in ("white", "black")]
+        with patch("core.rollups.record_created", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                self.client.post(
+                    reverse("receipt_batch_upload"), {"files": files, "create_transactions": "1"}, format="multipart",
+                )
+
+        self.assertFalse(Transaction.objects.exists())
+        self.assertEqual([p for p in Path(self.media_root).rglob("*") if p.is_file()], [])
+
+    @override_settings(LEDGER_AI_OCR_TIMEOUT=5)
+    def test_whole_batch_shares_one_deadline(self, _ocr):
+        files = [
+            SimpleUploadedFile(f"{color}.png", _png_bytes(color), content_type="image/png")
+            for color in ("white", "black", "red")
+        ]
+        with patch("core.ocr_cache.submit_many", wraps=ocr_cache.submit_many) as submit_many:
+            response = self.client.post(reverse("receipt_batch_upload"), {"files": files}, format="multipart")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(submit_many.call_args.kwargs["timeout"], 5)
+
+    def test_rejects_empty_and_oversized_batches(self, _ocr):
+        response = self.client.post(reverse("receipt_batch_upload"), {}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+        files = [SimpleUploadedFile(f"{i}.png", _png_bytes("white")) for i in range(3)]
+        with patch("core.views.ReceiptBatchUploadView.max_files", 2):
+            response = self.client.post(reverse("receipt_batch_upload"), {"files": files}, format="multipart")
+        self.assertEqual(response.status_code, 400)
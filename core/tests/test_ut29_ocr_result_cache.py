@@ -0,0 +1,151 @@
+import io
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from core import ocr_cache
+from core.models import ReceiptOCRJob
+from core.ocr_cache import DiskBackend, MemoryBackend, reset_backend
+from core.ocr_pool import reset_pool
+from core.tests.support import create_user
+
+RECEIPT_TEXT = "CORNER CAFE\nDate: 03/14/2026\nTOTAL $12.50\n"
+
+
+def _png(color="white"):
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 20), color).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class CacheBackendTests(SimpleTestCase):
+    def test_memory_backend_evicts_least_recently_used(self):
+        backend = MemoryBackend(max_entries=2, ttl=0)
+        backend.set("a", {"n": 1})
+        backend.set("b", {"n": 2})
+        backend.get("a")
+        backend.set("c", {"n": 3})
+
+        self.assertEqual(backend.get("a"), {"n": 1})
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("c"), {"n": 3})
+
+    def test_memory_backend_expires_entries(self):
+        backend = MemoryBackend(ttl=60)
+        with patch("core.ocr_cache.time.time", return_value=1000):
+            backend.set("a", {"n": 1})
+        with patch("core.ocr_cache.time.time", return_value=1061):
+            self.assertIsNone(backend.get("a"))
+
+    def test_disk_backend_round_trips_and_prunes(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        backend = DiskBackend(root, max_entries=1, ttl=0)
+        backend.set("aa11", {"text": "x", "parsed": {"amount": 1.0}})
+
+        self.assertEqual(DiskBackend(root).get("aa11"), {"text": "x", "parsed": {"amount": 1.0}})
+        self.assertIsNone(backend.get("bb22"))
+
+        backend.set("bb22", {"text": "y", "parsed": {}})
+        backend.prune()
+        self.assertEqual(len(list(backend.root.glob("*/*.json"))), 1)
+
+
+@override_settings(LEDGER_AI_OCR_BACKEND="inline")
+@patch("core.ocr.pytesseract.image_to_string", return_value=RECEIPT_TEXT)
+class ReceiptOCRCacheTests(APITestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        reset_pool()
+        self.addCleanup(reset_pool)
+        reset_backend()
+        self.addCleanup(reset_backend)
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    def _upload(self, data):
+        return self.client.post(
+            reverse("upload_receipt"),
+            {"file": SimpleUploadedFile("receipt.png", data, content_type="image/png")},
+            format="multipart",
+        )
+
+    def test_duplicate_upload_is_served_from_cache(self, ocr_mock):
+        first = self._upload(_png())
+        second = self._upload(_png())
+
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.data["cache_hit"])
+        self.assertTrue(second.data["cache_hit"])
+        self.assertEqual(second.data["amount"], first.data["amount"])
+        self.assertEqual(second.data["raw_text"], first.data["raw_text"])
+        self.assertEqual(ocr_mock.call_count, 1)
+
+    def test_different_images_are_not_shared(self, ocr_mock):
+        self._upload(_png("white"))
+        response = self._upload(_png("black"))
+
+        self.assertFalse(response.data["cache_hit"])
+        self.assertEqual(ocr_mock.call_count, 2)
+
+    @override_settings(LEDGER_AI_OCR_CACHE="disk")
+    def test_disk_cache_survives_a_new_backend(self, ocr_mock):
+        self._upload(_png())
+        reset_backend()
+
+        response = self._upload(_png())
+
+        self.assertTrue(response.data["cache_hit"])
+        self.assertEqual(ocr_mock.call_count, 1)
+
+    @override_settings(LEDGER_AI_OCR_CACHE="off")
+    def test_cache_can_be_disabled(self, ocr_mock):
+        self._upload(_png())
+        response = self._upload(_png())
+
+        self.assertFalse(response.data["cache_hit"])
+        self.assertEqual(ocr_mock.call_count, 2)
+
+    def test_batch_runs_duplicates_once(self, ocr_mock):
+        files = [SimpleUploadedFile(f"r{i}.png", _png(), content_type="image/png") for i in range(3)]
+
+        response = self.client.post(reverse("receipt_batch_upload"), {"files": files}, format="multipart")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["data"]["cache_hit"] for r in response.data["results"]], [False, True, True])
+        self.assertEqual(ocr_mock.call_count, 1)
+
+    def test_cached_job_is_done_on_submit(self, ocr_mock):
+        self._upload(_png())
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(
+                reverse("receipt_ocr_jobs"),
+                {"file": SimpleUploadedFile("receipt.png", _png(), content_type="image/png")},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(callbacks, [])
+        job = ReceiptOCRJob.objects.get(pk=response.data["id"])
+        self.assertEqual(job.status, ReceiptOCRJob.STATUS_DONE)
+        self.assertTrue(job.result["cache_hit"])
+        self.assertEqual(ocr_mock.call_count, 1)
+
+    def test_job_result_populates_cache(self, ocr_mock):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("receipt_ocr_jobs"),
+                {"file": SimpleUploadedFile("receipt.png", _png(), content_type="image/png")},
+                format="multipart",
+            )
+
+        self.assertIsNotNone(ocr_cache.lookup(_png())[1])
@@ -0,0 +1,51 @@
+import io
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from PIL import Image, ImageEnhance, ImageStat
+
+from core import ocr
+
+
+def _open(size, fmt="JPEG", mode="RGB"):
+    buf = io.BytesIO()
+    Image.new(mode, size, "white" if mode == "RGB" else 200).save(buf, format=fmt)
+    return Image.open(io.BytesIO(buf.getvalue()))
+
+
+class PreprocessImageTests(SimpleTestCase):
+    def test_phone_photo_is_capped_and_draft_decoded_in_grayscale(self):
+        image = _open((4032, 3024))
+        with patch.object(image, "draft", wraps=image.draft) as draft:
+            out = ocr.preprocess_image(image)
+
+        draft.assert_called_once_with("L", (2000, 1500))
+        self.assertEqual(out.mode, "L")
+        self.assertEqual(out.size, (2000, 1500))
+
+    def test_small_scan_is_upscaled_to_minimum_side(self):
+        out = ocr.preprocess_image(_open((400, 600), fmt="PNG"))
+
+        self.assertEqual(out.mode, "L")
+        self.assertEqual(out.size, (800, 1200))
+
+    def test_narrow_till_roll_keeps_a_legible_width(self):
+        # Over the pixel budget, but shrinking to it would leave the roll 707 px wide
+        self.assertEqual(ocr.preprocess_image(_open((1000, 6000), fmt="PNG")).size, (800, 4800))
+        self.assertEqual(ocr.preprocess_image(_open((800, 8000), fmt="PNG")).size, (800, 8000))
+        self.assertEqual(ocr.preprocess_image(_open((300, 1800), fmt="PNG")).size, (800, 4800))
+
+    def test_large_image_is_shrunk_to_the_pixel_budget(self):
+        out = ocr.preprocess_image(_open((3000, 4000)))
+
+        self.assertEqual(out.size, (1500, 2000))
+        self.assertLessEqual(out.size[0] * out.size[1], ocr.MAX_OCR_PIXELS)
+
+    def test_contrast_table_matches_image_enhance(self):
+        image = Image.linear_gradient("L").resize((256, 64))
+        mean = int(ImageStat.Stat(image).mean[0] + 0.5)
+
+        expected = ImageEnhance.Contrast(image).enhance(ocr.CONTRAST_FACTOR)
+        actual = image.point(ocr._contrast_table(mean, ocr.CONTRAST_FACTOR))
+
+        self.assertEqual(list(actual.getdata()), list(expected.getdata()))
@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.ai_service import (
+    _extract_amount_regex,
+    _extract_date_regex,
+    _normalize_date,
+    _refine_category_with_keywords,
+)
+from core.receipt_extractor import EXTRACTOR
+
+RECEIPT = """CORNER CAFE
+Exp 01/31/2027
+Printed 03/02/2026 09:15
+Invoice Date: 2026-03-14
+Receipt Date: 13/45/2026
+LATTE            4.50
+TAX              1.08
+GRAND TOTAL $ 13.50
+"""
+
+
+class ReceiptExtractorTests(SimpleTestCase):
+    def test_labelled_total_wins_over_larger_numbers(self):
+        self.assertEqual(_extract_amount_regex("CARD 4417.00\nTOTAL: $12.50\n"), 12.5)
+        self.assertEqual(_extract_amount_regex("Amount 7.25\nTotal 0.00\n"), 7.25)
+        self.assertEqual(_extract_amount_regex("LATTE 4.50\nMUFFIN $3.25\n"), 4.5)
+
+    def test_date_priority_skips_invalid_candidates(self):
+        # The receipt-date label is invalid, so the invoice label wins over the timestamp
+        self.assertEqual(_extract_date_regex(RECEIPT), "2026-03-14")
+        self.assertEqual(_extract_date_regex("Printed 03/02/2026 09:15\nDate: 3 Mar 2026"), "2026-03-03")
+        self.assertEqual(_extract_date_regex("CAFE\n03/02/2026 09:15\n"), "2026-03-02")
+
+    def test_bare_dates_fall_back_to_document_search(self):
+        text = "CAFE\n" + "ITEM 1.00\n" * 80 + "Thank you 21 Dec 2025\n"
+        self.assertEqual(_extract_date_regex(text), "2025-12-21")
+        self.assertIsNone(_extract_date_regex("no dates here"))
+
+    def test_normalize_date_formats(self):
+        self.assertEqual(_normalize_date("25/12/2025"), "2025-12-25")
+        self.assertEqual(_normalize_date("02/03/2025"), "2025-02-03")
+        self.assertEqual(_normalize_date("02/15/24"), "2024-02-15")
+        self.assertEqual(_normalize_date("2025/7/4"), "2025-07-04")
+        self.assertEqual(_normalize_date("१५/०१/२०८२"), _normalize_date("15/01/2082"))
+
+    def test_pattern_categories_follow_priority_order(self):
+        # Healthcare is listed before Entertainment, whatever the word order
+        self.assertEqual(EXTRACTOR.pattern_category("movie after the doctor"), "Healthcare")
+        self.assertEqual(_refine_category_with_keywords("Monthly refund"), "Income")
+        self.assertEqual(EXTRACTOR.pattern_category("zzz"), None)
+
+    def test_relative_dates(self):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        self.assertEqual(EXTRACTOR.relative_date("paid 20 yesterday"), yesterday)
+        self.assertEqual(EXTRACTOR.relative_date("हिजो खाना"), yesterday)
+
+    def test_extraction_compiles_no_patterns(self):
+        with patch("re._compile", side_effect=AssertionError("pattern compiled at call time")):
+            self.assertEqual(_extract_amount_regex(RECEIPT), 13.5)
+            self.assertEqual(_extract_date_regex(RECEIPT), "2026-03-14")
+            self.assertEqual(EXTRACTOR.voice_amount("spent Rs 250 on momo"), 250.0)
@@ -0,0 +1,78 @@
+from datetime import date
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.ai_service import _refine_category_with_keywords
+from core.categorizer import KeywordCategorizer, get_categorizer, reset_categorizer
+from core.models import Transaction
+from core.tests.support import create_user
+
+
+class KeywordCategorizerTests(SimpleTestCase):
+    def test_first_listed_category_wins_regardless_of_position(self):
+        categorizer = KeywordCategorizer({"Food": ["pizza"], "Travel": ["hotel", "pizzahotel"]})
+
+        self.assertEqual(categorizer.categorize("HOTEL lobby PIZZA"), "Food")
+        self.assertEqual(categorizer.categorize("pizzahotel"), "Food")
+        self.assertEqual(categorizer.categorize("grand hotel"), "Travel")
+        self.assertIsNone(categorizer.categorize("nothing here"))
+
+    def test_overlapping_keywords_use_fail_links(self):
+        # "she" must be found inside "ushers" after the "hers"/"his" branches fail
+        categorizer = KeywordCategorizer({"A": ["hers"], "B": ["his"], "C": ["she"]})
+
+        self.assertEqual(categorizer.categorize("ushe"), "C")
+        self.assertEqual(categorizer.categorize("ushers"), "A")
+        self.assertEqual(categorizer.categorize("this"), "B")
+
+    def test_earlier_tiers_take_precedence(self):
+        categorizer = KeywordCategorizer({"Groceries": ["bar"]}, {"Food & Dining": ["bar"], "Travel": ["inn"]})
+
+        self.assertEqual(categorizer.categorize("Candy Bar Inn"), "Groceries")
+
+    def test_matches_the_builtin_keyword_order(self):
+        reset_categorizer()
+        self.addCleanup(reset_categorizer)
+
+        self.assertEqual(_refine_category_with_keywords("Starbucks Coffee"), "Food & Dining")
+        self.assertEqual(_refine_category_with_keywords("Walmart Supercenter"), "Groceries")
+        self.assertEqual(_refine_category_with_keywords("Random words"), "Other")
+
+    @override_settings(LEDGER_AI_CATEGORY_KEYWORDS={"Groceries": ["kirana"], "Travel": ["starbucks"]})
+    def test_site_keywords_are_loaded_from_settings(self):
+        reset_categorizer()
+        self.addCleanup(reset_categorizer)
+
+        self.assertEqual(get_categorizer().categorize("Ram Kirana Pasal"), "Groceries")
+        self.assertEqual(get_categorizer().categorize("Starbucks airport"), "Travel")
+
+
+class BulkCategorizeTests(APITestCase):
+    def setUp(self):
+        reset_categorizer()
+        self.addCleanup(reset_categorizer)
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    def test_uncategorized_transactions_are_assigned(self):
+        today = date.today()
+        uber = Transaction.objects.create(owner=self.user, title="Uber trip", amount="9.00", date=today, category="Other")
+        mystery = Transaction.objects.create(owner=self.user, title="ZX-11", amount="3.00", date=today, category="")
+        notes = Transaction.objects.create(
+            owner=self.user, title="Card payment", amount="5.00", date=today, category="", notes="pharmacy",
+        )
+
+        response = self.client.post(reverse("bulk_categorize"), {}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_checked"], 3)
+        self.assertEqual(response.data["updated_count"], 2)
+        uber.refresh_from_db()
+        mystery.refresh_from_db()
+        notes.refresh_from_db()
+        self.assertEqual(uber.category, "Transportation")
+        self.assertEqual(mystery.category, "")
+        # "payment" is an Income keyword, listed after Healthcare
+        self.assertEqual(notes.category, "Healthcare")
@@ -0,0 +1,87 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.categorizer import recategorize, reset_categorizer
+from core.models import MonthlyCategoryRollup, Transaction
+from core.rollups import rebuild
+from core.tests.support import create_user
+
+
+def _rollups(user):
+    return {
+        (r.month, r.category): (r.total, r.count)
+        for r in MonthlyCategoryRollup.objects.filter(owner=user).exclude(count=0)
+    }
+
+
+class RecategorizeTests(TestCase):
+    def setUp(self):
+        reset_categorizer()
+        self.addCleanup(reset_categorizer)
+        self.user = create_user()
+
+    def _bulk(self, titles, category="Other"):
+        Transaction.objects.bulk_create(
+            Transaction(owner=self.user, title=title, amount="2.50", date=date(2026, 1 + i % 3, 5), category=category)
+            for i, title in enumerate(titles)
+        )
+        rebuild([self.user.id])
+
+    def test_batches_update_once_per_category_with_exact_tallies(self):
+        self._bulk(["Uber ride", "Pizza place", "Mystery", "Metro card", "Cafe"] * 20)
+
+        with CaptureQueriesContext(connection) as ctx:
+            report = recategorize(Transaction.objects.filter(owner=self.user), batch_size=25)
+
+        txn_queries = [q["sql"].split(" ", 1)[0] for q in ctx.captured_queries if '"core_transaction"' in q["sql"]]
+        # Per batch of 25: one SELECT and one UPDATE per new category; then the empty SELECT that ends the scan
+        self.assertEqual(txn_queries, ["SELECT", "UPDATE", "UPDATE"] * 4 + ["SELECT"])
+
+        self.assertEqual(report["total_checked"], 100)
+        self.assertEqual(report["updated_count"], 80)
+        self.assertEqual(report["categories"], {"Transportation": 40, "Food & Dining": 40})
+        self.assertEqual(Transaction.objects.filter(category="Transportation").count(), 40)
+        self.assertEqual(Transaction.objects.filter(category="Other").count(), 20)
+
+    def test_rollups_follow_the_new_categories(self):
+        self._bulk(["Uber ride", "Mystery", "Grocery store run"])
+
+        recategorize(Transaction.objects.filter(owner=self.user))
+
+        incremental = _rollups(self.user)
+        rebuild([self.user.id])
+        self.assertEqual(incremental, _rollups(self.user))
+        self.assertEqual(incremental[(date(2026, 1, 1), "Transportation")], (Decimal("2.50"), 1))
+
+    def test_rows_already_in_their_category_are_not_rewritten(self):
+        self._bulk(["Uber ride"], category="Transportation")
+
+        report = recategorize(Transaction.objects.filter(owner=self.user))
+
+        self.assertEqual(report["updated_count"], 0)
+        self.assertEqual(report["categories"], {})
+
+
+class BulkCategorizeViewTests(APITestCase):
+    def setUp(self):
+        reset_categorizer()
+        self.addCleanup(reset_categorizer)
+        self.user = create_user()
+        self.client.force_authenticate(user=self.user)
+
+    def test_response_reports_per_category_counts(self):
+        for title in ("Netflix", "Spotify", "ZX-11"):
+            Transaction.objects.create(owner=self.user, title=title, amount="9.99", date=date(2026, 2, 1), category="")
+
+        response = self.client.post(reverse("bulk_categorize"), {}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_checked"], 3)
+        self.assertEqual(response.data["updated_count"], 2)
+        self.assertEqual(response.data["categories"], {"Entertainment": 2})
@@ -0,0 +1,112 @@
+import io
+from datetime import date
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from core import ai_service
+from core.categorizer import recategorize, reset_categorizer
+from core.csv_import import import_transactions
+from core.models import Transaction
+from core.tests.support import create_user
+
+
+class FakeFinBERT:
+    """Records pipeline calls; 'windfall' reads positive, 'fee' negative, anything else neutral."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append((list(inputs), kwargs))
+        if self.fail:
+            raise RuntimeError("model exploded")
+        return [[{"label": self.label(text), "score": 0.9}] for text in inputs]
+
+    @staticmethod
+    def label(text):
+        if "windfall" in text:
+            return "Positive"
+        if "fee" in text:
+            return "Negative"
+        return "Neutral"
+
+
+class CategorizeManyTests(TestCase):
+    def setUp(self):
+        reset_categorizer()
+        self.addCleanup(reset_categorizer)
+        self.fake = FakeFinBERT()
+        patcher = patch("core.ai_service.get_finbert_classifier", return_value=self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_pipeline_call_for_keyword_misses_longest_first(self):
+        texts = ["Uber ride", "windfall", "", "late fee on account", "xyz", "Pizza"]
+
+        result = ai_service.categorize_many(texts, batch_size=8)
+
+        self.assertEqual(result, ["Transportation", "Income", "Other", "Bills & Utilities", "Other", "Food & Dining"])
+        self.assertEqual(len(self.fake.calls), 1)
+        inputs, kwargs = self.fake.calls[0]
+        self.assertEqual(inputs, ["late fee on account", "windfall", "xyz"])
+        self.assertEqual(kwargs, {"batch_size": 8, "truncation": True, "max_length": ai_service.FINBERT_MAX_TOKENS})
+
+    def test_single_text_matches_batch(self):
+        texts = ["Uber ride", "windfall", "late fee", "nothing here", "   "]
+        self.assertEqual([ai_service.categorize_transaction_ai(t) for t in texts], ai_service.categorize_many(texts))
+
+    def test_inference_error_falls_back_to_keywords(self):
+        self.fake.fail = True
+        self.assertEqual(ai_service.categorize_many(["Uber ride", "windfall"]), ["Transportation", "Other"])
+
+    def test_no_model_uses_keywords_only(self):
+        with patch("core.ai_service.get_finbert_classifier", return_value=None):
+            self.assertEqual(ai_service.categorize_many(["Uber ride", "windfall"]), ["Transportation", "Other"])
+
+    def test_all_keyword_hits_skip_the_model(self):
+        ai_service.categorize_many(["Uber ride", "Pizza"])
+        self.assertEqual(self.fake.calls, [])
+
+
+class BulkPathsUseBatchedModelTests(TestCase):
+    def setUp(self):
+        reset_categorizer()
+        self.addCleanup(reset_categorizer)
+        self.user = create_user()
+        self.fake = FakeFinBERT()
+        patcher = patch("core.ai_service.get_finbert_classifier", return_value=self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_recategorize_with_model_calls_pipeline_once_per_batch(self):
+        Transaction.objects.bulk_create(
+            Transaction(owner=self.user, title=title, amount="5.00", date=date(2026, 1, 5), category="Other")
+            for title in ["Uber ride", "windfall", "late fee", "mystery"] * 5
+        )
+
+        report = recategorize(Transaction.objects.filter(owner=self.user), batch_size=10, use_model=True)
+
+        self.assertEqual(len(self.fake.calls), 2)
+        self.assertEqual(report["categories"], {"Transportation": 5, "Income": 5, "Bills & Utilities": 5})
+        self.assertEqual(Transaction.objects.filter(category="Other").count(), 5)
+
+    def test_recategorize_without_model_never_loads_it(self):
+        Transaction.objects.create(owner=self.user, title="windfall", amount="5.00", date=date(2026, 1, 5))
+        recategorize(Transaction.objects.filter(owner=self.user))
+        self.assertEqual(self.fake.calls, [])
+
+    def test_csv_import_fills_blank_categories_per_batch(self):
+        rows = ["Title,Amount,Date,Category"] + [
+            f"{title},1.00,2026-01-0{i % 9 + 1},{category}"
+            for i, (title, category) in enumerate([("windfall", ""), ("late fee", ""), ("Uber", ""), ("windfall", "Gifts")] * 3)
+        ]
+        data = io.BytesIO(("\n".join(rows) + "\n").encode())
+
+        report = import_transactions(self.user, data, batch_size=4, categorize=True)
+
+        self.assertEqual(report["imported"], 12)
+        self.assertEqual(len(self.fake.calls), 3)
+        categories = sorted(Transaction.objects.values_list("category", flat=True))
+        self.assertEqual(categories, sorted(["Income", "Bills & Utilities", "Transportation", "Gifts"] * 3))
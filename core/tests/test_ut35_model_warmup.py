@@ -0,0 +1,105 @@
+import gc
+import sys
+import threading
+import types
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import ai_service, model_warmup
+
+
+class FakeFinBERT:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append(list(inputs))
+        return [[{"label": "Positive", "score": 0.9}] for _ in inputs]
+
+
+def _spacy_missing_model(name, **kwargs):
+    raise OSError(f"[E050] Can't find model '{name}'")
+
+
+@override_settings(LEDGER_AI_WARMUP=True)
+class ModelWarmupTests(TestCase):
+    def setUp(self):
+        model_warmup.reset()
+        self.addCleanup(model_warmup.reset)
+
+        self.loading = threading.Event()
+        self.release = threading.Event()
+        # Runs before reset() above, so a failing test doesn't leave reset() waiting
+        self.addCleanup(self.release.set)
+        self.model = FakeFinBERT()
+
+        def pipeline(*args, **kwargs):
+            self.loading.set()
+            self.release.wait(5)
+            return self.model
+
+        modules = {
+            "transformers": types.SimpleNamespace(pipeline=pipeline),
+            "spacy": types.SimpleNamespace(load=_spacy_missing_model),
+        }
+        for patcher in (
+            patch.dict(sys.modules, modules),
+            patch.object(ai_service, "_finbert_classifier", None),
+            patch.object(ai_service, "_spacy_nlp", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def test_requests_use_keywords_until_model_is_warm(self):
+        self.assertTrue(model_warmup.start())
+        self.assertTrue(self.loading.wait(5))
+
+        # FinBERT is mid-load: no blocking, keyword fallback, not ready
+        self.assertEqual(ai_service.categorize_transaction_ai("windfall"), "Other")
+        self.assertEqual(self.client.get(reverse("health_ready")).status_code, 503)
+        self.assertEqual(self.client.get(reverse("health")).data["models"]["finbert"]["state"], "loading")
+
+        self.release.set()
+        self.assertTrue(model_warmup.wait(5))
+
+        response = self.client.get(reverse("health_ready"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["models"]["finbert"]["state"], "ready")
+        self.assertEqual(response.data["models"]["spacy"]["state"], "unavailable")
+        self.assertIsNotNone(response.data["models"]["finbert"]["load_ms"])
+        # One dummy inference during warm-up, then real traffic
+        self.assertEqual(len(self.model.calls), 1)
+        self.assertEqual(ai_service.categorize_transaction_ai("windfall"), "Income")
+
+    def test_starts_once_per_process(self):
+        self.release.set()
+        self.assertTrue(model_warmup.start())
+        self.assertFalse(model_warmup.start())
+        model_warmup.wait(5)
+
+    def test_preload_loads_without_inference_then_worker_start_is_quick(self):
+        self.release.set()
+        self.addCleanup(gc.unfreeze)
+
+        self.assertEqual(model_warmup.preload(), ["finbert"])
+        self.assertIs(ai_service._finbert_classifier, self.model)
+        # No inference before fork; the worker's warm-up does the dummy call
+        self.assertEqual(self.model.calls, [])
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        model_warmup.start()
+        self.assertTrue(model_warmup.wait(5))
+        self.assertEqual(model_warmup.status()["models"]["finbert"]["state"], "ready")
+        self.assertEqual(len(self.model.calls), 1)
+
+    @override_settings(LEDGER_AI_WARMUP=False)
+    def test_disabled_leaves_models_cold_and_ready(self):
+        self.assertFalse(model_warmup.start())
+        response = self.client.get(reverse("health_ready"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["models"]["finbert"], {"state": "cold", "load_ms": None})
+        self.assertFalse(self.loading.is_set())
@@ -0,0 +1,112 @@
+import sys
+import types
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core import ai_service
+
+
+class FakeEnt:
+    def __init__(self, text, source, label):
+        self.text = text
+        self.label_ = label
+        self.start_char = source.index(text)
+        self.end_char = self.start_char + len(text)
+
+
+class FakeNLP:
+    """Tags 'Acme Corp' as ORG and 'Rs 250' as MONEY; records how it was called."""
+
+    def __init__(self, pipe_names, listeners=()):
+        self.pipe_names = list(pipe_names)
+        self.listeners = list(listeners)
+        self.calls = []
+        self.pipe_calls = []
+        self.fail = False
+
+    def get_pipe(self, name):
+        return types.SimpleNamespace(listening_components=self.listeners)
+
+    def remove_pipe(self, name):
+        self.pipe_names.remove(name)
+
+    def _doc(self, text):
+        if self.fail:
+            raise RuntimeError("bad doc")
+        found = [(t, label) for t, label in (("Acme Corp", "ORG"), ("Rs 250", "MONEY")) if t in text]
+        return types.SimpleNamespace(ents=[FakeEnt(t, text, label) for t, label in found])
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return self._doc(text)
+
+    def pipe(self, texts, batch_size, n_process):
+        texts = list(texts)
+        self.pipe_calls.append((texts, batch_size, n_process))
+        return (self._doc(text) for text in texts)
+
+
+class TrimmedSpacyLoadTests(SimpleTestCase):
+    def _load(self, nlp):
+        loads = []
+
+        def load(name, exclude=()):
+            loads.append((name, list(exclude)))
+            return nlp
+
+        with patch.dict(sys.modules, {"spacy": types.SimpleNamespace(load=load)}), \
+                patch.object(ai_service, "_spacy_nlp", None):
+            return ai_service.get_spacy_nlp(), loads
+
+    def test_loads_ner_only_and_drops_unused_tok2vec(self):
+        nlp, loads = self._load(FakeNLP(["tok2vec", "ner"]))
+        self.assertEqual(loads, [("en_core_web_sm", ai_service.SPACY_EXCLUDE)])
+        self.assertIn("parser", ai_service.SPACY_EXCLUDE)
+        self.assertEqual(nlp.pipe_names, ["ner"])
+
+    def test_keeps_tok2vec_when_ner_listens_to_it(self):
+        nlp, _ = self._load(FakeNLP(["tok2vec", "ner"], listeners=["ner"]))
+        self.assertEqual(nlp.pipe_names, ["tok2vec", "ner"])
+
+
+class ExtractEntitiesManyTests(SimpleTestCase):
+    TEXTS = [
+        "Acme Corp\nTotal Rs 250\nDate: 2026-03-14",
+        "CORNER CAFE\nLATTE 4.50\nTOTAL 4.50",
+        "",
+    ]
+
+    def setUp(self):
+        self.nlp = FakeNLP(["ner"])
+        patcher = patch("core.ai_service.get_spacy_nlp", return_value=self.nlp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_pipe_call_matching_single_extraction(self):
+        batched = ai_service.extract_entities_many(self.TEXTS, batch_size=16)
+
+        self.assertEqual(len(self.nlp.pipe_calls), 1)
+        self.assertEqual(self.nlp.pipe_calls[0][1:], (16, 1))
+        self.assertEqual(batched, [ai_service.extract_entities_from_text(t) for t in self.TEXTS])
+        self.assertEqual(batched[0]["merchant"], "Acme Corp")
+        self.assertEqual(batched[0]["amount"], 250.0)
+        self.assertEqual(batched[1]["merchant"], "CORNER CAFE")
+
+    def test_pipe_failure_falls_back_to_regex(self):
+        self.nlp.fail = True
+        batched = ai_service.extract_entities_many(self.TEXTS[:2])
+        self.assertEqual([e["merchant"] for e in batched], ["Acme Corp", "CORNER CAFE"])
+        self.assertEqual(batched[1]["amount"], 4.5)
+
+    def test_empty_input_skips_spacy(self):
+        self.assertEqual(ai_service.extract_entities_many([]), [])
+        self.assertEqual(self.nlp.pipe_calls, [])
+
+    def test_receipt_batch_parses_in_one_pipe_call(self):
+        with patch("core.ai_service.get_finbert_classifier", return_value=None):
+            batched = ai_service.parse_receipt_texts(self.TEXTS[:2])
+            single = [ai_service.parse_receipt_text(t) for t in self.TEXTS[:2]]
+        self.assertEqual(len(self.nlp.pipe_calls), 1)
+        self.assertEqual(batched, single)
+        self.assertEqual(batched[0]["title"], "Acme Corp")
@@ -0,0 +1,100 @@
+import socket
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from core import ai_service
+from core.ollama_client import CircuitBreaker, OllamaClient, reset_client
+from core.tests.support import FakeOllama
+
+
+def _ask(client, text="hi"):
+    return client.chat_json([{"role": "user", "content": text}])
+
+
+class OllamaClientTests(SimpleTestCase):
+    def setUp(self):
+        self.fake = FakeOllama()
+        self.addCleanup(self.fake.stop)
+
+    def ollama(self, **kwargs):
+        kwargs.setdefault("backoff", 0)
+        client = OllamaClient(self.fake.url, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_reuses_one_keep_alive_connection(self):
+        client = self.ollama()
+        self.assertEqual([_ask(client, str(i)) for i in range(5)], [{"echo": str(i)} for i in range(5)])
+        self.assertEqual(self.fake.connections, 1)
+
+    def test_concurrent_calls_capped_by_semaphore(self):
+        self.fake.delay = 0.1
+        client = self.ollama(max_concurrency=2)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(_ask(client))) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [{"echo": "hi"}] * 6)
+        self.assertEqual(self.fake.max_in_flight, 2)
+
+    def test_retries_503_then_succeeds(self):
+        self.fake.statuses = [503]
+        self.assertEqual(_ask(self.ollama(retries=2)), {"echo": "hi"})
+        self.assertEqual(self.fake.requests, 2)
+
+    def test_timeout_fails_fast_without_retry(self):
+        self.fake.delay = 0.5
+        client = self.ollama(timeout=0.1, retries=2)
+        self.assertIsNone(_ask(client))
+        self.assertEqual(self.fake.requests, 1)
+
+    def test_refused_connection_returns_none(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        client = OllamaClient(f"http://127.0.0.1:{port}", retries=1, backoff=0)
+        self.assertIsNone(_ask(client))
+
+    def test_breaker_trips_short_circuits_and_recovers(self):
+        client = self.ollama(retries=0, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.2))
+        self.fake.statuses = [500] * 3
+
+        for _ in range(3):
+            self.assertIsNone(_ask(client))
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+        # Open: answered without touching the server
+        self.assertIsNone(_ask(client))
+        self.assertEqual(self.fake.requests, 3)
+
+        time.sleep(0.25)
+        self.assertEqual(client.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(_ask(client), {"echo": "hi"})
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.fake.requests, 4)
+
+    def test_failed_trial_reopens(self):
+        client = self.ollama(retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.1))
+        self.fake.statuses = [500, 500]
+        self.assertIsNone(_ask(client))
+        time.sleep(0.15)
+        self.assertIsNone(_ask(client))  # the trial
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+        self.assertIsNone(_ask(client))
+        self.assertEqual(self.fake.requests, 2)
+
+    def test_ai_service_uses_shared_client(self):
+        cache.clear()
+        reset_client()
+        self.addCleanup(reset_client)
+        with override_settings(LEDGER_AI_OLLAMA_URL=self.fake.url, LEDGER_AI_OLLAMA_MODEL="tiny"):
+            first = ai_service._ollama_chat_json([{"role": "user", "content": "a"}])
+            second = ai_service._ollama_chat_json([{"role": "user", "content": "b"}])
+        self.assertEqual((first, second), ({"echo": "a"}, {"echo": "b"}))
+        self.assertEqual(self.fake.connections, 1)
@@ -0,0 +1,82 @@
+import os
+from unittest.mock import AsyncMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.ollama_client import OllamaClient, reset_client
+from core.tests.support import FakeOllama, create_user
+
+PROMPT = [{"role": "system", "content": "Return JSON"}, {"role": "user", "content": "Coffee 4.50"}]
+
+
+class OllamaResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.fake = FakeOllama()
+        self.addCleanup(self.fake.stop)
+
+    def ollama(self, **kwargs):
+        kwargs.setdefault("cache_ttl", 60)
+        client = OllamaClient(self.fake.url, backoff=0, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_identical_prompt_is_served_from_cache(self):
+        client = self.ollama()
+        self.assertEqual(client.chat_json(PROMPT), {"echo": "Coffee 4.50"})
+        self.assertEqual(client.chat_json(list(PROMPT)), {"echo": "Coffee 4.50"})
+        self.assertEqual(self.fake.requests, 1)
+
+    def test_key_covers_model_messages_and_options(self):
+        client = self.ollama()
+        client.chat_json(PROMPT)
+        client.chat_json(PROMPT, options={"temperature": 0.7})
+        client.chat_json(PROMPT[:1] + [{"role": "user", "content": "Tea 3.00"}])
+        self.ollama(model="other-model").chat_json(PROMPT)
+        self.assertEqual(self.fake.requests, 4)
+
+    def test_opt_out_and_disabled_cache_always_call_ollama(self):
+        client = self.ollama()
+        client.chat_json(PROMPT, cache=False)
+        client.chat_json(PROMPT, cache=False)
+        uncached = self.ollama(cache_ttl=0)
+        uncached.chat_json(PROMPT)
+        uncached.chat_json(PROMPT)
+        self.assertEqual(self.fake.requests, 4)
+
+    def test_failures_are_not_cached(self):
+        client = self.ollama(retries=0)
+        self.fake.statuses = [500]
+        self.assertIsNone(client.chat_json(PROMPT))
+        self.assertEqual(client.chat_json(PROMPT), {"echo": "Coffee 4.50"})
+        self.assertEqual(self.fake.requests, 2)
+
+
+class OllamaCacheCallSiteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        reset_client()
+        self.addCleanup(reset_client)
+        self.fake = FakeOllama()
+        self.addCleanup(self.fake.stop)
+        self.enterContext(override_settings(LEDGER_AI_OLLAMA_URL=self.fake.url, LEDGER_AI_OLLAMA_CACHE_TTL=60))
+        self.enterContext(patch.dict(os.environ, {"LEDGER_AI_USE_OLLAMA": "true"}))
+        self.client.force_login(create_user())
+
+    def test_forecast_insight_reuses_cached_reply(self):
+        self.fake.reply = lambda payload: {"insight": "Spending is steady."}
+        for _ in range(2):
+            response = self.client.post(
+                reverse("forecast_insights"), {"spendingData": [{"day": 1, "total": 20}]}, content_type="application/json"
+            )
+            self.assertEqual(response.json(), {"insight": "Spending is steady.", "ollama_used": True})
+        self.assertEqual(self.fake.requests, 1)
+
+    def test_assistant_opts_out(self):
+        with patch("core.async_views._aollama_chat_json", AsyncMock(return_value={"reply": "Hi"})) as chat:
+            self.client.post(reverse("assistant_send"), {"message": "hello"}, content_type="application/json")
+        self.assertEqual(chat.call_args.kwargs, {"cache": False})
@@ -0,0 +1,129 @@
+import json
+import os
+import socket
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import AssistantMessage
+from core.ollama_client import get_client, reset_client
+from core.tests.support import FakeOllama, create_user
+
+
+def _events(raw):
+    events = []
+    for block in raw.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class AssistantStreamTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_client()
+        self.addCleanup(reset_client)
+        self.fake = FakeOllama()
+        self.addCleanup(self.fake.stop)
+        self.enterContext(override_settings(LEDGER_AI_OLLAMA_URL=self.fake.url))
+        self.enterContext(patch.dict(os.environ, {"LEDGER_AI_USE_OLLAMA": "true"}))
+        self.user = create_user()
+
+    async def _post(self, message="How much did I spend?", **headers):
+        return await self.async_client.post(
+            reverse("assistant_stream"), {"message": message}, content_type="application/json", **headers
+        )
+
+    async def _read(self, response):
+        return "".join([chunk.decode() async for chunk in response.streaming_content])
+
+    async def test_streams_tokens_then_persists_reply(self):
+        await self.async_client.aforce_login(self.user)
+        self.fake.tokens = ["You spent", " $42", " this week."]
+
+        response = await self._post()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = _events(await self._read(response))
+
+        self.assertEqual(events[:-1], [("token", {"text": t}) for t in self.fake.tokens])
+        name, done = events[-1]
+        self.assertEqual(name, "done")
+        self.assertEqual(done["reply"], "You spent $42 this week.")
+        self.assertTrue(done["complete"])
+        stored = [(m.role, m.content) async for m in AssistantMessage.objects.order_by("id")]
+        self.assertEqual(stored, [("user", "How much did I spend?"), ("assistant", "You spent $42 this week.")])
+        self.assertEqual((await AssistantMessage.objects.aget(role="assistant")).id, done["message_id"])
+
+    async def test_first_token_arrives_before_generation_finishes(self):
+        await self.async_client.aforce_login(self.user)
+        self.fake.tokens = ["a", "b", "c", "d"]
+        self.fake.token_delay = 0.3
+
+        started = time.monotonic()
+        response = await self._post()
+        first_token_at = None
+        async for chunk in response.streaming_content:
+            if first_token_at is None and chunk.startswith(b"event: token"):
+                first_token_at = time.monotonic() - started
+        total = time.monotonic() - started
+
+        self.assertLess(first_token_at, 0.3)
+        self.assertGreater(total, 0.9)
+
+    async def test_ollama_down_sends_fallback_reply(self):
+        await self.async_client.aforce_login(self.user)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed_port = sock.getsockname()[1]
+        reset_client()
+
+        with override_settings(LEDGER_AI_OLLAMA_URL=f"http://127.0.0.1:{closed_port}"):
+            events = _events(await self._read(await self._post()))
+
+        self.assertEqual([name for name, _ in events], ["done"])
+        self.assertFalse(events[0][1]["complete"])
+        self.assertEqual(events[0][1]["reply"], "Sorry — I could not generate a reply right now.")
+        self.assertEqual(await AssistantMessage.objects.filter(role="assistant").acount(), 1)
+
+    async def test_connection_closed_before_a_status_line_settles_the_breaker_trial(self):
+        await self.async_client.aforce_login(self.user)
+        breaker = get_client().breaker
+        breaker.failure_threshold = 1
+        breaker.reset_timeout = 0
+        breaker.record_failure()  # half-open: the next request is the trial
+        self.fake.hang_ups = 1
+
+        events = _events(await self._read(await self._post()))
+        self.assertEqual([name for name, _ in events], ["done"])
+        self.assertFalse(events[0][1]["complete"])
+
+        # The failed trial reopened the breaker instead of leaving it waiting forever
+        events = _events(await self._read(await self._post()))
+        self.assertEqual(events[-1][1]["reply"], "Hello there.")
+        self.assertEqual(self.fake.requests, 2)
+
+    async def test_disabled_ollama_answers_without_streaming(self):
+        await self.async_client.aforce_login(self.user)
+        with patch.dict(os.environ, {"LEDGER_AI_USE_OLLAMA": "false"}):
+            events = _events(await self._read(await self._post()))
+        self.assertEqual(events[0][0], "done")
+        self.assertFalse(events[0][1]["ollama_used"])
+        self.assertEqual(self.fake.requests, 0)
+
+    async def test_jwt_bearer_auth(self):
+        token = str(RefreshToken.for_user(self.user).access_token)
+        response = await self._post(headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(_events(await self._read(response))[-1][1]["reply"], "Hello there.")
+
+    async def test_requires_authentication_and_a_message(self):
+        self.assertEqual((await self._post()).status_code, 403)
+        response = await self._post(headers={"Authorization": "Bearer not-a-token"})
+        self.assertEqual(response.status_code, 403)
+
+        await self.async_client.aforce_login(self.user)
+        self.assertEqual((await self._post(message="  ")).status_code, 400)
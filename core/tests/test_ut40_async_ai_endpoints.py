@@ -0,0 +1,213 @@
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.ai_service import categorize_transaction_ai
+from core.models import AssistantMessage
+from core.ollama_async import AsyncOllamaClient, get_async_client
+from core.ollama_client import CircuitBreaker, OllamaClient, SlotBudget, reset_client
+from core.tests.support import FakeOllama, create_user
+
+PROMPT = [{"role": "user", "content": "Coffee 4.50"}]
+
+
+class AsyncOllamaChatJsonTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.fake = FakeOllama()
+        self.addCleanup(self.fake.stop)
+
+    def ollama(self, **kwargs):
+        kwargs.setdefault("breaker", CircuitBreaker())
+        return AsyncOllamaClient(self.fake.url, backoff=0, **kwargs)
+
+    def test_retries_503_then_succeeds(self):
+        self.fake.statuses = [503]
+        self.assertEqual(asyncio.run(self.ollama().chat_json(PROMPT)), {"echo": "Coffee 4.50"})
+        self.assertEqual(self.fake.requests, 2)
+
+    def test_failure_returns_none_and_counts_against_breaker(self):
+        client = self.ollama(retries=0, breaker=CircuitBreaker(failure_threshold=1))
+        self.fake.statuses = [500]
+        self.assertIsNone(asyncio.run(client.chat_json(PROMPT)))
+        self.assertIsNone(asyncio.run(client.chat_json(PROMPT)))
+        self.assertEqual(self.fake.requests, 1)
+
+    def test_reuses_one_keep_alive_connection(self):
+        client = self.ollama()
+
+        async def ask_five():
+            try:
+                return [await client.chat_json(PROMPT, cache=False) for _ in range(5)]
+            finally:
+                await client.aclose()
+
+        self.assertEqual(asyncio.run(ask_five()), [{"echo": "Coffee 4.50"}] * 5)
+        self.assertEqual(self.fake.connections, 1)
+
+    def test_connection_closed_without_a_response_is_retried_then_none(self):
+        self.fake.hang_ups = 1
+        self.assertEqual(asyncio.run(self.ollama().chat_json(PROMPT)), {"echo": "Coffee 4.50"})
+        self.fake.hang_ups = 3
+        self.assertIsNone(asyncio.run(self.ollama().chat_json(PROMPT, cache=False)))
+        self.assertEqual(self.fake.requests, 5)
+
+    def test_sync_and_async_calls_share_one_concurrency_cap(self):
+        self.fake.delay = 0.2
+        sync_client = OllamaClient(self.fake.url, max_concurrency=2)
+        self.addCleanup(sync_client.close)
+        async_client = self.ollama(slots=sync_client.slots)
+        threads = [threading.Thread(target=sync_client.chat_json, args=(PROMPT, None, False)) for _ in range(3)]
+
+        async def burst():
+            await asyncio.gather(*[async_client.chat_json(PROMPT, cache=False) for _ in range(3)])
+
+        for thread in threads:
+            thread.start()
+        asyncio.run(burst())
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.fake.requests, 6)
+        self.assertEqual(self.fake.max_in_flight, 2)
+
+    def test_cancelled_wait_is_not_an_ollama_failure(self):
+        self.fake.delay = 0.3
+        breaker = CircuitBreaker(failure_threshold=1)
+        client = self.ollama(max_concurrency=1, breaker=breaker)
+
+        async def hang_up_while_queued():
+            busy = asyncio.ensure_future(client.chat_json(PROMPT, cache=False))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(client.chat_json(PROMPT, cache=False))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+            return await busy
+
+        self.assertEqual(asyncio.run(hang_up_while_queued()), {"echo": "Coffee 4.50"})
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(asyncio.run(client.chat_json(PROMPT, cache=False)), {"echo": "Coffee 4.50"})
+        self.assertEqual(self.fake.requests, 2)
+
+    def test_cancelled_half_open_trial_frees_the_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        slots = SlotBudget(1)
+        self.assertTrue(slots.acquire())  # a sync call holds the only slot
+        client = self.ollama(breaker=breaker, slots=slots)
+
+        async def hang_up_during_trial():
+            trial = asyncio.ensure_future(client.chat_json(PROMPT, cache=False))
+            await asyncio.sleep(0.05)
+            trial.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await trial
+
+        asyncio.run(hang_up_during_trial())
+        slots.release()
+        # Neither reopened nor stuck waiting on a trial that will never report
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(asyncio.run(client.chat_json(PROMPT, cache=False)), {"echo": "Coffee 4.50"})
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_shares_cache_entries_with_sync_client(self):
+        sync_client = OllamaClient(self.fake.url, cache_ttl=60)
+        self.addCleanup(sync_client.close)
+        sync_client.chat_json(PROMPT)
+        self.assertEqual(asyncio.run(self.ollama(cache_ttl=60).chat_json(PROMPT)), {"echo": "Coffee 4.50"})
+        self.assertEqual(self.fake.requests, 1)
+
+
+class AsyncAIEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        reset_client()
+        self.addCleanup(reset_client)
+        self.fake = FakeOllama()
+        self.addCleanup(self.fake.stop)
+        self.enterContext(override_settings(LEDGER_AI_OLLAMA_URL=self.fake.url, LEDGER_AI_OLLAMA_MAX_CONCURRENCY=50))
+        self.enterContext(patch.dict(os.environ, {"LEDGER_AI_USE_OLLAMA": "true"}))
+        self.user = create_user()
+
+    async def _post(self, name, data, **kwargs):
+        response = await self.async_client.post(reverse(name), data, content_type="application/json", **kwargs)
+        return response.status_code, response.json()
+
+    async def test_concurrent_requests_wait_on_ollama_together(self):
+        await self.async_client.aforce_login(self.user)
+        self.fake.delay = 0.3
+        self.fake.reply = lambda payload: {"insight": "Steady."}
+
+        started = time.monotonic()
+        results = await asyncio.gather(*[
+            self._post("forecast_insights", {"spendingData": [{"day": 1, "total": n}]}) for n in range(20)
+        ])
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, [(200, {"insight": "Steady.", "ollama_used": True})] * 20)
+        # One at a time would take 6s; they overlap while each waits on Ollama
+        self.assertGreater(self.fake.max_in_flight, 10)
+        self.assertLess(elapsed, 20 * 0.3 / 2)
+        self.assertEqual(get_async_client().max_concurrency, 50)
+
+    async def test_assistant_send_stores_both_turns(self):
+        await self.async_client.aforce_login(self.user)
+        self.fake.reply = lambda payload: {"reply": "You spent $42."}
+
+        self.assertEqual(
+            await self._post("assistant_send", {"message": "How much?"}),
+            (200, {"reply": "You spent $42.", "ollama_used": True}),
+        )
+        stored = [(m.role, m.content) async for m in AssistantMessage.objects.order_by("id")]
+        self.assertEqual(stored, [("user", "How much?"), ("assistant", "You spent $42.")])
+
+    async def test_forecast_falls_back_to_rules_when_ollama_is_down(self):
+        await self.async_client.aforce_login(self.user)
+        self.fake.statuses = [500] * 3
+        status, body = await self._post("forecast_insights", {"spendingData": [{"day": 1, "total": 5}]})
+        self.assertEqual((status, body["ollama_used"]), (200, False))
+        self.assertEqual(body["insight"], "No expenses recorded this month yet — great start!")
+
+    async def test_forecast_falls_back_to_rules_when_ollama_hangs_up(self):
+        await self.async_client.aforce_login(self.user)
+        self.fake.hang_ups = 3
+        status, body = await self._post("forecast_insights", {"spendingData": [{"day": 1, "total": 5}]})
+        self.assertEqual((status, body["ollama_used"]), (200, False))
+
+    async def test_parse_voice_refines_with_ollama(self):
+        await self.async_client.aforce_login(self.user)
+        self.fake.reply = lambda payload: {"date": "2026-01-05", "amount": 12.5, "description": "Coffee"}
+
+        status, body = await self._post("parse_voice", {"transcript": "coffee at the cafe"})
+        self.assertEqual(status, 200)
+        self.assertEqual((body["date"], body["amount"], body["description"]), ("2026-01-05", 12.5, "Coffee"))
+        self.assertTrue(body["ollama_used"])
+
+    async def test_categorize_with_jwt_and_form_body(self):
+        token = str(RefreshToken.for_user(self.user).access_token)
+        response = await self.async_client.post(
+            reverse("categorize_ai"), {"text": "uber ride home"}, headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(response.json(), {"category": categorize_transaction_ai("uber ride home")})
+
+    async def test_validation_and_auth_errors(self):
+        self.assertEqual((await self._post("categorize_ai", {"text": "x"}))[0], 403)
+        await self.async_client.aforce_login(self.user)
+        self.assertEqual(await self._post("categorize_ai", {}), (400, {"error": "Text is required"}))
+        self.assertEqual(await self._post("parse_voice", {}), (400, {"error": "Transcript is required"}))
+        self.assertEqual((await self._post("assistant_send", {"message": " "}))[0], 400)
+        response = await self.async_client.post(reverse("forecast_insights"), "{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((await self.async_client.get(reverse("categorize_ai"))).status_code, 405)
+        self.assertEqual(self.fake.requests, 0)
@@ -26,22 +26,33 @@ from .views import (
     update_payment_info,
     delete_group_expense,
     ReceiptUploadView,
+    ReceiptBatchUploadView,
+    ReceiptOCRJobView,
+    ReceiptOCRJobDetailView,
     ExportTransactionsView,
     ImportTransactionsView,
     CategoryListView,
     CategoryStatsView,
     BulkCategorizeView,
-    categorize_with_ai,
-    parse_voice_input,
-    forecast_insights,
     financial_forecast,
+    forecast_cache_stats,
+    ocr_metrics,
+    health,
+    health_ready,
     assistant_history,
-    assistant_send,
     debug_ocr_text,
     ai_budget_suggestions,
     ai_recurring_suggestions,
 )
 
+from .async_views import (
+    assistant_send,
+    assistant_stream,
+    categorize_with_ai,
+    forecast_insights,
+    parse_voice_input,
+)
+
 router = routers.DefaultRouter()
 router.register(r'transactions', TransactionViewSet, basename='transaction')
 router.register(r'income-sources', IncomeSourceViewSet, basename='income-source')
@@ -58,6 +69,8 @@ def get_csrf_token(request):
     return JsonResponse({'csrfToken': token})
 
 urlpatterns = [
+    path('health/', health, name='health'),
+    path('health/ready/', health_ready, name='health_ready'),
     path('auth/csrf/', get_csrf_token, name='csrf_token'),
     path('auth/register/', register, name='register'),
     path('auth/login/', login_view, name='login'),
@@ -75,6 +88,10 @@ urlpatterns = [
     path('auth/payment-info/', update_payment_info, name='update_payment_info'),
     path('groups/<int:group_id>/expenses/<int:expense_id>/delete/', delete_group_expense, name='delete_group_expense'),
     path('upload-receipt/', ReceiptUploadView.as_view(), name='upload_receipt'),
+    path('receipts/batch/', ReceiptBatchUploadView.as_view(), name='receipt_batch_upload'),
+    path('receipts/jobs/', ReceiptOCRJobView.as_view(), name='receipt_ocr_jobs'),
+    path('receipts/metrics/', ocr_metrics, name='ocr_metrics'),
+    path('receipts/jobs/<uuid:job_id>/', ReceiptOCRJobDetailView.as_view(), name='receipt_ocr_job_detail'),
     path('transactions/export/', ExportTransactionsView.as_view(), name='export_transactions'),
     path('transactions/import/', ImportTransactionsView.as_view(), name='import_transactions'),
     path('categories/', CategoryListView.as_view(), name='category_list'),
@@ -84,8 +101,10 @@ urlpatterns = [
     path('ai/parse-voice/', parse_voice_input, name='parse_voice'),
     path('ai/forecast-insights/', forecast_insights, name='forecast_insights'),
     path('ai/forecast/', financial_forecast, name='financial_forecast'),
+    path('ai/forecast/cache-stats/', forecast_cache_stats, name='forecast_cache_stats'),
     path('ai/assistant/history/', assistant_history, name='assistant_history'),
     path('ai/assistant/send/', assistant_send, name='assistant_send'),
+    path('ai/assistant/stream/', assistant_stream, name='assistant_stream'),
     path('debug/ocr/', debug_ocr_text, name='debug_ocr'),  # Debug endpoint
     path('ai/budget-suggestions/', ai_budget_suggestions, name='ai_budget_suggestions'),
     path('ai/recurring-suggestions/', ai_recurring_suggestions, name='ai_recurring_suggestions'),
@@ -1,15 +1,23 @@
 ﻿from rest_framework import viewsets, permissions, status
 from django.db import models
+from django.db import transaction as db_transaction
 import csv
-from django.http import HttpResponse
+import zlib
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import ensure_csrf_cookie, csrf_exempt
 from django.utils.decorators import method_decorator
-from .models import Transaction, IncomeSource, AssistantConversation, AssistantMessage, Budget, Reminder, RecurringTransaction, UserProfile, Group, GroupMembership, GroupExpense, GroupPayment, PasswordResetOTP
-from .serializers import TransactionSerializer, UserSerializer, IncomeSourceSerializer, BudgetSerializer, ReminderSerializer, RecurringTransactionSerializer, UserProfileSerializer, GroupSerializer, GroupListSerializer, GroupExpenseSerializer
+from .models import Transaction, MonthlyCategoryRollup, IncomeSource, AssistantConversation, AssistantMessage, Budget, Reminder, RecurringTransaction, UserProfile, Group, GroupMembership, GroupExpense, GroupPayment, PasswordResetOTP, ReceiptOCRJob
+from .serializers import TransactionSerializer, UserSerializer, IncomeSourceSerializer, BudgetSerializer, ReminderSerializer, RecurringTransactionSerializer, UserProfileSerializer, GroupSerializer, GroupListSerializer, GroupExpenseSerializer, ReceiptOCRJobSerializer
+from .pagination import TransactionKeysetPagination
+from .forecasting import build_forecast
+from .forecasting import cache as forecast_cache
 
 
 def _get_or_create_profile(user):
@@ -21,38 +29,49 @@ def _get_or_create_profile(user):
 def _check_budget_alerts(user):
     """
     After any transaction change, recalculate spend for each active budget
-    and send 90%/100% alert emails if thresholds are newly crossed.
+    and queue 90%/100% alert emails if thresholds are newly crossed.
     Resets alert flags if spending drops back below the threshold.
+
+    Spend for all of the month's budget categories comes from one grouped
+    aggregate, flag changes are written with one bulk_update, and emails are
+    sent by the deferred worker after commit so the request never waits on SMTP.
     """
     from datetime import date
     from django.db.models import Sum
+    from django.db.models.functions import Lower
+    from .background import defer
     from .email_service import send_budget_alert_email
 
     today = date.today()
     current_month_start = today.replace(day=1)
+    if current_month_start.month == 12:
+        next_month_start = current_month_start.replace(year=current_month_start.year + 1, month=1)
+    else:
+        next_month_start = current_month_start.replace(month=current_month_start.month + 1)
 
-    budgets = Budget.objects.filter(owner=user, month=current_month_start)
-
-    for budget in budgets:
-        limit = float(budget.limit_amount)
-        if limit <= 0:
-            continue
-
-        first_day = budget.month.replace(day=1)
-        if first_day.month == 12:
-            last_day = first_day.replace(year=first_day.year + 1, month=1, day=1)
-        else:
-            last_day = first_day.replace(month=first_day.month + 1, day=1)
+    budgets = [b for b in Budget.objects.filter(owner=user, month=current_month_start) if b.limit_amount > 0]
+    if not budgets:
+        return
 
-        total = Transaction.objects.filter(
+    category_keys = {b.category.lower() for b in budgets} - {'income', 'savings'}
+    spent_by_category = dict(
+        Transaction.objects.filter(
             owner=user,
-            category__iexact=budget.category,
-            date__gte=first_day,
-            date__lt=last_day,
-        ).exclude(
-            models.Q(category__iexact='income') | models.Q(category__iexact='savings')
-        ).aggregate(total=Sum('amount'))['total']
+            date__gte=current_month_start,
+            date__lt=next_month_start,
+        )
+        .annotate(category_key=Lower('category'))
+        .filter(category_key__in=category_keys)
+        .values('category_key')
+        .annotate(total=Sum('amount'))
+        .values_list('category_key', 'total')
+    )
+
+    changed_budgets = []
 
+    for budget in budgets:
+        limit = float(budget.limit_amount)
+        total = spent_by_category.get(budget.category.lower())
         spent = float(total) if total else 0.0
         percent = int((spent / limit) * 100)
 
@@ -67,40 +86,32 @@ def _check_budget_alerts(user):
             budget.alert_100_sent = False
             changed = True
 
+        alert_kwargs = {
+            'to_email': user.email,
+            'username': user.username,
+            'category': budget.category,
+            'spent': spent,
+            'limit': limit,
+            'percent': percent,
+        }
+
         # Send 90% alert
         if percent >= 90 and not budget.alert_90_sent:
-            try:
-                send_budget_alert_email(
-                    to_email=user.email,
-                    username=user.username,
-                    category=budget.category,
-                    spent=spent,
-                    limit=limit,
-                    percent=percent,
-                )
-            except Exception:
-                pass
+            defer(send_budget_alert_email, **alert_kwargs)
             budget.alert_90_sent = True
             changed = True
 
         # Send 100% alert
         if percent >= 100 and not budget.alert_100_sent:
-            try:
-                send_budget_alert_email(
-                    to_email=user.email,
-                    username=user.username,
-                    category=budget.category,
-                    spent=spent,
-                    limit=limit,
-                    percent=percent,
-                )
-            except Exception:
-                pass
+            defer(send_budget_alert_email, **alert_kwargs)
             budget.alert_100_sent = True
             changed = True
 
         if changed:
-            budget.save(update_fields=['alert_90_sent', 'alert_100_sent'])
+            changed_budgets.append(budget)
+
+    if changed_budgets:
+        Budget.objects.bulk_update(changed_budgets, ['alert_90_sent', 'alert_100_sent'])
 
 
 @api_view(['GET'])
@@ -114,10 +125,11 @@ def current_user(request):
 class TransactionViewSet(viewsets.ModelViewSet):
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TransactionKeysetPagination
 
     def get_queryset(self):
-        # Lazy-materialise any due recurring transactions before listing
-        RecurringTransaction.materialize_due(self.request.user)
+        # Read-only: due recurring rules are materialized by the scheduled
+        # `materialize_recurring` command, not on the request path.
         return Transaction.objects.filter(owner=self.request.user).order_by('-date', '-id')
 
     def perform_create(self, serializer):
@@ -150,7 +162,7 @@ class BudgetViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         from datetime import date
-        queryset = Budget.objects.filter(owner=self.request.user)
+        queryset = Budget.objects.filter(owner=self.request.user).select_related('owner')
         
         # Filter by month if provided (format: YYYY-MM-DD)
         month_param = self.request.query_params.get('month')
@@ -163,6 +175,12 @@ class BudgetViewSet(viewsets.ModelViewSet):
         
         return queryset.order_by('-month', 'category')
 
+    def list(self, request, *args, **kwargs):
+        # One grouped aggregate for every row's `spent` instead of a query per budget
+        budgets = Budget.attach_spent(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(budgets, many=True)
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         # Ensure month is set to first day of month
         month = serializer.validated_data.get('month')
@@ -240,6 +258,8 @@ class RecurringTransactionViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
+        # Back-dated rules shouldn't wait for the next scheduled run
+        RecurringTransaction.materialize_due(self.request.user)
 
     @action(detail=True, methods=['post'])
     def toggle_active(self, request, pk=None):
@@ -510,84 +530,6 @@ def disable_2fa(request):
     return Response({'message': '2FA disabled successfully.', 'is_2fa_enabled': False})
 
 
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def forecast_insights(request):
-    """Return a spending insight. Uses rule-based logic by default; Ollama when enabled."""
-    from .ai_service import _env_flag, _ollama_chat_json
-    import json
-    from datetime import date
-
-    spending_data = request.data.get('spendingData', [])
-
-    # ── Rule-based insight (always available) ─────────────────────────────────
-    def rule_based_insight(data, user):
-        """Generate a meaningful insight from real transaction data."""
-        from django.db.models import Sum
-        from core.models import Transaction
-
-        now = date.today()
-        from django.db.models import Q
-        txs = Transaction.objects.filter(
-            owner=user,
-            date__year=now.year,
-            date__month=now.month,
-        ).exclude(Q(category__iexact='income') | Q(category__iexact='savings'))
-
-        total_spent = float(txs.aggregate(s=Sum('amount'))['s'] or 0)
-        days_passed = now.day
-        days_in_month = 30
-
-        if total_spent == 0:
-            return "No expenses recorded this month yet — great start!"
-
-        daily_avg = total_spent / days_passed
-        projected = daily_avg * days_in_month
-
-        # Top category
-        from django.db.models import Sum as S
-        cat_totals = (
-            txs.values('category')
-            .annotate(total=S('amount'))
-            .order_by('-total')
-        )
-        top_cat = cat_totals.first()
-        top_cat_str = f" Your biggest spending category is {top_cat['category']} (${float(top_cat['total']):.0f})." if top_cat else ""
-
-        # Spending pace message
-        if daily_avg < 30:
-            pace = "Your spending pace is very low this month — well done!"
-        elif daily_avg < 60:
-            pace = f"You're averaging ${daily_avg:.0f}/day — on track for a reasonable month."
-        else:
-            pace = f"You're averaging ${daily_avg:.0f}/day. At this pace, you'll spend ~${projected:.0f} this month."
-
-        return f"{pace}{top_cat_str}"
-
-    # ── Try Ollama if enabled ─────────────────────────────────────────────────
-    if _env_flag("LEDGER_AI_USE_OLLAMA", default=False) and spending_data:
-        system = (
-            "You are a personal finance assistant. "
-            "Given daily expense totals for the current month, write ONE short insight in <= 2 sentences. "
-            "Be specific but avoid assumptions about income. "
-            "Return ONLY strict JSON with key: insight (string)."
-        )
-        user_msg = {
-            "spending_trend": spending_data,
-            "output_schema": {"insight": "string"},
-        }
-        result = _ollama_chat_json([
-            {"role": "system", "content": system},
-            {"role": "user", "content": json.dumps(user_msg, ensure_ascii=False)},
-        ])
-        if isinstance(result, dict) and isinstance(result.get('insight'), str) and result['insight'].strip():
-            return Response({'insight': result['insight'].strip(), 'ollama_used': True})
-
-    # ── Fallback: rule-based insight ─────────────────────────────────────────
-    insight_text = rule_based_insight(spending_data, request.user)
-    return Response({'insight': insight_text, 'ollama_used': False})
-
-
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def financial_forecast(request):
@@ -597,21 +539,36 @@ def financial_forecast(request):
       2. Holt's Double Exponential Smoothing (level + trend)
       3. Monte Carlo Simulation (probabilistic with confidence bands)
     Returns an ensemble prediction (weighted average) plus per-algorithm detail.
+    The computation lives in ``core.forecasting``; payloads are cached per
+    user until their transactions or income sources change.
     """
-    from datetime import date, timedelta
-    from dateutil.relativedelta import relativedelta
+    from datetime import date
+
+    today = date.today()
+    payload, hit = forecast_cache.get_or_build(
+        request.user.id, today, lambda: _build_user_forecast(request.user, today)
+    )
+    response = Response(payload)
+    response['X-Forecast-Cache'] = 'hit' if hit else 'miss'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def forecast_cache_stats(request):
+    """Hit/miss counters for the forecast cache."""
+    return Response(forecast_cache.stats())
+
+
+def _build_user_forecast(user, today):
     from collections import defaultdict
-    import statistics
-    import random
-    import math
 
-    user = request.user
-    transactions = Transaction.objects.filter(owner=user).order_by('date')
+    rollups = MonthlyCategoryRollup.objects.filter(owner=user, count__gt=0)
     income_sources = IncomeSource.objects.filter(owner=user, active=True)
 
     # ── Empty-data early returns ──────────────────────────────────────────
-    if not transactions.exists():
-        return Response({
+    if not rollups.exists():
+        return {
             'monthly_data': [],
             'predictions': [],
             'category_breakdown': [],
@@ -624,346 +581,49 @@ def financial_forecast(request):
                 'top_growing_category': None,
                 'recommendation': 'Start tracking your expenses to get personalized predictions.'
             }
-        })
-
-    today = date.today()
+        }
 
-    # ── Aggregate spending by month ───────────────────────────────────────
+    # ── Aggregate spending by month (from the monthly rollup) ─────────────
     monthly_spending = defaultdict(lambda: {'total': 0, 'categories': defaultdict(float)})
 
-    for txn in transactions:
-        if txn.category and txn.category.lower() == 'income':
-            continue
-        month_key = txn.date.strftime('%Y-%m')
-        amount = float(txn.amount)
+    spending_rows = (
+        rollups.exclude(category__iexact='income')
+        .order_by('month', 'category')
+        .values_list('month', 'category', 'total')
+    )
+    for month, category, total in spending_rows:
+        month_key = month.strftime('%Y-%m')
+        amount = float(total)
         monthly_spending[month_key]['total'] += amount
-        monthly_spending[month_key]['categories'][txn.category or 'Uncategorized'] += amount
+        monthly_spending[month_key]['categories'][category or 'Uncategorized'] += amount
 
-    sorted_months = sorted(monthly_spending.keys())
-
-    if len(sorted_months) < 2:
-        current_month = today.strftime('%Y-%m')
-        current_spending = monthly_spending.get(current_month, {'total': 0})['total']
-        return Response({
-            'monthly_data': [{
-                'month': current_month,
-                'actual': current_spending,
-                'predicted': None,
-                'predicted_lr': None,
-                'predicted_ema': None,
-                'predicted_mc': None,
-                'label': today.strftime('%b %Y')
-            }],
-            'predictions': [],
-            'category_breakdown': [],
-            'algorithms': {},
-            'insights': {
-                'total_predicted_spending': current_spending,
-                'predicted_savings': 0,
-                'trend': 'neutral',
-                'trend_percentage': 0,
-                'top_growing_category': None,
-                'recommendation': 'Keep tracking your expenses for at least 2 months to get accurate predictions.'
-            }
-        })
-
-    x_values = list(range(len(sorted_months)))
-    y_values = [monthly_spending[m]['total'] for m in sorted_months]
-
-    # ══════════════════════════════════════════════════════════════════════
-    # ALGORITHM 1 — Linear Regression + Seasonality
-    # ══════════════════════════════════════════════════════════════════════
-
-    def linear_regression(x_vals, y_vals):
-        n = len(x_vals)
-        if n < 2:
-            return 0, y_vals[0] if y_vals else 0
-        mean_x = sum(x_vals) / n
-        mean_y = sum(y_vals) / n
-        numerator = sum((x_vals[i] - mean_x) * (y_vals[i] - mean_y) for i in range(n))
-        denominator = sum((x_vals[i] - mean_x) ** 2 for i in range(n))
-        if denominator == 0:
-            return 0, mean_y
-        slope = numerator / denominator
-        intercept = mean_y - slope * mean_x
-        return slope, intercept
-
-    slope, intercept = linear_regression(x_values, y_values)
-
-    # Seasonality indices
-    monthly_averages = defaultdict(list)
-    for month_key in sorted_months:
-        month_num = int(month_key.split('-')[1])
-        monthly_averages[month_num].append(monthly_spending[month_key]['total'])
-    overall_avg = sum(y_values) / len(y_values) if y_values else 0
-    seasonality = {}
-    for month_num, values in monthly_averages.items():
-        avg = sum(values) / len(values)
-        seasonality[month_num] = avg / overall_avg if overall_avg > 0 else 1.0
-
-    # Fitted values (historical)
-    lr_fitted = [round(slope * i + intercept, 2) for i in x_values]
-
-    # Future values
-    last_index = len(sorted_months) - 1
-    lr_predictions = []
-    for i in range(1, 7):
-        future_index = last_index + i
-        future_date = today + relativedelta(months=i)
-        base = slope * future_index + intercept
-        seasonal_factor = seasonality.get(future_date.month, 1.0)
-        lr_predictions.append(round(max(0, base * seasonal_factor), 2))
-
-    # ══════════════════════════════════════════════════════════════════════
-    # ALGORITHM 2 — Holt's Double Exponential Smoothing
-    # ══════════════════════════════════════════════════════════════════════
-
-    def holts_double_exponential(y_vals, alpha=0.3, beta=0.1):
-        """
-        Holt's method captures level + trend.
-        Returns (fitted_values, level, trend) so we can extrapolate.
-        """
-        n = len(y_vals)
-        if n == 0:
-            return [], 0, 0
-        if n == 1:
-            return [y_vals[0]], y_vals[0], 0
-
-        # Initialise: level = first observation, trend = second − first
-        level = y_vals[0]
-        trend = y_vals[1] - y_vals[0]
-        fitted = [level]  # first fitted value
-
-        for t in range(1, n):
-            prev_level = level
-            level = alpha * y_vals[t] + (1 - alpha) * (prev_level + trend)
-            trend = beta * (level - prev_level) + (1 - beta) * trend
-            fitted.append(round(level + trend, 2))
-
-        return fitted, level, trend
-
-    ema_fitted, ema_level, ema_trend = holts_double_exponential(y_values)
-    ema_predictions = [round(max(0, ema_level + ema_trend * k), 2) for k in range(1, 7)]
-
-    # ══════════════════════════════════════════════════════════════════════
-    # ALGORITHM 3 — Monte Carlo Simulation
-    # ══════════════════════════════════════════════════════════════════════
-
-    def monte_carlo_forecast(y_vals, n_months=6, n_simulations=2000):
-        """
-        Simulate future paths based on the historical distribution of
-        month-over-month *percentage* changes.  Returns median predictions
-        plus P10/P90 confidence bands.
-        """
-        if len(y_vals) < 2:
-            last = y_vals[-1] if y_vals else 0
-            return [last] * n_months, [last] * n_months, [last] * n_months
-
-        # Month-over-month percentage changes
-        pct_changes = []
-        for i in range(1, len(y_vals)):
-            if y_vals[i - 1] > 0:
-                pct_changes.append((y_vals[i] - y_vals[i - 1]) / y_vals[i - 1])
-            else:
-                pct_changes.append(0.0)
-
-        mean_change = sum(pct_changes) / len(pct_changes)
-        if len(pct_changes) > 1:
-            std_change = (sum((c - mean_change) ** 2 for c in pct_changes) / (len(pct_changes) - 1)) ** 0.5
-        else:
-            std_change = abs(mean_change) * 0.2  # fallback
-
-        random.seed(42)  # reproducible
-        simulated_paths = []
-        last_val = y_vals[-1]
-
-        for _ in range(n_simulations):
-            path = []
-            val = last_val
-            for _ in range(n_months):
-                change = random.gauss(mean_change, std_change)
-                val = max(0, val * (1 + change))
-                path.append(val)
-            simulated_paths.append(path)
-
-        # Extract percentiles per month
-        p10, p50, p90 = [], [], []
-        for month_idx in range(n_months):
-            month_vals = sorted(sp[month_idx] for sp in simulated_paths)
-            p10.append(round(month_vals[int(n_simulations * 0.10)], 2))
-            p50.append(round(month_vals[int(n_simulations * 0.50)], 2))
-            p90.append(round(month_vals[int(n_simulations * 0.90)], 2))
-
-        return p50, p10, p90
-
-    mc_median, mc_lower, mc_upper = monte_carlo_forecast(y_values)
-
-    # For fitted (historical), Monte Carlo doesn't have fitted values;
-    # use the last actual as the starting point for each
-    mc_fitted = [round(v, 2) for v in y_values]  # actuals (no fitted concept)
-
-    # ══════════════════════════════════════════════════════════════════════
-    # ENSEMBLE — weighted average of the three algorithms
-    # ══════════════════════════════════════════════════════════════════════
-
-    # Compute MAE for each algorithm on historical data to weight them
-    def _mae(fitted, actuals):
-        errors = [abs(f - a) for f, a in zip(fitted, actuals) if f is not None]
-        return sum(errors) / len(errors) if errors else 1.0
-
-    mae_lr = _mae(lr_fitted, y_values) or 1.0
-    mae_ema = _mae(ema_fitted, y_values) or 1.0
-    mae_mc = _mae(mc_fitted, y_values) or 1.0  # will be 0 (uses actuals), cap it
-
-    # Inverse-MAE weighting (lower error = higher weight)
-    # Add small epsilon to avoid div-by-zero when mc_fitted == actuals
-    eps = 0.01
-    inv_lr = 1.0 / (mae_lr + eps)
-    inv_ema = 1.0 / (mae_ema + eps)
-    inv_mc = 1.0 / (mae_mc + eps)
-    total_inv = inv_lr + inv_ema + inv_mc
-    w_lr = inv_lr / total_inv
-    w_ema = inv_ema / total_inv
-    w_mc = inv_mc / total_inv
-
-    ensemble_predictions = []
-    for i in range(6):
-        val = w_lr * lr_predictions[i] + w_ema * ema_predictions[i] + w_mc * mc_median[i]
-        ensemble_predictions.append(round(max(0, val), 2))
-
-    # ══════════════════════════════════════════════════════════════════════
-    # Build response
-    # ══════════════════════════════════════════════════════════════════════
-
-    # Historical monthly data
-    monthly_data = []
-    for i, month_key in enumerate(sorted_months):
-        month_date = date.fromisoformat(f"{month_key}-01")
-        monthly_data.append({
-            'month': month_key,
-            'actual': round(monthly_spending[month_key]['total'], 2),
-            'predicted': lr_fitted[i],
-            'predicted_lr': lr_fitted[i],
-            'predicted_ema': ema_fitted[i] if i < len(ema_fitted) else None,
-            'label': month_date.strftime('%b %Y')
-        })
+    monthly_income = sum(float(src.monthly_amount) for src in income_sources)
+    return build_forecast(monthly_spending, monthly_income, today=today)
 
-    # Future predictions
-    predictions = []
-    for i in range(6):
-        future_date = today + relativedelta(months=i + 1)
-        predictions.append({
-            'month': future_date.strftime('%Y-%m'),
-            'actual': None,
-            'predicted': ensemble_predictions[i],
-            'predicted_lr': lr_predictions[i],
-            'predicted_ema': ema_predictions[i],
-            'predicted_mc': mc_median[i],
-            'confidence_lower': mc_lower[i],
-            'confidence_upper': mc_upper[i],
-            'label': future_date.strftime('%b %Y')
-        })
 
-    # Category breakdown (uses linear regression per-category as before)
-    category_totals = defaultdict(list)
-    for month_key in sorted_months:
-        for category, amount in monthly_spending[month_key]['categories'].items():
-            category_totals[category].append(amount)
-
-    category_breakdown = []
-    category_trends = {}
-
-    for category, values in category_totals.items():
-        avg_spending = sum(values) / len(values)
-        if len(values) >= 2:
-            cat_x = list(range(len(values)))
-            cat_slope, _ = linear_regression(cat_x, values)
-            trend_pct = (cat_slope / avg_spending * 100) if avg_spending > 0 else 0
-        else:
-            trend_pct = 0
-        category_trends[category] = trend_pct
-        next_month_prediction = avg_spending * (1 + trend_pct / 100) if trend_pct else avg_spending
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def ocr_metrics(request):
+    """OCR pool queue depth, rejections and wall time for this web process."""
+    from .ocr_pool import get_pool
+    return Response(get_pool().stats())
 
-        category_breakdown.append({
-            'category': category,
-            'average_monthly': round(avg_spending, 2),
-            'last_month': round(values[-1], 2) if values else 0,
-            'predicted_next': round(max(0, next_month_prediction), 2),
-            'trend': 'up' if trend_pct > 5 else ('down' if trend_pct < -5 else 'stable'),
-            'trend_percentage': round(trend_pct, 1)
-        })
-    category_breakdown.sort(key=lambda x: x['average_monthly'], reverse=True)
 
-    # Insights
-    total_predicted_6mo = sum(ensemble_predictions)
-    avg_predicted_monthly = total_predicted_6mo / 6 if predictions else 0
-    monthly_income = sum(float(src.monthly_amount) for src in income_sources)
-    predicted_monthly_savings = monthly_income - avg_predicted_monthly if monthly_income > 0 else 0
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def health(request):
+    """Liveness, plus the model warm-up state of this worker (core.model_warmup)."""
+    from . import model_warmup
+    return Response({'status': 'ok', **model_warmup.status()})
 
-    if len(y_values) >= 2:
-        recent_avg = sum(y_values[-3:]) / min(3, len(y_values))
-        older_avg = sum(y_values[:-3]) / max(1, len(y_values) - 3) if len(y_values) > 3 else y_values[0]
-        trend_pct = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
-    else:
-        trend_pct = 0
-
-    trend = 'up' if trend_pct > 5 else ('down' if trend_pct < -5 else 'stable')
-    top_growing = max(category_trends.items(), key=lambda x: x[1]) if category_trends else (None, 0)
-
-    if trend == 'up' and trend_pct > 15:
-        recommendation = f"Your spending is increasing by {abs(trend_pct):.1f}% monthly. Consider reviewing your {category_breakdown[0]['category'] if category_breakdown else 'largest expense'} spending."
-    elif trend == 'down':
-        recommendation = f"Great job! Your spending is decreasing by {abs(trend_pct):.1f}%. Keep up the good financial habits."
-    elif predicted_monthly_savings < 0:
-        recommendation = f"You're projected to spend ${abs(predicted_monthly_savings):.0f} more than your income. Consider setting budgets for high-spending categories."
-    elif top_growing[1] > 20:
-        recommendation = f"Your {top_growing[0]} spending is growing rapidly ({top_growing[1]:.1f}%/month). Consider setting a budget limit."
-    else:
-        recommendation = "Your spending is stable. Consider automating savings transfers to build your emergency fund."
-
-    # Algorithm summary
-    algorithms = {
-        'linear_regression': {
-            'name': 'Linear Regression',
-            'description': 'Fits a straight-line trend to your spending history with seasonal adjustment.',
-            'mae': round(mae_lr, 2),
-            'weight': round(w_lr * 100, 1),
-            'next_month': lr_predictions[0],
-        },
-        'exponential_smoothing': {
-            'name': 'Exponential Smoothing',
-            'description': "Holt's method that adapts to recent level and trend changes faster than linear regression.",
-            'mae': round(mae_ema, 2),
-            'weight': round(w_ema * 100, 1),
-            'next_month': ema_predictions[0],
-        },
-        'monte_carlo': {
-            'name': 'Monte Carlo',
-            'description': 'Runs 2,000 random simulations based on your historical spending volatility. Provides confidence bands.',
-            'mae': round(mae_mc, 2),
-            'weight': round(w_mc * 100, 1),
-            'next_month': mc_median[0],
-            'confidence_range': f"${mc_lower[0]} – ${mc_upper[0]}",
-        },
-    }
 
-    return Response({
-        'monthly_data': monthly_data,
-        'predictions': predictions,
-        'category_breakdown': category_breakdown[:8],
-        'algorithms': algorithms,
-        'insights': {
-            'total_predicted_spending': round(total_predicted_6mo, 2),
-            'avg_monthly_predicted': round(avg_predicted_monthly, 2),
-            'monthly_income': round(monthly_income, 2),
-            'predicted_savings': round(predicted_monthly_savings, 2),
-            'trend': trend,
-            'trend_percentage': round(trend_pct, 1),
-            'top_growing_category': top_growing[0] if top_growing[1] > 5 else None,
-            'top_growing_percentage': round(top_growing[1], 1) if top_growing[1] > 5 else 0,
-            'recommendation': recommendation
-        }
-    })
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def health_ready(request):
+    """503 while this worker is still loading models, for load balancer readiness checks."""
+    from . import model_warmup
+    report = model_warmup.status()
+    return Response(report, status=status.HTTP_200_OK if report['ready'] else status.HTTP_503_SERVICE_UNAVAILABLE)
 
 
 def _get_default_conversation(user: User) -> AssistantConversation:
@@ -973,6 +633,30 @@ def _get_default_conversation(user: User) -> AssistantConversation:
     return AssistantConversation.objects.create(owner=user, title="")
 
 
+ASSISTANT_SYSTEM_PROMPT = (
+    'You are Ledger AI Assistant. Help the user understand their finances and app usage. '
+    'Be concise and practical. If you are unsure, ask a clarifying question.'
+)
+ASSISTANT_DISABLED_REPLY = 'Local AI is disabled. Set LEDGER_AI_USE_OLLAMA=true to enable the assistant.'
+ASSISTANT_FAILED_REPLY = 'Sorry — I could not generate a reply right now.'
+
+
+def _assistant_chat_messages(convo, system_prompt):
+    """Ollama messages: the system prompt, then the last 20 user/assistant turns."""
+    # Build context from last N messages
+    history = list(convo.messages.all().order_by('-created_at', '-id')[:20])
+    history.reverse()
+    chat_messages = [{'role': 'system', 'content': system_prompt}]
+
+    for m in history:
+        # Only forward user/assistant roles to Ollama.
+        if m.role == AssistantMessage.ROLE_USER:
+            chat_messages.append({'role': 'user', 'content': m.content})
+        elif m.role == AssistantMessage.ROLE_ASSISTANT:
+            chat_messages.append({'role': 'assistant', 'content': m.content})
+    return chat_messages
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def assistant_history(request):
@@ -995,131 +679,48 @@ def assistant_history(request):
     )
 
 
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def assistant_send(request):
-    """Send a message to the assistant, store history, and return assistant reply."""
-    from .ai_service import _env_flag, _ollama_chat_json
-    import json
-
-    text = request.data.get('message')
-    if not isinstance(text, str) or not text.strip():
-        return Response({'error': 'message is required'}, status=status.HTTP_400_BAD_REQUEST)
-
-    text = text.strip()
-    if len(text) > 3000:
-        return Response({'error': 'message is too long (max 3000 chars)'}, status=status.HTTP_400_BAD_REQUEST)
-
-    convo = _get_default_conversation(request.user)
-
-    # Store user message first
-    AssistantMessage.objects.create(conversation=convo, role=AssistantMessage.ROLE_USER, content=text)
-
-    if not _env_flag("LEDGER_AI_USE_OLLAMA", default=False):
-        AssistantMessage.objects.create(
-            conversation=convo,
-            role=AssistantMessage.ROLE_ASSISTANT,
-            content="Local AI is disabled. Set LEDGER_AI_USE_OLLAMA=true to enable the assistant.",
-        )
-        convo.save(update_fields=['updated_at'])
-        return Response(
-            {
-                'reply': 'Local AI is disabled. Set LEDGER_AI_USE_OLLAMA=true to enable the assistant.',
-                'ollama_used': False,
-            },
-            status=status.HTTP_200_OK,
-        )
-
-    # Build context from last N messages
-    history = list(convo.messages.all().order_by('-created_at', '-id')[:20])
-    history.reverse()
-    chat_messages = [
-        {
-            'role': 'system',
-            'content': (
-                'You are Ledger AI Assistant. Help the user understand their finances and app usage. '
-                'Be concise and practical. If you are unsure, ask a clarifying question. '
-                'Return ONLY strict JSON: {"reply": "..."}.'
-            ),
-        }
-    ]
-
-    for m in history:
-        # Only forward user/assistant roles to Ollama.
-        if m.role == AssistantMessage.ROLE_USER:
-            chat_messages.append({'role': 'user', 'content': m.content})
-        elif m.role == AssistantMessage.ROLE_ASSISTANT:
-            chat_messages.append({'role': 'assistant', 'content': m.content})
-
-    result = _ollama_chat_json(chat_messages)
-    reply = None
-    if isinstance(result, dict) and isinstance(result.get('reply'), str):
-        reply = result.get('reply').strip()
-
-    if not reply:
-        reply = 'Sorry — I could not generate a reply right now.'
-
-    AssistantMessage.objects.create(conversation=convo, role=AssistantMessage.ROLE_ASSISTANT, content=reply)
-    convo.save(update_fields=['updated_at'])
-
-    return Response(
-        {
-            'reply': reply,
-            'ollama_used': True,
-        },
-        status=status.HTTP_200_OK,
-    )
-
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
-import pytesseract
-from PIL import Image, ImageEnhance, ImageFilter
 import re
 from datetime import datetime
 import os
-import platform
 
-# Set Tesseract path explicitly for Windows if not in PATH
-if platform.system() == 'Windows':
-    # Common default installation path
-    tesseract_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-    if os.path.exists(tesseract_path):
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+def _ocr_busy_response(exc):
+    response = Response({'error': str(exc), 'reason': exc.reason}, status=exc.status_code)
+    response['Retry-After'] = str(exc.retry_after)
+    return response
+
 
 class ReceiptUploadView(APIView):
+    """
+    Synchronous OCR: the request waits while the bounded OCR pool (see
+    core.ocr_pool) preprocesses, runs Tesseract and parses the receipt.
+    Byte-identical re-uploads are answered from core.ocr_cache
+    (``cache_hit: true``).
+    """
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
+        from concurrent.futures import TimeoutError as FutureTimeout
+        from django.conf import settings
+        from . import ocr, ocr_cache
+        from .ocr_pool import OCRBusy, get_pool
+
         if 'file' not in request.data:
             return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
 
         image_file = request.data['file']
         
         try:
-            image = Image.open(image_file)
-            
-            # Preprocess image for better OCR results
-            image = self.preprocess_image(image)
-            
-            # Attempt to extract text with custom config
-            custom_config = r'--oem 3 --psm 6'  # LSTM OCR Engine, Assume uniform block of text
-            text = pytesseract.image_to_string(image, config=custom_config)
-            
-            # Log extracted text for debugging
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"OCR Extracted Text:\n{text}\n{'='*50}")
-            
-            parsed_data = self.parse_receipt_text(text)
-            
-            # Additional logging for debugging
-            logger.info(f"Parsed Data: {parsed_data}")
-            
-            # Return both parsed data and raw text for debugging
-            parsed_data['raw_text'] = text[:500]  # First 500 chars
-            
+            future = ocr_cache.submit(get_pool(), request.user.id, image_file.read())
+            parsed_data = future.result(timeout=settings.LEDGER_AI_OCR_TIMEOUT)
             return Response(parsed_data, status=status.HTTP_200_OK)
+        except OCRBusy as e:
+            return _ocr_busy_response(e)
+        except FutureTimeout:
+            return Response({'error': 'OCR timed out, please retry'}, status=status.HTTP_504_GATEWAY_TIMEOUT)
         except Exception as e:
             # Log full traceback for debugging
             import traceback
@@ -1127,66 +728,249 @@ class ReceiptUploadView(APIView):
             logger = logging.getLogger(__name__)
             logger.error(f"Receipt upload error: {str(e)}")
             logger.error(f"Traceback:\n{traceback.format_exc()}")
-            
-            # Check if it's a Tesseract not found error
-            if "tesseract is not installed" in str(e).lower() or "not found" in str(e).lower():
-                 return Response(
-                    {'error': 'Tesseract OCR is not installed or not in PATH. Please install it.'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            return Response({'error': ocr.describe_error(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ReceiptBatchUploadView(APIView):
+    """
+    OCR many receipts in one request: repeat ``files`` (images and/or .zip
+    archives).  Images run in parallel on the OCR pool within the user's
+    concurrency cap; the response lists one result per image in upload order.
+    The whole batch shares one ``LEDGER_AI_OCR_TIMEOUT`` deadline, however
+    many images it holds; images not done by then are reported as timed out
+    (send them to /api/receipts/jobs/ instead).
+
+    With ``create_transactions=1``, every receipt that parsed to a positive
+    amount becomes a Transaction (image attached) in a single bulk_create.
+    """
+    parser_classes = (MultiPartParser, FormParser)
+    permission_classes = [permissions.IsAuthenticated]
+    max_files = 50
+
+    def post(self, request, *args, **kwargs):
+        from django.conf import settings
+        from django.core.files.base import ContentFile
+        from . import ocr, ocr_cache
+        from .ocr_pool import OCRBusy, get_pool
+        from .rollups import record_created
+
+        uploads = request.FILES.getlist('files') or request.FILES.getlist('file')
+        if not uploads:
+            return Response({'error': 'No files provided'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            images = ocr.expand_uploads(uploads, self.max_files)
+        except ocr.BatchUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            outcomes = ocr_cache.submit_many(
+                get_pool(), request.user.id, [data for _, data in images],
+                # One deadline for the request, within what a proxy will wait for
+                timeout=settings.LEDGER_AI_OCR_TIMEOUT,
+            )
+        except OCRBusy as e:
+            return _ocr_busy_response(e)
+
+        results = []
+        for (filename, _), outcome in zip(images, outcomes):
+            if isinstance(outcome, BaseException):
+                results.append({'filename': filename, 'ok': False, 'error': ocr.describe_error(outcome)})
+            else:
+                results.append({'filename': filename, 'ok': True, 'data': outcome})
+
+        create = str(request.data.get('create_transactions', '')).lower() in ('1', 'true', 'yes')
+        if create:
+            pending = []
+            for (filename, data), result in zip(images, results):
+                parsed = result.get('data') or {}
+                try:
+                    amount = float(parsed.get('amount') or 0)
+                except (TypeError, ValueError):
+                    amount = 0
+                if not result['ok'] or amount <= 0:
+                    result['transaction_id'] = None
+                    continue
+                txn = Transaction(
+                    owner=request.user,
+                    title=(parsed.get('title') or 'Receipt')[:200],
+                    amount=round(amount, 2),
+                    date=parsed.get('date') or datetime.now().strftime('%Y-%m-%d'),
+                    category=(parsed.get('category') or '')[:100],
                 )
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def preprocess_image(self, image):
-        """Preprocess image to improve OCR accuracy"""
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Resize if too small (improves OCR)
-        width, height = image.size
-        if width < 800 or height < 800:
-            scale = max(800 / width, 800 / height)
-            new_size = (int(width * scale), int(height * scale))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
-        
-        # Convert to grayscale
-        image = image.convert('L')
-        
-        # Increase contrast
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(2.0)
-        
-        # Sharpen image
-        image = image.filter(ImageFilter.SHARPEN)
-        
-        return image
+                txn.receipt_image.save(filename, ContentFile(data), save=False)
+                pending.append((result, txn))
+
+            try:
+                with db_transaction.atomic():
+                    created = Transaction.objects.bulk_create([txn for _, txn in pending])
+                    record_created(created)
+            except Exception:
+                # The images were stored above; with no rows pointing at them they'd be orphans
+                for _, txn in pending:
+                    txn.receipt_image.delete(save=False)
+                raise
+            for (result, _), txn in zip(pending, created):
+                result['transaction_id'] = txn.pk
+
+        ok = sum(1 for r in results if r['ok'])
+        return Response({
+            'results': results,
+            'processed': ok,
+            'failed': len(results) - ok,
+            'created': sum(1 for r in results if r.get('transaction_id')) if create else 0,
+        }, status=status.HTTP_200_OK)
+
+
+class ReceiptOCRJobView(APIView):
+    """POST an image to queue it for OCR; returns 202 with the job id and poll URL."""
+    parser_classes = (MultiPartParser, FormParser)
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        from . import ocr_jobs
+        from .ocr_pool import OCRBusy
+
+        if 'file' not in request.data:
+            return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            job = ocr_jobs.submit(request.user, request.data['file'])
+        except OCRBusy as e:
+            return _ocr_busy_response(e)
+        data = ReceiptOCRJobSerializer(job, context={'request': request}).data
+        response = Response(data, status=status.HTTP_202_ACCEPTED)
+        response['Location'] = data['url']
+        return response
+
+
+class ReceiptOCRJobDetailView(APIView):
+    """
+    Poll an OCR job until ``status`` is ``done`` (``result`` holds the parsed
+    receipt) or ``failed`` (``error`` says why).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = get_object_or_404(ReceiptOCRJob, pk=job_id, owner=request.user)
+        return Response(ReceiptOCRJobSerializer(job, context={'request': request}).data)
+
+
+class _EchoBuffer:
+    """File-like object whose write() hands the row back, for csv.writer streaming."""
+    def write(self, value):
+        return value
 
-    def parse_receipt_text(self, text):
-        """Use AI service for intelligent receipt parsing"""
-        from .ai_service import parse_receipt_text
-        return parse_receipt_text(text)
 
 class ExportTransactionsView(APIView):
+    """
+    Stream the user's transactions as CSV, newest first.
+
+    Optional query params: ``start`` / ``end`` (YYYY-MM-DD, inclusive),
+    ``category`` (case-insensitive) and ``gzip=1`` for a compressed download.
+    Rows are read with a chunked ``values_list`` iterator and written as they
+    arrive, so memory stays flat regardless of history size.  Under ASGI the
+    body is an async iterator instead: Django would otherwise buffer a sync
+    one whole before sending it.  Each chunk is then a separate keyset query
+    on ``(date, id)``, run through ``sync_to_async``.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    columns = ('title', 'amount', 'date', 'category', 'notes')
+    header = ['Title', 'Amount', 'Date', 'Category', 'Notes']
+    chunk_size = 2000
 
     def get(self, request, *args, **kwargs):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="transactions.csv"'
+        from datetime import date
 
-        writer = csv.writer(response)
-        writer.writerow(['Title', 'Amount', 'Date', 'Category', 'Notes'])
+        transactions = Transaction.objects.filter(owner=request.user)
+        params = request.query_params
+        try:
+            if params.get('start'):
+                transactions = transactions.filter(date__gte=date.fromisoformat(params['start']))
+            if params.get('end'):
+                transactions = transactions.filter(date__lte=date.fromisoformat(params['end']))
+        except ValueError:
+            return Response({'error': 'start and end must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+        if params.get('category'):
+            transactions = transactions.filter(category__iexact=params['category'])
 
-        transactions = Transaction.objects.filter(owner=request.user).order_by('-date', '-id')
-        for tx in transactions:
-            writer.writerow([tx.title, tx.amount, tx.date, tx.category, tx.notes])
+        if isinstance(request._request, ASGIRequest):
+            chunks = self._csv_chunks_async(transactions)
+            compress = self._gzip_async
+        else:
+            rows = (
+                transactions.order_by('-date', '-id')
+                .values_list(*self.columns)
+                .iterator(chunk_size=self.chunk_size)
+            )
+            chunks = self._csv_chunks(rows)
+            compress = self._gzip
 
+        if params.get('gzip', '').lower() in ('1', 'true', 'yes'):
+            response = StreamingHttpResponse(compress(chunks), content_type='application/gzip')
+            response['Content-Disposition'] = 'attachment; filename="transactions.csv.gz"'
+        else:
+            response = StreamingHttpResponse(chunks, content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="transactions.csv"'
         return response
 
+    def _csv_chunks(self, rows):
+        writer = csv.writer(_EchoBuffer())
+        # Header goes out on its own so the first byte doesn't wait on the query
+        yield writer.writerow(self.header).encode('utf-8')
+        batch = []
+        for row in rows:
+            batch.append(writer.writerow(row))
+            if len(batch) >= self.chunk_size:
+                yield ''.join(batch).encode('utf-8')
+                batch = []
+        if batch:
+            yield ''.join(batch).encode('utf-8')
+
+    async def _csv_chunks_async(self, transactions):
+        writer = csv.writer(_EchoBuffer())
+        yield writer.writerow(self.header).encode('utf-8')
+        rows = transactions.order_by('-date', '-id').values_list('date', 'id', *self.columns)
+        fetch = sync_to_async(lambda queryset: list(queryset[:self.chunk_size]))
+        page = await fetch(rows)
+        while page:
+            yield ''.join(writer.writerow(row[2:]) for row in page).encode('utf-8')
+            if len(page) < self.chunk_size:
+                break
+            last_date, last_id = page[-1][:2]
+            # Same seek as TransactionKeysetPagination: rows after (last_date, last_id)
+            page = await fetch(rows.filter(date__lte=last_date).filter(models.Q(date__lt=last_date) | models.Q(id__lt=last_id)))
+
+    @staticmethod
+    def _gzip(chunks):
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)  # gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    async def _gzip_async(chunks):
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        async for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
 class ImportTransactionsView(APIView):
+    """
+    Import transactions from a CSV upload (Title, Amount, Date, Category, Notes).
+
+    Rows are streamed, validated and inserted in batches (see core.csv_import);
+    the response reports how many were imported and why the rest were skipped.
+    """
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
+        from .csv_import import ImportFormatError, import_transactions
+
         if 'file' not in request.data:
             return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -1196,38 +980,16 @@ class ImportTransactionsView(APIView):
              return Response({'error': 'File is not a CSV'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            decoded_file = csv_file.read().decode('utf-8').splitlines()
-            reader = csv.DictReader(decoded_file)
-            
-            transactions_to_create = []
-            for row in reader:
-                # Check for required fields
-                if not all(k in row for k in ('Title', 'Amount', 'Date')):
-                    continue 
-                
-                try:
-                    amount = float(row['Amount'])
-                    date = row['Date'] 
-                    
-                    transactions_to_create.append(Transaction(
-                        owner=request.user,
-                        title=row['Title'],
-                        amount=amount,
-                        date=date,
-                        category=row.get('Category', ''),
-                        notes=row.get('Notes', '')
-                    ))
-                except ValueError:
-                    continue 
-            
-            if transactions_to_create:
-                Transaction.objects.bulk_create(transactions_to_create)
-                
-            return Response({'message': f'Successfully imported {len(transactions_to_create)} transactions'}, status=status.HTTP_201_CREATED)
-
+            categorize = str(request.data.get('categorize', '')).lower() in ('1', 'true', 'yes')
+            report = import_transactions(request.user, csv_file, categorize=categorize)
+        except ImportFormatError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+        report['message'] = f"Successfully imported {report['imported']} transactions"
+        return Response(report, status=status.HTTP_201_CREATED)
+
 # Category Management Views
 class CategoryListView(APIView):
     """Returns list of all available categories"""
@@ -1242,31 +1004,31 @@ class CategoryStatsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        from django.db.models import Sum, Count
+        from django.db.models import Sum
         from decimal import Decimal
         
-        # Get transactions grouped by category
-        stats = Transaction.objects.filter(owner=request.user).exclude(
+        # Per-category totals across all months of the rollup
+        stats = MonthlyCategoryRollup.objects.filter(owner=request.user, count__gt=0).exclude(
             category__iexact='Income'
         ).values('category').annotate(
-            total=Sum('amount'),
-            count=Count('id')
-        ).order_by('-total')
+            category_total=Sum('total'),
+            category_count=Sum('count')
+        ).order_by('-category_total')
         
         # Calculate total spending
-        total_spending = sum(item['total'] or Decimal(0) for item in stats)
+        total_spending = sum(item['category_total'] or Decimal(0) for item in stats)
         
         # Add percentage to each category
         result = []
         for item in stats:
             category = item['category'] or 'Uncategorized'
-            total = float(item['total'] or 0)
+            total = float(item['category_total'] or 0)
             percentage = (total / float(total_spending) * 100) if total_spending > 0 else 0
             
             result.append({
                 'category': category,
                 'total': total,
-                'count': item['count'],
+                'count': item['category_count'],
                 'percentage': round(percentage, 2)
             })
         
@@ -1277,7 +1039,7 @@ class CategoryStatsView(APIView):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class BulkCategorizeView(APIView):
-    """Re-categorize all or selected transactions using keyword matching"""
+    """Re-categorize all or selected transactions using keyword matching (plus FinBERT with use_ai)"""
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request):
@@ -1297,73 +1059,17 @@ class BulkCategorizeView(APIView):
                 models.Q(category='') | models.Q(category='Other') | models.Q(category='Uncategorized') | models.Q(category__isnull=True)
             )
         
-        from .constants import CATEGORY_KEYWORDS
-        total_checked = transactions_to_update.count()
-        updated_count = 0
-        
-        for transaction in transactions_to_update:
-            # Use the same categorization logic from receipt parsing
-            text = f"{transaction.title} {transaction.notes or ''}"
-            text_lower = text.lower()
-            
-            categorized = False
-            for category, keywords in CATEGORY_KEYWORDS.items():
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        transaction.category = category
-                        transaction.save()
-                        updated_count += 1
-                        categorized = True
-                        break
-                if categorized:
-                    break
+        from .categorizer import recategorize
+        use_ai = str(request.data.get('use_ai', '')).lower() in ('1', 'true', 'yes')
+        report = recategorize(transactions_to_update, use_model=use_ai)
         
         return Response({
-            'message': f'Successfully categorized {updated_count} out of {total_checked} transactions',
-            'total_checked': total_checked,
-            'updated_count': updated_count
+            'message': f"Successfully categorized {report['updated_count']} out of {report['total_checked']} transactions",
+            **report,
         }, status=status.HTTP_200_OK)
 
 
 # AI-powered endpoints
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def categorize_with_ai(request):
-    """
-    Categorize transaction text using FinBERT + keyword matching
-    """
-    text = request.data.get('text', '')
-    
-    if not text:
-        return Response({'error': 'Text is required'}, status=status.HTTP_400_BAD_REQUEST)
-    
-    try:
-        from .ai_service import categorize_transaction_ai
-        category = categorize_transaction_ai(text)
-        return Response({'category': category}, status=status.HTTP_200_OK)
-    except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-@api_view(['POST'])
-@permission_classes([permissions.IsAuthenticated])
-def parse_voice_input(request):
-    """
-    Parse voice transcript to extract transaction details
-    """
-    transcript = request.data.get('transcript', '')
-    
-    if not transcript:
-        return Response({'error': 'Transcript is required'}, status=status.HTTP_400_BAD_REQUEST)
-    
-    try:
-        from .ai_service import parse_voice_input as parse_voice
-        result = parse_voice(transcript)
-        return Response(result, status=status.HTTP_200_OK)
-    except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])  # Allow for testing
 def debug_ocr_text(request):
@@ -1430,13 +1136,14 @@ def ai_budget_suggestions(request):
     # Look back 6 months for spending history
     lookback_start = target_month - relativedelta(months=6)
 
-    transactions = Transaction.objects.filter(
+    rollups = MonthlyCategoryRollup.objects.filter(
         owner=user,
-        date__gte=lookback_start,
-        date__lt=target_month,
-    ).exclude(category__iexact='Income').order_by('date')
+        month__gte=lookback_start,
+        month__lt=target_month,
+        count__gt=0,
+    ).exclude(category__iexact='Income').order_by('month', 'category')
 
-    if not transactions.exists():
+    if not rollups.exists():
         return Response({
             'suggestions': [],
             'summary': {
@@ -1450,10 +1157,10 @@ def ai_budget_suggestions(request):
     category_monthly = defaultdict(lambda: defaultdict(float))
     all_months = set()
 
-    for txn in transactions:
-        cat = txn.category or 'Other'
-        month_key = txn.date.strftime('%Y-%m')
-        category_monthly[cat][month_key] += float(txn.amount)
+    for month, category, total in rollups.values_list('month', 'category', 'total'):
+        cat = category or 'Other'
+        month_key = month.strftime('%Y-%m')
+        category_monthly[cat][month_key] += float(total)
         all_months.add(month_key)
 
     sorted_months = sorted(all_months)
@@ -0,0 +1,26 @@
+"""
+Gunicorn settings; gunicorn reads ./gunicorn.conf.py from the working directory.
+
+Command-line flags (Procfile, render.yaml) still take precedence.
+
+LEDGER_AI_PRELOAD_MODELS=true loads the app and the FinBERT/spaCy models in
+the master before forking, so every worker shares one copy of the weights
+(benchmarks/bench_model_memory.py measures per-worker memory either way).
+"""
+import os
+
+preload_app = os.getenv('LEDGER_AI_PRELOAD_MODELS', '').strip().lower() in ('1', 'true', 'yes')
+
+
+def when_ready(server):
+    # With preload_app the Django app is already loaded here, before any fork
+    if preload_app:
+        from core import model_warmup
+        model_warmup.preload()
+
+
+def post_worker_init(worker):
+    # Runs in each worker once the Django app is loaded. Threads started in the
+    # master (e.g. from AppConfig.ready with --preload) wouldn't survive the fork.
+    from core import model_warmup
+    model_warmup.start()
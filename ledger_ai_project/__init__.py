@@ -0,0 +1,7 @@
+try:
+    # Make shared_task bind to our app when Celery is installed
+    from .celery import app as celery_app
+except ImportError:  # Celery is optional; OCR jobs fall back to a local process pool
+    celery_app = None
+
+__all__ = ('celery_app',)
@@ -0,0 +1,14 @@
+"""
+Celery application, used when CELERY_BROKER_URL is set.
+
+    celery -A ledger_ai_project worker -l info
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ledger_ai_project.settings')
+
+app = Celery('ledger_ai_project')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import json
 import os
 import dj_database_url
 from dotenv import load_dotenv
@@ -76,7 +77,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise, async-capable for ASGI
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -110,15 +111,43 @@ WSGI_APPLICATION = 'ledger_ai_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Under ASGI each request's sync code runs in a fresh thread, and Django's
+# connections are per thread, so persistent connections are never reused;
+# they only pile up idle on the database.  Close them per request unless
+# DB_CONN_MAX_AGE says otherwise (e.g. a WSGI deployment).
 DATABASES = {
     'default': dj_database_url.config(
         default=os.getenv('DATABASE_URL', f'sqlite:///{BASE_DIR / "db.sqlite3"}'),
-        conn_max_age=600,
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', '0')),
         ssl_require=_env_bool('DB_SSL_REQUIRE', not DEBUG),
     )
 }
 
 
+# Cache
+# Shared Redis when REDIS_URL is set (all workers see the same entries and
+# counters); per-process local memory otherwise.
+
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ledger-ai',
+        }
+    }
+
+# Seconds a cached /api/ai/forecast/ payload lives (writes invalidate it sooner)
+LEDGER_AI_FORECAST_CACHE_TTL = int(os.getenv('LEDGER_AI_FORECAST_CACHE_TTL', '3600'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -256,4 +285,51 @@ EMAIL_PORT = int(os.getenv('EMAIL_PORT', '587'))
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True').lower() in ('true', '1', 'yes')
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
-DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'Ledger AI <noreply@ledgerai.com>')
\ No newline at end of file
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'Ledger AI <noreply@ledgerai.com>')
+
+# Run core.background.defer() work inline instead of on the worker thread
+LEDGER_AI_DEFER_SYNC = _env_bool('LEDGER_AI_DEFER_SYNC', False)
+
+# Celery (optional): receipt OCR jobs run on Celery workers when a broker is set
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', '')
+CELERY_TASK_IGNORE_RESULT = True
+
+# Where receipt OCR jobs run: 'celery', 'process' (local process pool) or 'inline'
+LEDGER_AI_OCR_BACKEND = os.getenv('LEDGER_AI_OCR_BACKEND', 'celery' if CELERY_BROKER_URL else 'process')
+
+# Local OCR pool (core.ocr_pool), per web process: worker processes (default:
+# CPU count / WEB_CONCURRENCY), running + queued jobs before 503, and
+# concurrent jobs per user before 429. LEDGER_AI_OCR_TIMEOUT bounds a
+# synchronous upload's wait (a whole /api/receipts/batch/ request included).
+LEDGER_AI_OCR_WORKERS = int(os.getenv('LEDGER_AI_OCR_WORKERS', '0')) or None
+LEDGER_AI_OCR_MAX_PENDING = int(os.getenv('LEDGER_AI_OCR_MAX_PENDING', '0')) or None
+LEDGER_AI_OCR_PER_USER = int(os.getenv('LEDGER_AI_OCR_PER_USER', '2'))
+LEDGER_AI_OCR_TIMEOUT = float(os.getenv('LEDGER_AI_OCR_TIMEOUT', '60'))
+
+# OCR result cache keyed by image SHA-256 (core.ocr_cache): 'memory' (per
+# process), 'disk' (MEDIA_ROOT/ocr-cache, shared across processes) or 'off'
+LEDGER_AI_OCR_CACHE = os.getenv('LEDGER_AI_OCR_CACHE', 'memory')
+LEDGER_AI_OCR_CACHE_TTL = int(os.getenv('LEDGER_AI_OCR_CACHE_TTL', '86400'))
+LEDGER_AI_OCR_CACHE_MAX_ENTRIES = int(os.getenv('LEDGER_AI_OCR_CACHE_MAX_ENTRIES', '1000'))
+
+# Extra category keywords as JSON, e.g. '{"Groceries": ["kirana"]}'. They are
+# matched before the built-in core.constants.CATEGORY_KEYWORDS (core.categorizer).
+LEDGER_AI_CATEGORY_KEYWORDS = json.loads(os.getenv('LEDGER_AI_CATEGORY_KEYWORDS') or '{}')
+
+# Local Ollama server (core.ollama_client). MAX_CONCURRENCY should match the
+# server's OLLAMA_NUM_PARALLEL; further callers wait up to TIMEOUT for a slot.
+# After BREAKER_FAILURES consecutive failures, calls skip Ollama (rule-based
+# fallbacks) for BREAKER_RESET seconds before one trial request.
+LEDGER_AI_OLLAMA_URL = os.getenv('LEDGER_AI_OLLAMA_URL', 'http://localhost:11434')
+LEDGER_AI_OLLAMA_MODEL = os.getenv('LEDGER_AI_OLLAMA_MODEL', 'llama3.1:8b')
+LEDGER_AI_OLLAMA_TIMEOUT = float(os.getenv('LEDGER_AI_OLLAMA_TIMEOUT', '20'))
+LEDGER_AI_OLLAMA_MAX_CONCURRENCY = int(os.getenv('LEDGER_AI_OLLAMA_MAX_CONCURRENCY', '2'))
+LEDGER_AI_OLLAMA_RETRIES = int(os.getenv('LEDGER_AI_OLLAMA_RETRIES', '2'))
+LEDGER_AI_OLLAMA_BREAKER_FAILURES = int(os.getenv('LEDGER_AI_OLLAMA_BREAKER_FAILURES', '5'))
+LEDGER_AI_OLLAMA_BREAKER_RESET = float(os.getenv('LEDGER_AI_OLLAMA_BREAKER_RESET', '30'))
+# Seconds an Ollama JSON reply is reused for an identical prompt (0 disables)
+LEDGER_AI_OLLAMA_CACHE_TTL = int(os.getenv('LEDGER_AI_OLLAMA_CACHE_TTL', '86400'))
+
+# Load FinBERT/spaCy in the background when a gunicorn worker starts
+# (core.model_warmup, via gunicorn.conf.py); requests use keywords meanwhile
+LEDGER_AI_WARMUP = _env_bool('LEDGER_AI_WARMUP', True)